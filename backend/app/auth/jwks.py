@@ -0,0 +1,96 @@
+"""
+In-process JWKS key cache for Keycloak token verification.
+"""
+import asyncio
+import time
+from typing import Dict, Any, Optional
+
+import httpx
+from jose import jwk, JWTError
+
+
+class JWKSCache:
+    """Caches pre-built public keys from a JWKS endpoint, keyed by kid.
+
+    Keys are served from memory while fresh. The endpoint is only refetched
+    when the TTL has elapsed or a token arrives with an unknown ``kid``;
+    concurrent misses share a single in-flight fetch.
+    """
+
+    def __init__(
+        self,
+        jwks_url: str,
+        ttl_seconds: float = 300.0,
+        min_refresh_interval: float = 10.0,
+        timeout: float = 5.0,
+        client: Optional[httpx.AsyncClient] = None
+    ):
+        self.jwks_url = jwks_url
+        self.ttl_seconds = ttl_seconds
+        self.min_refresh_interval = min_refresh_interval
+        self.timeout = timeout
+        self._client = client
+        self._keys: Dict[str, Any] = {}
+        self._fetched_at: float = 0.0
+        self._refresh_task: Optional[asyncio.Task] = None
+        self.fetch_count = 0
+
+    def _is_fresh(self) -> bool:
+        return bool(self._keys) and (time.monotonic() - self._fetched_at) < self.ttl_seconds
+
+    async def get_key(self, kid: str) -> Any:
+        """Return the constructed public key for ``kid``, refreshing on a miss"""
+        key = self._keys.get(kid)
+        if key is not None and self._is_fresh():
+            return key
+
+        if key is None and self._keys and (time.monotonic() - self._fetched_at) < self.min_refresh_interval:
+            # Unknown kid right after a fetch: don't let random kids hammer the IdP
+            raise JWTError(f"Unable to find key with kid '{kid}' in JWKS")
+
+        try:
+            await self.refresh()
+        except httpx.HTTPError:
+            # Keep serving a known (stale) key if the IdP is briefly unreachable
+            if key is not None:
+                return key
+            raise
+
+        key = self._keys.get(kid)
+        if key is None:
+            raise JWTError(f"Unable to find key with kid '{kid}' in JWKS")
+        return key
+
+    async def refresh(self) -> None:
+        """Refetch the JWKS, joining an already running fetch if there is one"""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.ensure_future(self._fetch())
+        await asyncio.shield(self._refresh_task)
+
+    async def _fetch(self) -> None:
+        if self._client is not None:
+            response = await self._client.get(self.jwks_url, timeout=self.timeout)
+        else:
+            async with httpx.AsyncClient(timeout=self.timeout) as client:
+                response = await client.get(self.jwks_url)
+        response.raise_for_status()
+        jwks = response.json()
+
+        keys: Dict[str, Any] = {}
+        for jwk_key in jwks.get("keys", []):
+            kid = jwk_key.get("kid")
+            if not kid or jwk_key.get("use", "sig") != "sig":
+                continue
+            try:
+                keys[kid] = jwk.construct(jwk_key)
+            except Exception:
+                continue  # Skip keys we cannot build (e.g. unsupported algorithms)
+
+        self._keys = keys
+        self._fetched_at = time.monotonic()
+        self.fetch_count += 1
+
+    def clear(self) -> None:
+        """Drop all cached keys"""
+        self._keys = {}
+        self._fetched_at = 0.0
@@ -3,11 +3,12 @@ from typing import Optional, Dict, Any
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel
-import requests
-from jose import jwt, jwk, JWTError
-from jose.utils import base64url_decode
+import httpx
+from jose import jwt, JWTError
 from keycloak import KeycloakOpenID
 from app.config.settings import settings
+from app.auth.jwks import JWKSCache
+from app.auth.token_cache import VerifiedTokenCache, SingleFlightTTLCache
 
 # Security scheme for JWT tokens
 security = HTTPBearer()
@@ -40,6 +41,60 @@ class KeycloakConfig:
             realm_name=self.realm,
             verify=True
         )
+        
+        # Pooled async HTTP client for all non-blocking calls to Keycloak
+        self.issuer = f"{self.server_url}/realms/{self.realm}"
+        self.http_client = httpx.AsyncClient(
+            timeout=settings.keycloak_http_timeout,
+            limits=httpx.Limits(
+                max_connections=settings.keycloak_http_max_connections,
+                max_keepalive_connections=settings.keycloak_http_max_connections
+            )
+        )
+        
+        # Cached signing keys so tokens verify without an IdP round trip
+        self.jwks_cache = JWKSCache(
+            jwks_url=f"{self.issuer}/protocol/openid-connect/certs",
+            ttl_seconds=settings.keycloak_jwks_cache_ttl,
+            min_refresh_interval=settings.keycloak_jwks_min_refresh_interval,
+            client=self.http_client
+        )
+        
+        # Short-lived per-token caches for upstream introspection/userinfo
+        self.introspection_cache = SingleFlightTTLCache(
+            ttl_seconds=settings.keycloak_introspection_cache_ttl,
+            max_entries=settings.keycloak_introspection_cache_size
+        )
+        self.userinfo_cache = SingleFlightTTLCache(
+            ttl_seconds=settings.keycloak_introspection_cache_ttl,
+            max_entries=settings.keycloak_introspection_cache_size
+        )
+    
+    async def fetch_userinfo(self, access_token: str) -> Dict[str, Any]:
+        """Call the userinfo endpoint with the given access token"""
+        response = await self.http_client.get(
+            f"{self.issuer}/protocol/openid-connect/userinfo",
+            headers={"Authorization": f"Bearer {access_token}"}
+        )
+        response.raise_for_status()
+        return response.json()
+    
+    async def fetch_introspection(self, access_token: str) -> Dict[str, Any]:
+        """Call the token introspection endpoint for the given token"""
+        response = await self.http_client.post(
+            f"{self.issuer}/protocol/openid-connect/token/introspect",
+            data={
+                "token": access_token,
+                "client_id": self.client_id,
+                "client_secret": self.client_secret
+            }
+        )
+        response.raise_for_status()
+        return response.json()
+    
+    async def close(self):
+        """Close pooled HTTP connections"""
+        await self.http_client.aclose()
 
 class KeycloakUser(BaseModel):
     """Pydantic model for Keycloak user information"""
@@ -56,6 +111,12 @@ class KeycloakUser(BaseModel):
 # Global Keycloak configuration instance
 _keycloak_config: Optional[KeycloakConfig] = None
 
+# Tokens that already passed RS256 verification, reused until they expire
+_verified_token_cache = VerifiedTokenCache(
+    max_entries=settings.keycloak_token_cache_size,
+    skew_seconds=settings.keycloak_token_cache_skew
+)
+
 def init_keycloak_auth():
     """Initialize Keycloak authentication"""
     global _keycloak_config
@@ -66,6 +127,11 @@ def init_keycloak_auth():
         print(f"Failed to initialize Keycloak: {e}")
         _keycloak_config = None
 
+async def close_keycloak_auth():
+    """Release Keycloak HTTP resources on shutdown"""
+    if _keycloak_config:
+        await _keycloak_config.close()
+
 def get_keycloak_auth() -> Optional[KeycloakConfig]:
     """Get Keycloak configuration instance"""
     return _keycloak_config
@@ -86,24 +152,8 @@ async def verify_jwt_token(token: str) -> Dict[str, Any]:
         if not kid:
             raise JWTError("Token header missing 'kid' field")
         
-        # Fetch JWKS from Keycloak
-        jwks_url = f"{_keycloak_config.server_url}/realms/{_keycloak_config.realm}/protocol/openid-connect/certs"
-        response = requests.get(jwks_url)
-        response.raise_for_status()
-        jwks = response.json()
-        
-        # Find the matching key
-        key = None
-        for jwk_key in jwks.get("keys", []):
-            if jwk_key.get("kid") == kid:
-                key = jwk_key
-                break
-        
-        if not key:
-            raise JWTError(f"Unable to find key with kid '{kid}' in JWKS")
-        
-        # Construct the RSA key
-        public_key = jwk.construct(key)
+        # Look up the pre-built public key (refetches JWKS only on a kid miss)
+        public_key = await _keycloak_config.jwks_cache.get_key(kid)
         
         # Verify and decode the token
         payload = jwt.decode(
@@ -111,7 +161,7 @@ async def verify_jwt_token(token: str) -> Dict[str, Any]:
             public_key,
             algorithms=["RS256"],
             audience=_keycloak_config.client_id,
-            issuer=f"{_keycloak_config.server_url}/realms/{_keycloak_config.realm}"
+            issuer=_keycloak_config.issuer
         )
         
         return payload
@@ -121,7 +171,7 @@ async def verify_jwt_token(token: str) -> Dict[str, Any]:
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=f"JWT validation failed: {str(e)}"
         )
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail=f"Failed to fetch JWKS: {str(e)}"
@@ -140,9 +190,14 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
             detail="Keycloak authentication not configured"
         )
     
+    token = credentials.credentials
+    cached_user = _verified_token_cache.get(token)
+    if cached_user is not None:
+        return cached_user
+    
     try:
         # Verify JWT token locally
-        payload = await verify_jwt_token(credentials.credentials)
+        payload = await verify_jwt_token(token)
         
         # Extract user information from token claims
         user_info = KeycloakUser(
@@ -157,6 +212,7 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
             resource_access=payload.get("resource_access")
         )
         
+        _verified_token_cache.put(token, user_info, payload.get("exp"))
         return user_info
         
     except HTTPException:
@@ -168,14 +224,28 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
             detail=f"Invalid authentication credentials: {str(e)}"
         )
 
+def get_token_cache_stats() -> Dict[str, Any]:
+    """Get verified-token cache hit/miss counters"""
+    return _verified_token_cache.stats()
+
+def get_upstream_cache_stats() -> Dict[str, Any]:
+    """Get introspection/userinfo cache counters"""
+    if not _keycloak_config:
+        return {}
+    return {
+        "introspection": _keycloak_config.introspection_cache.stats(),
+        "userinfo": _keycloak_config.userinfo_cache.stats()
+    }
+
 async def get_user_info(access_token: str) -> Optional[Dict[str, Any]]:
     """Get user information from Keycloak using access token"""
     if not _keycloak_config:
         return None
     
     try:
-        user_info = _keycloak_config.keycloak_openid.userinfo(access_token)
-        return user_info
+        return await _keycloak_config.userinfo_cache.get_or_fetch(
+            access_token, lambda: _keycloak_config.fetch_userinfo(access_token)
+        )
     except Exception:
         return None
 
@@ -185,8 +255,9 @@ async def introspect_token(access_token: str) -> Optional[Dict[str, Any]]:
         return None
     
     try:
-        token_info = _keycloak_config.keycloak_openid.introspect(access_token)
-        return token_info
+        return await _keycloak_config.introspection_cache.get_or_fetch(
+            access_token, lambda: _keycloak_config.fetch_introspection(access_token)
+        )
     except Exception:
         return None
 
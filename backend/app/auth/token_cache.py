@@ -0,0 +1,143 @@
+"""
+Per-token caches for Keycloak authentication lookups.
+"""
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+
+class VerifiedTokenCache:
+    """LRU of decoded tokens keyed by the SHA-256 digest of the raw token.
+
+    Entries live until the token's ``exp`` minus ``skew_seconds`` so a cached
+    token is never accepted after it would fail verification. The raw token
+    itself is never stored.
+    """
+
+    def __init__(self, max_entries: int = 10000, skew_seconds: float = 30.0):
+        self.max_entries = max_entries
+        self.skew_seconds = skew_seconds
+        self._entries: "OrderedDict[bytes, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> Optional[Any]:
+        """Return the cached value for ``token`` or None if absent/expired"""
+        key = self._digest(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if time.time() >= expires_at:
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, token: str, value: Any, exp: Optional[float]) -> None:
+        """Cache ``value`` until the token's ``exp`` claim (minus skew)"""
+        if self.max_entries <= 0 or exp is None:
+            return
+
+        expires_at = float(exp) - self.skew_seconds
+        if expires_at <= time.time():
+            return
+
+        key = self._digest(token)
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all cached tokens"""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters for monitoring"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+
+class SingleFlightTTLCache:
+    """Short-lived per-token cache for upstream lookups with single-flight.
+
+    Concurrent callers asking for the same token share one in-flight fetch;
+    successful results are kept for ``ttl_seconds``. Failures are not cached.
+    """
+
+    def __init__(self, ttl_seconds: float = 30.0, max_entries: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[bytes, Tuple[float, Any]]" = OrderedDict()
+        self._in_flight: Dict[bytes, "asyncio.Future"] = {}
+        self.hits = 0
+        self.misses = 0
+        self.upstream_calls = 0
+
+    async def get_or_fetch(self, token: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached result for ``token`` or run ``fetch`` once for all waiters"""
+        key = VerifiedTokenCache._digest(token)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if time.monotonic() < expires_at:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+
+        self.misses += 1
+        future = self._in_flight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._run(key, fetch))
+            self._in_flight[key] = future
+        return await asyncio.shield(future)
+
+    async def _run(self, key: bytes, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            self.upstream_calls += 1
+            value = await fetch()
+            if self.ttl_seconds > 0 and self.max_entries > 0:
+                self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            return value
+        finally:
+            self._in_flight.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all cached results"""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters for monitoring"""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "upstream_calls": self.upstream_calls
+        }
@@ -37,11 +37,42 @@ class Settings(BaseSettings):
     # Upload settings
     upload_dir: str = Field(default="/tmp/uploads", env="UPLOAD_DIR")
     max_file_size: int = Field(default=10 * 1024 * 1024, env="MAX_FILE_SIZE")  # 10MB
+    upload_chunk_size: int = Field(default=1024 * 1024, env="UPLOAD_CHUNK_SIZE")  # bytes copied to the spool per read
     
     # Document processing settings
     chunk_size: int = Field(default=1000, env="CHUNK_SIZE")
     chunk_overlap: int = Field(default=200, env="CHUNK_OVERLAP")
     
+    # Worker pool sizes for blocking work
+    embedding_workers: int = Field(default=2, env="EMBEDDING_WORKERS")
+    parsing_workers: int = Field(default=2, env="PARSING_WORKERS")
+    vector_db_workers: int = Field(default=8, env="VECTOR_DB_WORKERS")
+    
+    # Process pool for document loaders (per-file timeout in seconds, memory cap per worker; 0 disables)
+    parsing_processes: int = Field(default=2, env="PARSING_PROCESSES")
+    parsing_timeout: float = Field(default=300.0, env="PARSING_TIMEOUT")
+    parsing_memory_limit_mb: int = Field(default=4096, env="PARSING_MEMORY_LIMIT_MB")
+    pdf_parallel_min_pages: int = Field(default=50, env="PDF_PARALLEL_MIN_PAGES")  # split PDFs this long across processes
+    # TXT/Markdown/HTML uploads up to this size are decoded in memory instead of by a file loader
+    text_memory_load_max_bytes: int = Field(default=8 * 1024 * 1024, env="TEXT_MEMORY_LOAD_MAX_BYTES")
+    
+    # Streaming ingestion: chunks per embed/upsert batch and batches buffered between stages
+    ingest_batch_size: int = Field(default=64, env="INGEST_BATCH_SIZE")
+    ingest_queue_size: int = Field(default=2, env="INGEST_QUEUE_SIZE")
+    
+    # Persistent ingestion job queue: SQLite job table, concurrent ingest workers, attempts per job
+    # and the base delay (doubled per attempt) before a failed job is retried
+    ingest_jobs_path: str = Field(default="data/ingest_jobs.sqlite3", env="INGEST_JOBS_PATH")
+    ingest_workers: int = Field(default=2, env="INGEST_WORKERS")
+    ingest_max_attempts: int = Field(default=3, env="INGEST_MAX_ATTEMPTS")
+    ingest_retry_delay: float = Field(default=2.0, env="INGEST_RETRY_DELAY")
+    
+    # Persistent document registry (SQLite): document records and chunk IDs/offsets, no content or vectors
+    document_registry_path: str = Field(default="data/documents.sqlite3", env="DOCUMENT_REGISTRY_PATH")
+    
+    # Standalone embedding server (python -m app.core.embedders.embedding_server)
+    embedding_server_socket: str = Field(default="/tmp/embedding-server.sock", env="EMBEDDING_SERVER_SOCKET")
+    
     # Config file path for runtime configuration
     config_file_path: str = Field(default="config/app_config.json", env="CONFIG_FILE_PATH")
 
@@ -58,6 +89,14 @@ class Settings(BaseSettings):
     keycloak_admin_client_id: str = Field(default="admin-cli", env="KEYCLOAK_ADMIN_CLIENT_ID")
     keycloak_admin_username: str = Field(default="admin", env="KEYCLOAK_ADMIN_USERNAME")
     keycloak_admin_password: str = Field(default="admin", env="KEYCLOAK_ADMIN_PASSWORD")
+    keycloak_jwks_cache_ttl: int = Field(default=300, env="KEYCLOAK_JWKS_CACHE_TTL")  # seconds
+    keycloak_jwks_min_refresh_interval: int = Field(default=10, env="KEYCLOAK_JWKS_MIN_REFRESH_INTERVAL")  # seconds
+    keycloak_token_cache_size: int = Field(default=10000, env="KEYCLOAK_TOKEN_CACHE_SIZE")  # 0 disables
+    keycloak_token_cache_skew: int = Field(default=30, env="KEYCLOAK_TOKEN_CACHE_SKEW")  # seconds before exp
+    keycloak_introspection_cache_ttl: int = Field(default=30, env="KEYCLOAK_INTROSPECTION_CACHE_TTL")  # seconds
+    keycloak_introspection_cache_size: int = Field(default=10000, env="KEYCLOAK_INTROSPECTION_CACHE_SIZE")  # 0 disables
+    keycloak_http_timeout: float = Field(default=10.0, env="KEYCLOAK_HTTP_TIMEOUT")  # seconds
+    keycloak_http_max_connections: int = Field(default=20, env="KEYCLOAK_HTTP_MAX_CONNECTIONS")
 
     # API Keys (optional for development)
     openai_api_key: Optional[str] = Field(default=None, env="OPENAI_API_KEY")
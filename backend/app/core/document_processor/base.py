@@ -1,16 +1,39 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, IO
+import asyncio
+import bisect
+import hashlib
+import uuid
+from typing import FrozenSet, List, Dict, Any, Optional, Tuple, Union
 from pathlib import Path
 
 from app.models.document import Document, DocumentChunk, DocumentType
 
+# Namespace for chunk IDs; changing it re-keys every stored vector
+CHUNK_ID_NAMESPACE = uuid.UUID("5f0c6b5e-8d0a-4c43-9a3e-1f6f4f1b7c2d")
+
+
+def chunk_id(metadata: Dict[str, Any], start: int, end: int) -> str:
+    """Deterministic chunk ID: a UUIDv5 of the content hash of the version that was split and the chunk's offsets.
+
+    Re-splitting the same upload yields the same IDs, so retried and resumed
+    ingests overwrite their vectors instead of duplicating them. The document
+    ID is left out: identical files give identical IDs, and chunk
+    deduplication already links a second copy to the first one's vectors.
+    """
+    name = f"{metadata.get('document_hash', '')}:{start}:{end}"
+    return str(uuid.uuid5(CHUNK_ID_NAMESPACE, name))
+
 
 class BaseDocumentProcessor(ABC):
     """Abstract base class for document processors"""
     
-    def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 200):
+    # Formats load_bytes can decode; spooled uploads of these up to memory_load_max_bytes are read back for it
+    memory_types: FrozenSet[DocumentType] = frozenset()
+    
+    def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 200, memory_load_max_bytes: int = 0):
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
+        self.memory_load_max_bytes = memory_load_max_bytes
     
     @abstractmethod
     async def load_document(self, file_path: Path, file_type: DocumentType) -> str:
@@ -27,48 +50,119 @@ class BaseDocumentProcessor(ABC):
         """Split text into chunks with metadata"""
         pass
     
-    async def process_document(self, document: Document, file_content: bytes) -> Document:
-        """Process a complete document: load, clean, and split"""
+    async def load_pages(self, file_path: Path, file_type: DocumentType) -> List[Tuple[Optional[int], str]]:
+        """Load a document as (page number, text) pairs; page is None if the format has no pages"""
+        return [(None, await self.load_document(file_path, file_type))]
+    
+    async def load_bytes(self, file_content: bytes, file_type: DocumentType) -> Optional[List[Tuple[Optional[int], str]]]:
+        """Load pages straight from memory, or return None if the format needs a file on disk"""
+        return None
+    
+    async def load_content(
+        self,
+        file_content: Union[bytes, Path],
+        file_type: DocumentType
+    ) -> List[Tuple[Optional[int], str]]:
+        """Load pages from raw file bytes, or from an upload already spooled to disk"""
+        if isinstance(file_content, Path):
+            if file_type not in self.memory_types or file_content.stat().st_size > self.memory_load_max_bytes:
+                # Loaders read the spooled upload in place; no second copy
+                return await self.load_pages(file_content, file_type)
+            # Small text-like uploads are decoded here rather than re-read by a loader
+            file_content = await asyncio.to_thread(file_content.read_bytes)
+        
+        pages = await self.load_bytes(file_content, file_type)
+        if pages is not None:
+            return pages
+        
         import tempfile
         import os
         
         try:
             # Create a temporary file with proper extension
-            file_extension = f".{document.file_type.value}"
+            file_extension = f".{file_type.value}"
             with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as temp_file:
                 temp_file.write(file_content)
                 temp_path = Path(temp_file.name)
             
             # Load document content
-            text_content = await self.load_document(temp_path, document.file_type)
-            
-            # Clean text
-            cleaned_text = self.clean_text(text_content)
-            
-            # Create document metadata
-            metadata = {
-                "filename": document.filename,
-                "file_type": document.file_type.value,
-                "original_length": len(text_content),
-                "cleaned_length": len(cleaned_text)
-            }
-            
-            # Split into chunks
-            chunks = self.split_text(cleaned_text, metadata)
+            return await self.load_pages(temp_path, file_type)
             
-            # Update document
-            document.content = cleaned_text
-            document.chunks = chunks
-            document.metadata = metadata
-            
-            return document
-            
-        except Exception as e:
-            raise e
         finally:
             # Clean up temporary file
             if 'temp_path' in locals() and temp_path.exists():
                 try:
                     os.unlink(temp_path)
                 except Exception:
-                    pass  # Ignore cleanup errors 
\ No newline at end of file
+                    pass  # Ignore cleanup errors
+    
+    def clean_pages(self, pages: List[Tuple[Optional[int], str]]) -> Tuple[str, List[Tuple[int, int]]]:
+        """Clean each page and join them, returning the text and (offset, page) starts"""
+        parts: List[str] = []
+        page_starts: List[Tuple[int, int]] = []
+        offset = 0
+        for page, text in pages:
+            cleaned = self.clean_text(text)
+            if not cleaned:
+                continue
+            if parts:
+                offset += 2  # "\n\n" separator
+            if page is not None:
+                page_starts.append((offset, page))
+            parts.append(cleaned)
+            offset += len(cleaned)
+        return "\n\n".join(parts), page_starts
+    
+    def split_pages(
+        self,
+        text: str,
+        metadata: Dict[str, Any],
+        page_starts: List[Tuple[int, int]]
+    ) -> List[DocumentChunk]:
+        """Split text into chunks, tagging each with the page(s) it came from"""
+        chunks = self.split_text(text, metadata)
+        if not page_starts:
+            return chunks
+        
+        offsets = [start for start, _ in page_starts]
+        for chunk in chunks:
+            start = chunk.metadata.get("chunk_start", -1)
+            if start < 0:
+                continue
+            end = start + max(0, len(chunk.content) - 1)
+            chunk.metadata["page"] = page_starts[max(0, bisect.bisect_right(offsets, start) - 1)][1]
+            chunk.metadata["page_end"] = page_starts[max(0, bisect.bisect_right(offsets, end) - 1)][1]
+        return chunks
+    
+    def build_metadata(self, document: Document, original_length: int, cleaned_text: str) -> Dict[str, Any]:
+        """Document-level metadata copied onto every chunk"""
+        return {
+            "document_id": document.id,
+            "document_hash": document.content_hash or hashlib.sha256(cleaned_text.encode("utf-8")).hexdigest(),
+            "filename": document.filename,
+            "file_type": document.file_type.value,
+            "original_length": original_length,
+            "cleaned_length": len(cleaned_text)
+        }
+    
+    async def process_document(self, document: Document, file_content: Union[bytes, Path]) -> Document:
+        """Process a complete document: load, clean, and split"""
+        # Load document content
+        pages = await self.load_content(file_content, document.file_type)
+        original_length = sum(len(text) for _, text in pages) + 2 * max(0, len(pages) - 1)
+        
+        # Clean text
+        cleaned_text, page_starts = self.clean_pages(pages)
+        
+        # Create document metadata
+        metadata = self.build_metadata(document, original_length, cleaned_text)
+        
+        # Split into chunks
+        chunks = self.split_pages(cleaned_text, metadata, page_starts)
+        
+        # Update document
+        document.content = cleaned_text
+        document.chunks = chunks
+        document.metadata = metadata
+        
+        return document
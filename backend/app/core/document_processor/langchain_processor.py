@@ -1,5 +1,7 @@
-import uuid
-from typing import List, Dict, Any
+import asyncio
+import hashlib
+import os
+from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
 
 from langchain_community.document_loaders import (
@@ -11,21 +13,31 @@ from langchain_community.document_loaders import (
     UnstructuredPowerPointLoader,
     UnstructuredExcelLoader
 )
-from langchain.text_splitter import RecursiveCharacterTextSplitter
 
 from app.models.document import Document, DocumentChunk, DocumentType
-from .base import BaseDocumentProcessor
+from .base import BaseDocumentProcessor, chunk_id
+from .parsing_pool import parsing_pool, load_with, partition_markup, count_pdf_pages, extract_pdf_pages
+from .text_cleaner import clean_text
+from .text_splitter import OffsetTextSplitter
 
 
 class LangChainDocumentProcessor(BaseDocumentProcessor):
     """Document processor using LangChain loaders and text splitters"""
     
-    def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 200):
-        super().__init__(chunk_size, chunk_overlap)
-        self.text_splitter = RecursiveCharacterTextSplitter(
+    memory_types = frozenset((DocumentType.TXT, DocumentType.MARKDOWN, DocumentType.HTML))
+    
+    def __init__(
+        self,
+        chunk_size: int = 1000,
+        chunk_overlap: int = 200,
+        pdf_parallel_min_pages: int = 50,
+        memory_load_max_bytes: int = 8 * 1024 * 1024
+    ):
+        super().__init__(chunk_size, chunk_overlap, memory_load_max_bytes)
+        self.pdf_parallel_min_pages = pdf_parallel_min_pages
+        self.text_splitter = OffsetTextSplitter(
             chunk_size=chunk_size,
             chunk_overlap=chunk_overlap,
-            length_function=len,
             separators=["\n\n", "\n", " ", ""]
         )
         
@@ -43,72 +55,95 @@ class LangChainDocumentProcessor(BaseDocumentProcessor):
     
     async def load_document(self, file_path: Path, file_type: DocumentType) -> str:
         """Load document using appropriate LangChain loader"""
+        pages = await self.load_pages(file_path, file_type)
+        
+        # Combine all pages/sections into one text
+        return "\n\n".join([text for _, text in pages])
+    
+    async def load_pages(self, file_path: Path, file_type: DocumentType) -> List[Tuple[Optional[int], str]]:
+        """Load document pages in the parsing process pool"""
         loader_class = self.loader_map.get(file_type)
         if not loader_class:
             raise ValueError(f"Unsupported document type: {file_type}")
         
         try:
-            loader = loader_class(str(file_path))
-            documents = loader.load()
+            if file_type == DocumentType.PDF:
+                return await self._load_pdf_pages(str(file_path))
             
-            # Combine all pages/sections into one text
-            full_text = "\n\n".join([doc.page_content for doc in documents])
-            return full_text
+            # Parse in a worker process so large files don't stall the event loop
+            documents = await parsing_pool.run(load_with, loader_class, str(file_path))
+            return [(self._page_number(metadata), content) for content, metadata in documents]
             
         except Exception as e:
             raise ValueError(f"Failed to load document: {str(e)}")
     
-    def clean_text(self, text: str) -> str:
-        """Clean and normalize text content"""
-        if not text:
-            return ""
-        
-        # Basic text cleaning
-        lines = text.split('\n')
-        cleaned_lines = []
+    async def load_bytes(self, file_content: bytes, file_type: DocumentType) -> Optional[List[Tuple[Optional[int], str]]]:
+        """Decode text-like formats straight from the uploaded bytes, without a temp file"""
+        if file_type not in self.memory_types:
+            return None
         
-        for line in lines:
-            # Remove excessive whitespace
-            line = ' '.join(line.split())
+        try:
+            text = str(memoryview(file_content), "utf-8")
+            if file_type == DocumentType.TXT:
+                return [(None, text)]
             
-            # Skip empty lines and very short lines
-            if len(line.strip()) < 3:
-                continue
-                
-            cleaned_lines.append(line)
-        
-        # Join lines and normalize spaces
-        cleaned_text = '\n'.join(cleaned_lines)
-        
-        # Remove multiple consecutive newlines
-        while '\n\n\n' in cleaned_text:
-            cleaned_text = cleaned_text.replace('\n\n\n', '\n\n')
+            # Same unstructured partitioning as the file loaders, fed from memory
+            return [(None, await parsing_pool.run(partition_markup, file_type.value, text))]
+            
+        except Exception as e:
+            raise ValueError(f"Failed to load document: {str(e)}")
+    
+    async def _load_pdf_pages(self, file_path: str) -> List[Tuple[Optional[int], str]]:
+        """Extract page ranges of a PDF in parallel workers and merge them in page order"""
+        total = await parsing_pool.run(count_pdf_pages, file_path)
+        # One range per worker, but no more ranges than cores: extra ranges only add reader setup
+        parts = min(parsing_pool.processes, os.cpu_count() or 1) if total >= self.pdf_parallel_min_pages else 1
+        size = max(1, -(-total // parts))
         
-        return cleaned_text.strip()
+        results = await asyncio.gather(*[
+            parsing_pool.run(extract_pdf_pages, file_path, start, min(start + size, total))
+            for start in range(0, total, size)
+        ])
+        return [page for part in results for page in part]
+    
+    @staticmethod
+    def _page_number(metadata: Dict[str, Any]) -> Optional[int]:
+        # LangChain loaders report 0-based pages; chunk metadata uses 1-based
+        page = metadata.get("page")
+        return page + 1 if isinstance(page, int) else None
+    
+    def clean_text(self, text: str) -> str:
+        """Clean and normalize text content"""
+        return clean_text(text)
     
     def split_text(self, text: str, metadata: Dict[str, Any] = None) -> List[DocumentChunk]:
-        """Split text into chunks using LangChain text splitter"""
+        """Split text into chunks, recording each chunk's exact offsets in the text"""
         if not text:
             return []
         
         if metadata is None:
             metadata = {}
+        if "document_hash" not in metadata:
+            # Without a document to key on, chunk IDs derive from the text itself
+            metadata = {**metadata, "document_hash": hashlib.sha256(text.encode("utf-8")).hexdigest()}
         
-        # Split text into chunks
-        text_chunks = self.text_splitter.split_text(text)
+        # Split text into chunk spans
+        spans = self.text_splitter.split_spans(text)
         
         # Create DocumentChunk objects
         chunks = []
-        for i, chunk_text in enumerate(text_chunks):
+        for i, (start, end) in enumerate(spans):
+            chunk_text = text[start:end]
             chunk_metadata = {
                 **metadata,
                 "chunk_index": i,
                 "chunk_length": len(chunk_text),
-                "chunk_start": text.find(chunk_text) if chunk_text in text else -1
+                "chunk_start": start,
+                "chunk_end": end
             }
             
             chunk = DocumentChunk(
-                id=str(uuid.uuid4()),
+                id=chunk_id(metadata, start, end),
                 content=chunk_text,
                 metadata=chunk_metadata
             )
@@ -0,0 +1,144 @@
+"""
+Process pool for document loaders, so parsing never holds the API's GIL.
+"""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+def _init_worker(memory_limit_mb: int) -> None:
+    # Cap each worker's address space so one pathological file can't take the host down
+    if memory_limit_mb:
+        import resource
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def load_with(loader_class, file_path: str) -> list:
+    """Run a LangChain loader (in a worker) and return picklable (content, metadata) pairs"""
+    return [(doc.page_content, doc.metadata) for doc in loader_class(file_path).load()]
+
+
+def partition_markup(file_type: str, text: str) -> str:
+    """Partition in-memory Markdown or HTML with unstructured, joined like the LangChain loaders"""
+    if file_type == "markdown":
+        from unstructured.partition.md import partition_md as partition
+    else:
+        from unstructured.partition.html import partition_html as partition
+    return "\n\n".join(str(element) for element in partition(text=text))
+
+
+def count_pdf_pages(file_path: str) -> int:
+    from pypdf import PdfReader
+    with open(file_path, "rb") as stream:
+        return len(PdfReader(stream).pages)
+
+
+def extract_pdf_pages(file_path: str, start: int, stop: int) -> List[Tuple[int, str]]:
+    """Extract text from pages [start, stop) as 1-based (page, text) pairs.
+
+    The reader is given an open file rather than a path, so pypdf seeks to the
+    xref and this range's objects instead of reading the whole PDF into memory.
+    """
+    from pypdf import PdfReader
+    with open(file_path, "rb") as stream:
+        reader = PdfReader(stream)
+        return [(i + 1, reader.pages[i].extract_text() or "") for i in range(start, stop)]
+
+
+class ParsingProcessPool:
+    """Worker processes for blocking loaders with per-file timeouts and memory limits.
+
+    A file that times out or kills its worker causes the pool to be replaced;
+    files that were parsing alongside it in the old pool are retried once.
+    """
+
+    def __init__(self, processes: int = 2, timeout: float = 300.0, memory_limit_mb: int = 4096):
+        self.processes = max(1, processes)
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.restarts = 0
+
+    def configure(self, processes: int, timeout: float, memory_limit_mb: int) -> None:
+        """Set pool size and limits (takes effect for the next pool started)"""
+        self.processes = max(1, processes)
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+
+    def _ensure(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.processes,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.memory_limit_mb,)
+            )
+        return self._executor
+
+    def _restart(self, executor: ProcessPoolExecutor) -> None:
+        """Kill a pool whose worker is stuck or dead; the next call starts a fresh one"""
+        if self._executor is not executor:
+            return
+        self._executor = None
+        self.restarts += 1
+        for process in list((getattr(executor, "_processes", None) or {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, fn: Callable[..., Any], *args, timeout: Optional[float] = None) -> Any:
+        """Run ``fn(*args)`` in a worker process, enforcing the per-file timeout"""
+        timeout = self.timeout if timeout is None else timeout
+        for attempt in range(2):
+            executor = self._ensure()
+            try:
+                result = await asyncio.wait_for(
+                    asyncio.wrap_future(executor.submit(fn, *args)), timeout or None
+                )
+                self.completed += 1
+                return result
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                self._restart(executor)
+                raise TimeoutError(f"Parsing timed out after {timeout:.0f}s")
+            except BrokenProcessPool:
+                if self._executor is not executor and attempt == 0:
+                    # Our worker was killed because of another file; retry on the new pool
+                    continue
+                self.failed += 1
+                self._restart(executor)
+                raise MemoryError(
+                    f"Parsing worker died (memory limit {self.memory_limit_mb} MB exceeded or crash)"
+                )
+            except Exception:
+                self.failed += 1
+                raise
+
+    def metrics(self) -> Dict[str, Any]:
+        """Get pool size and outcome counters"""
+        return {
+            "processes": self.processes,
+            "timeout": self.timeout,
+            "memory_limit_mb": self.memory_limit_mb,
+            "running": self._executor is not None,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "restarts": self.restarts
+        }
+
+    def shutdown(self) -> None:
+        """Stop the worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+# Global parsing pool, configured by the app lifespan
+parsing_pool = ParsingProcessPool()
@@ -0,0 +1,21 @@
+"""
+Single-pass normalizer for extracted document text.
+"""
+
+MIN_LINE_LENGTH = 3
+
+
+def clean_text(text: str) -> str:
+    """Collapse whitespace within lines and drop lines shorter than 3 characters.
+
+    Each line goes through ``' '.join(line.split())`` and is kept if at least
+    MIN_LINE_LENGTH characters remain. Short lines (including blank ones) are
+    never emitted, so runs of blank lines need no separate cleanup pass. The
+    raw lines are still split into one list up front.
+    """
+    if not text:
+        return ""
+
+    return "\n".join(
+        line for line in (" ".join(raw.split()) for raw in text.split("\n")) if len(line) >= MIN_LINE_LENGTH
+    )
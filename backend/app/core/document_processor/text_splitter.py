@@ -0,0 +1,108 @@
+"""
+Recursive character text splitter that tracks chunk offsets while splitting.
+"""
+
+from collections import deque
+from typing import List, Optional, Tuple
+
+Span = Tuple[int, int]
+
+
+class OffsetTextSplitter:
+    """Recursive character splitter that works on (start, end) spans of the source text.
+
+    Follows the same algorithm as LangChain's RecursiveCharacterTextSplitter
+    (separators kept at the start of the following piece, whitespace stripped),
+    but never copies or searches for chunk text, so every chunk's offsets are
+    exact and splitting is linear in the length of the text.
+    """
+
+    def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 200, separators: Optional[List[str]] = None):
+        if chunk_overlap > chunk_size:
+            raise ValueError(f"Chunk overlap ({chunk_overlap}) must not exceed chunk size ({chunk_size})")
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.separators = separators if separators is not None else ["\n\n", "\n", " ", ""]
+
+    def split_text(self, text: str) -> List[str]:
+        """Split text into chunk strings"""
+        return [text[start:end] for start, end in self.split_spans(text)]
+
+    def split_spans(self, text: str) -> List[Span]:
+        """Split text into chunks, returned as (start, end) offsets into ``text``"""
+        return self._split(text, 0, len(text), self.separators)
+
+    def _split(self, text: str, start: int, end: int, separators: List[str]) -> List[Span]:
+        # Use the first separator present in this range; finer ones are for oversized pieces
+        separator, remaining = separators[-1], []
+        for i, candidate in enumerate(separators):
+            if candidate == "" or text.find(candidate, start, end) != -1:
+                separator, remaining = candidate, separators[i + 1:]
+                break
+
+        spans: List[Span] = []
+        pending: List[Span] = []
+        for piece in self._pieces(text, start, end, separator):
+            if piece[1] - piece[0] < self.chunk_size:
+                pending.append(piece)
+                continue
+            if pending:
+                spans.extend(self._merge(text, pending))
+                pending = []
+            if remaining:
+                spans.extend(self._split(text, piece[0], piece[1], remaining))
+            else:
+                # LangChain keeps an oversized piece as-is, without stripping it
+                spans.append(piece)
+        if pending:
+            spans.extend(self._merge(text, pending))
+        return spans
+
+    @staticmethod
+    def _pieces(text: str, start: int, end: int, separator: str) -> List[Span]:
+        """Cut [start, end) before every occurrence of separator (or every character)"""
+        if not separator:
+            return [(i, i + 1) for i in range(start, end)]
+
+        pieces = []
+        cut = start
+        position = text.find(separator, start, end)
+        while position != -1:
+            if position > cut:
+                pieces.append((cut, position))
+            cut = position
+            position = text.find(separator, position + len(separator), end)
+        if end > cut:
+            pieces.append((cut, end))
+        return pieces
+
+    def _merge(self, text: str, pieces: List[Span]) -> List[Span]:
+        """Combine adjacent pieces into chunks of up to chunk_size with chunk_overlap"""
+        spans: List[Span] = []
+        current: deque = deque()
+        total = 0
+        for piece in pieces:
+            length = piece[1] - piece[0]
+            if current and total + length > self.chunk_size:
+                stripped = self._strip(text, current[0][0], current[-1][1])
+                if stripped:
+                    spans.append(stripped)
+                # Keep a tail of the previous chunk as overlap for the next one
+                while total > self.chunk_overlap or (total + length > self.chunk_size and total > 0):
+                    first = current.popleft()
+                    total -= first[1] - first[0]
+            current.append(piece)
+            total += length
+        if current:
+            stripped = self._strip(text, current[0][0], current[-1][1])
+            if stripped:
+                spans.append(stripped)
+        return spans
+
+    @staticmethod
+    def _strip(text: str, start: int, end: int) -> Optional[Span]:
+        while start < end and text[start].isspace():
+            start += 1
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        return (start, end) if end > start else None
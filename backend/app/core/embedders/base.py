@@ -1,6 +1,14 @@
 from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Optional
 
+import numpy as np
+
+
+def as_float32(embeddings: Any) -> np.ndarray:
+    """Coerce embeddings (lists, arrays or tensors) to a contiguous float32 array"""
+    if hasattr(embeddings, 'detach'):
+        embeddings = embeddings.detach().cpu().numpy()
+    return np.ascontiguousarray(embeddings, dtype=np.float32)
 
 class BaseEmbedder(ABC):
     """Abstract base class for text embedders"""
@@ -9,13 +17,13 @@ class BaseEmbedder(ABC):
         self.config = kwargs
     
     @abstractmethod
-    async def embed_text(self, text: str) -> List[float]:
-        """Generate embedding for a single text"""
+    async def embed_text(self, text: str) -> np.ndarray:
+        """Generate a float32 embedding of shape (dimension,) for a single text"""
         pass
     
     @abstractmethod
-    async def embed_texts(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings for multiple texts"""
+    async def embed_texts(self, texts: List[str]) -> np.ndarray:
+        """Generate a float32 array of shape (len(texts), dimension)"""
         pass
     
     @abstractmethod
@@ -34,4 +42,8 @@ class BaseEmbedder(ABC):
             test_embedding = await self.embed_text("test")
             return len(test_embedding) == self.get_dimension()
         except Exception:
-            return False 
\ No newline at end of file
+            return False
+    
+    def close(self) -> None:
+        """Release resources held by the embedder (e.g. shared models)"""
+        pass
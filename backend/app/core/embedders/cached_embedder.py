@@ -0,0 +1,204 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, Dict, Any, Tuple
+
+import numpy as np
+
+from app.models.config import EmbeddingCacheConfig
+from app.core.executors import run_in_pool, VECTOR_DB, PRIORITY_INTERACTIVE, PRIORITY_BULK
+from .base import BaseEmbedder
+
+
+class EmbeddingStore:
+    """SQLite-backed content-addressed store of float32 vectors"""
+
+    # Stay well below SQLite's bound-parameter limit
+    _LOOKUP_BATCH = 500
+
+    def __init__(self, path: str, max_entries: int):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key BLOB PRIMARY KEY, vector BLOB NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings(last_used)")
+        self._conn.commit()
+        self._count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def get_many(self, keys: List[bytes]) -> Dict[bytes, np.ndarray]:
+        """Fetch vectors for the given keys, touching their last-used time"""
+        found: Dict[bytes, np.ndarray] = {}
+        now = time.time()
+        with self._lock:
+            for i in range(0, len(keys), self._LOOKUP_BATCH):
+                batch = keys[i:i + self._LOOKUP_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+            if found:
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                    [(now, key) for key in found]
+                )
+                self._conn.commit()
+        return found
+
+    def put_many(self, items: List[Tuple[bytes, np.ndarray]]) -> None:
+        """Store vectors and evict least recently used entries beyond the cap"""
+        if not items:
+            return
+        now = time.time()
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)",
+                [(key, np.asarray(vec, dtype=np.float32).tobytes(), now) for key, vec in items]
+            )
+            self._count += self._conn.total_changes - before
+
+            overflow = self._count - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM embeddings WHERE key IN "
+                    "(SELECT key FROM embeddings ORDER BY last_used ASC LIMIT ?)",
+                    (overflow,)
+                )
+                self._count -= overflow
+            self._conn.commit()
+
+    def count(self) -> int:
+        return self._count
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class CachedEmbedder(BaseEmbedder):
+    """Embedder decorator that reuses previously computed vectors from disk.
+
+    Vectors are keyed by a hash of (provider, model name, revision, inference
+    backend, dimension, normalize flag, text), so any change to the model
+    settings naturally misses the cache: vectors from the int8 ONNX backend
+    are never served to torch, and vice versa. Lookups run in the bounded
+    vector DB I/O pool, queries ahead of bulk ingests.
+    """
+
+    def __init__(self, embedder: BaseEmbedder, config: EmbeddingCacheConfig):
+        super().__init__()
+        self.embedder = embedder
+        self.config = config
+        self.store = EmbeddingStore(config.path, config.max_entries)
+        self.hits = 0
+        self.misses = 0
+
+        model_info = embedder.get_model_info()
+        inner_config = getattr(embedder, "config", None)
+        normalize = bool(getattr(inner_config, "normalize_embeddings", False))
+        parts = [
+            str(model_info.get("provider", type(embedder).__name__)),
+            str(model_info.get("model_name", "")),
+            str(embedder.get_dimension()),
+            "normalized" if normalize else "raw"
+        ]
+        # Only embedders that report these get them in the key, so other caches stay valid
+        for field in ("revision", "backend"):
+            if model_info.get(field):
+                parts.append(f"{field}={model_info[field]}")
+        self._namespace = "|".join(parts).encode("utf-8")
+
+    def __getattr__(self, name: str):
+        # Expose the wrapped embedder's attributes (e.g. model_name)
+        if name == "embedder":
+            raise AttributeError(name)
+        return getattr(self.embedder, name)
+
+    def _key(self, text: str) -> bytes:
+        digest = hashlib.sha256(self._namespace)
+        digest.update(b"\x00")
+        digest.update(text.encode("utf-8"))
+        return digest.digest()
+
+    async def embed_text(self, text: str) -> np.ndarray:
+        """Generate embedding for a single text, using the cache when possible"""
+        key = self._key(text)
+        found = await run_in_pool(VECTOR_DB, self.store.get_many, [key], priority=PRIORITY_INTERACTIVE)
+        if key in found:
+            self.hits += 1
+            return found[key]
+
+        self.misses += 1
+        embedding = await self.embedder.embed_text(text)
+        await run_in_pool(VECTOR_DB, self.store.put_many, [(key, embedding)], priority=PRIORITY_INTERACTIVE)
+        return embedding
+
+    async def embed_texts(self, texts: List[str]) -> np.ndarray:
+        """Generate embeddings for multiple texts, only embedding cache misses"""
+        if not texts:
+            return np.empty((0, self.get_dimension()), dtype=np.float32)
+
+        keys = [self._key(text) for text in texts]
+        found = await run_in_pool(VECTOR_DB, self.store.get_many, list(set(keys)), priority=PRIORITY_BULK)
+
+        # Embed each distinct missing text once
+        missing: Dict[bytes, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in missing:
+                missing[key] = text
+
+        self.hits += len(texts) - sum(1 for key in keys if key in missing)
+        self.misses += sum(1 for key in keys if key in missing)
+
+        if missing:
+            missing_keys = list(missing.keys())
+            embeddings = await self.embedder.embed_texts([missing[key] for key in missing_keys])
+            if len(embeddings) != len(missing_keys):
+                # The wrapped embedder dropped some inputs (e.g. skip_empty); don't guess the alignment
+                return await self.embedder.embed_texts(texts)
+
+            new_items = list(zip(missing_keys, embeddings))
+            await run_in_pool(VECTOR_DB, self.store.put_many, new_items, priority=PRIORITY_BULK)
+            for key, embedding in new_items:
+                found[key] = embedding
+
+        return np.stack([found[key] for key in keys])
+
+    def get_dimension(self) -> int:
+        """Get the dimension of the embeddings"""
+        return self.embedder.get_dimension()
+
+    def get_model_info(self) -> Dict[str, Any]:
+        """Get information about the embedding model, including cache stats"""
+        return {
+            **self.embedder.get_model_info(),
+            "cache": self.get_cache_stats()
+        }
+
+    def close(self) -> None:
+        """Close the cache store and the wrapped embedder"""
+        self.store.close()
+        self.embedder.close()
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get hit-rate statistics for the embedding cache"""
+        lookups = self.hits + self.misses
+        return {
+            "path": str(self.store.path),
+            "entries": self.store.count(),
+            "max_entries": self.store.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
@@ -0,0 +1,129 @@
+"""
+Standalone embedding server shared by several API worker processes.
+
+One process loads the HuggingFace model (with micro-batching, length-sorted
+batching and the optional ONNX backend / process pool) and serves embeddings
+over a Unix socket or localhost TCP using the wire format in remote_embedder.
+Configure the API with an embedder of type "remote" pointing at it.
+
+Usage:
+    python -m app.core.embedders.embedding_server [--socket PATH | --port PORT]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+from pathlib import Path
+from typing import Optional
+
+from app.config.settings import settings
+from app.core.executors import executor_registry, EMBEDDING
+from app.models.config import AppConfig, HuggingFaceEmbedderConfig
+from .base import BaseEmbedder
+from .registry import model_registry
+from .remote_embedder import (
+    STATUS_JSON, STATUS_ERROR, encode_vectors, encode_json, read_request
+)
+
+
+class EmbeddingServer:
+    """Serves one embedder to many connections"""
+
+    def __init__(self, embedder: BaseEmbedder):
+        self.embedder = embedder
+        self.requests = 0
+        self.connections = 0
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    return
+                writer.write(await self._respond(request))
+                await writer.drain()
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    async def _respond(self, request: dict) -> bytes:
+        self.requests += 1
+        try:
+            op = request.get("op")
+            if op == "info":
+                return encode_json(STATUS_JSON, {
+                    **self.embedder.get_model_info(),
+                    "requests": self.requests,
+                    "connections": self.connections
+                })
+            if op == "embed":
+                texts = request["texts"]
+                if request.get("query") and len(texts) == 1:
+                    # Concurrent queries from all API workers coalesce in the micro-batcher
+                    return encode_vectors((await self.embedder.embed_text(texts[0]))[None, :])
+                return encode_vectors(await self.embedder.embed_texts(texts))
+            return encode_json(STATUS_ERROR, {"error": f"Unknown op: {op}"})
+        except Exception as e:
+            return encode_json(STATUS_ERROR, {"error": str(e)})
+
+
+def load_embedder_config(config_path: Optional[str]) -> HuggingFaceEmbedderConfig:
+    """Use the app's HuggingFace embedder settings if configured, else defaults"""
+    path = Path(config_path or settings.config_file_path)
+    if path.exists():
+        config = AppConfig.model_validate(json.loads(path.read_text()))
+        if config.embedder.huggingface:
+            return config.embedder.huggingface
+    return HuggingFaceEmbedderConfig()
+
+
+async def serve(socket_path: Optional[str], host: str, port: Optional[int], config_path: Optional[str]) -> None:
+    from .huggingface_embedder import HuggingFaceEmbedder
+    
+    executor_registry.configure({EMBEDDING: settings.embedding_workers})
+    embedder = HuggingFaceEmbedder(load_embedder_config(config_path))
+    server = EmbeddingServer(embedder)
+
+    if port:
+        listener = await asyncio.start_server(server.handle, host, port)
+        address = f"{host}:{port}"
+    else:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        listener = await asyncio.start_unix_server(server.handle, socket_path)
+        address = socket_path
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    print(f"Embedding server ready on {address}: {embedder.get_model_info()['model_name']}")
+    async with listener:
+        await stop.wait()
+
+    print("Shutting down embedding server...")
+    embedder.close()
+    model_registry.shutdown()
+    executor_registry.shutdown()
+    if not port and os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--socket", default=settings.embedding_server_socket, help="Unix socket path")
+    parser.add_argument("--host", default="127.0.0.1", help="TCP host (with --port)")
+    parser.add_argument("--port", type=int, default=None, help="Serve over TCP instead of a Unix socket")
+    parser.add_argument("--config", default=None, help="App config JSON to read HuggingFace settings from")
+    args = parser.parse_args()
+
+    asyncio.run(serve(args.socket, args.host, args.port, args.config))
+
+
+if __name__ == "__main__":
+    main()
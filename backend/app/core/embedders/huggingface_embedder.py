@@ -1,15 +1,27 @@
 import asyncio
-from typing import List, Dict, Any
-import torch
+import weakref
+from typing import List, Dict, Any, Optional
+import numpy as np
 from sentence_transformers import SentenceTransformer
 
 from app.models.config import HuggingFaceEmbedderConfig
-from .base import BaseEmbedder
+from app.core.executors import run_in_pool, EMBEDDING, PRIORITY_INTERACTIVE, PRIORITY_BULK
+from .base import BaseEmbedder, as_float32
+from .batching import MicroBatcher
+from .registry import model_registry, model_key
 
 
 class HuggingFaceEmbedder(BaseEmbedder):
     """HuggingFace sentence transformers implementation"""
     
+    # Sentences used to compare the ONNX backend against torch at load time
+    PARITY_SAMPLES = [
+        "What is the refund policy for annual subscriptions?",
+        "Quarterly revenue grew 12% driven by new enterprise customers.",
+        "Install the package, then run the migration script before restarting the service.",
+        "short",
+    ]
+    
     def __init__(self, config: HuggingFaceEmbedderConfig):
         super().__init__()
         self.config = config
@@ -26,31 +38,160 @@ class HuggingFaceEmbedder(BaseEmbedder):
         
         if config.cache_dir:
             model_kwargs['cache_folder'] = config.cache_dir
+        if config.revision:
+            model_kwargs['revision'] = config.revision
+        self.revision = model_kwargs.get('revision')
         
-        # Load the model
-        self.model = SentenceTransformer(self.model_name, **model_kwargs)
+        # Load the model once per process; embedders with the same settings share it
+        self._model_key = model_key(
+            self.model_name,
+            model_kwargs['device'],
+            {**model_kwargs, 'max_seq_length': config.max_seq_length}
+        )
+        self.model = model_registry.acquire(
+            self._model_key, lambda: self._load_model(model_kwargs)
+        )
+        self._releases = [self._model_key]
         
         # Get model dimension
         self._dimension = self.model.get_sentence_embedding_dimension()
         
+        # Optional onnxruntime backend for CPU-only inference
+        self._onnx = self._load_onnx_backend() if config.backend == "onnx" else None
+        
+        # Optional pool of worker processes for bulk ingestion
+        self._process_pool = self._load_process_pool(model_kwargs) if config.multi_process else None
+        
+        # Hand the shared models back to the registry when this embedder goes away
+        self._finalizer = weakref.finalize(self, _release_all, list(self._releases))
+        
+        # Coalesces concurrent embed_text calls into one encode batch
+        self._query_batcher = MicroBatcher(
+            self._encode_query_batch,
+            max_wait_ms=config.micro_batch_max_wait_ms,
+            max_batch_size=config.micro_batch_max_size
+        ) if config.micro_batching else None
+    
+    def _load_model(self, model_kwargs: Dict[str, Any]) -> SentenceTransformer:
+        """Load the SentenceTransformer and apply load-time settings"""
+        model = SentenceTransformer(self.model_name, **model_kwargs)
+        
         # Configure max sequence length if specified
-        if config.max_seq_length:
-            self.model.max_seq_length = config.max_seq_length
+        if self.config.max_seq_length:
+            model.max_seq_length = self.config.max_seq_length
+        return model
     
-    async def embed_text(self, text: str) -> List[float]:
-        """Generate embedding for a single text"""
+    def _load_onnx_backend(self):
+        """Export/load the ONNX model, shared across embedders like the torch model"""
+        onnx_key = self._model_key + (
+            "onnx", self.config.onnx_cache_dir, self.config.onnx_quantize,
+            self.config.onnx_threads, self.config.onnx_parity_threshold
+        )
         try:
-            # Run in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            embedding = await loop.run_in_executor(
-                None, 
-                lambda: self.model.encode([text], convert_to_tensor=False)[0]
+            encoder = model_registry.acquire(onnx_key, self._build_onnx_encoder)
+        except Exception as e:
+            print(f"ONNX backend unavailable, using torch: {e}")
+            return None
+        
+        self._releases.append(onnx_key)
+        return encoder
+    
+    def _load_process_pool(self, model_kwargs: Dict[str, Any]):
+        """Start (or reuse) the worker process pool for this model"""
+        from .process_pool import EmbeddingProcessPool
+        
+        pool_key = self._model_key + (
+            "process_pool", self.config.multi_process_workers, self.config.multi_process_torch_threads
+        )
+        pool = model_registry.acquire(
+            pool_key,
+            lambda: EmbeddingProcessPool(
+                self.model_name,
+                model_kwargs,
+                max_seq_length=self.config.max_seq_length,
+                workers=self.config.multi_process_workers,
+                torch_threads=self.config.multi_process_torch_threads,
+                shutdown_timeout=self.config.multi_process_shutdown_timeout
+            ),
+            unload=lambda pool: pool.shutdown()
+        )
+        self._releases.append(pool_key)
+        return pool
+    
+    async def _encode_bulk(self, batch: List[str], encode_kwargs: Dict[str, Any]) -> Any:
+        """Encode one ingestion batch in the process pool or the embedding thread pool"""
+        if self._process_pool is not None:
+            return await self._process_pool.encode(batch, {
+                **encode_kwargs,
+                'convert_to_tensor': False,
+                'convert_to_numpy': True,
+                'show_progress_bar': False
+            })
+        return await run_in_pool(
+            EMBEDDING,
+            lambda: self._encode(batch, **encode_kwargs),
+            priority=PRIORITY_BULK
+        )
+    
+    def _build_onnx_encoder(self):
+        """Export the ONNX model and verify it against the torch output"""
+        from .onnx_backend import OnnxEncoder
+        
+        encoder = OnnxEncoder(
+            self.model,
+            model_name=self.model_name,
+            cache_dir=self.config.onnx_cache_dir,
+            quantize=self.config.onnx_quantize,
+            intra_op_threads=self.config.onnx_threads,
+            revision=self.revision
+        )
+        parity = encoder.check_parity(self.PARITY_SAMPLES)
+        if parity < self.config.onnx_parity_threshold:
+            raise ValueError(f"parity {parity:.4f} below {self.config.onnx_parity_threshold}")
+        
+        print(f"ONNX backend ready ({encoder.model_path.name}), min cosine vs torch: {parity:.4f}")
+        return encoder
+    
+    def _encode(self, texts: List[str], **encode_kwargs) -> Any:
+        """Encode texts with the active backend"""
+        if self._onnx is not None:
+            return self._onnx.encode(
+                texts,
+                batch_size=self.batch_size,
+                normalize_embeddings=encode_kwargs.get('normalize_embeddings', False)
             )
-            return embedding.tolist() if hasattr(embedding, 'tolist') else list(embedding)
+        return self.model.encode(texts, **encode_kwargs)
+    
+    async def _encode_query_batch(self, texts: List[str]) -> List[Any]:
+        """Encode a batch of query texts ahead of queued bulk work"""
+        return await run_in_pool(
+            EMBEDDING,
+            lambda: list(self._encode(texts, convert_to_tensor=False)),
+            priority=PRIORITY_INTERACTIVE
+        )
+    
+    @staticmethod
+    def _bucket_order(texts: List[str]) -> List[int]:
+        """Indices of texts sorted by character length, longest first.
+        
+        The same order model.encode sorts by internally; applying it before
+        batching keeps batches padding-light when they are submitted one at a
+        time, without tokenizing the corpus an extra time to sort it.
+        """
+        return sorted(range(len(texts)), key=lambda i: -len(texts[i]))
+    
+    async def embed_text(self, text: str) -> np.ndarray:
+        """Generate embedding for a single text"""
+        try:
+            if self._query_batcher:
+                embedding = await self._query_batcher.submit(text)
+            else:
+                embedding = (await self._encode_query_batch([text]))[0]
+            return as_float32(embedding)
         except Exception as e:
             raise RuntimeError(f"Failed to generate HuggingFace embedding: {str(e)}")
     
-    async def embed_texts(self, texts: List[str]) -> List[List[float]]:
+    async def embed_texts(self, texts: List[str]) -> np.ndarray:
         """Generate embeddings for multiple texts"""
         try:
             # Prepare encoding kwargs
@@ -63,18 +204,33 @@ class HuggingFaceEmbedder(BaseEmbedder):
                 **(self.config.encode_kwargs if self.config.encode_kwargs is not None else {})
             }
             
-            # Run in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            embeddings = await loop.run_in_executor(
-                None,
-                lambda: self.model.encode(texts, **encode_kwargs)
-            )
+            # Group similar-length texts into the same batch to minimise padding
+            order = self._bucket_order(texts) if self.config.length_sorted_batching else list(range(len(texts)))
+            buckets = [order[i:i + self.batch_size] for i in range(0, len(order), self.batch_size)]
             
-            # Convert to list of lists
-            if hasattr(embeddings, 'tolist'):
-                return embeddings.tolist()
+            # Shard batches across worker processes when the pool is enabled; otherwise
+            # submit one batch at a time so interactive queries can jump ahead of a
+            # large ingest in the embedding thread pool
+            if self._process_pool is not None:
+                results = await asyncio.gather(*[
+                    self._encode_bulk([texts[j] for j in bucket], encode_kwargs) for bucket in buckets
+                ])
             else:
-                return [list(emb) for emb in embeddings]
+                results = []
+                for bucket in buckets:
+                    results.append(await self._encode_bulk([texts[j] for j in bucket], encode_kwargs))
+            
+            # Scatter each batch into one preallocated float32 array in input order
+            embeddings: Optional[np.ndarray] = None
+            for bucket, batch_embeddings in zip(buckets, results):
+                batch_embeddings = as_float32(batch_embeddings)
+                if embeddings is None:
+                    embeddings = np.empty((len(texts), batch_embeddings.shape[1]), dtype=np.float32)
+                embeddings[bucket] = batch_embeddings
+            
+            if embeddings is None:
+                return np.empty((0, self._dimension), dtype=np.float32)
+            return embeddings
         except Exception as e:
             raise RuntimeError(f"Failed to generate HuggingFace embeddings: {str(e)}")
     
@@ -87,8 +243,21 @@ class HuggingFaceEmbedder(BaseEmbedder):
         return {
             "provider": "huggingface",
             "model_name": self.model_name,
+            "revision": self.revision,
             "dimension": self.get_dimension(),
             "device": self.device,
             "max_seq_length": getattr(self.model, 'max_seq_length', 512),
-            "trust_remote_code": self.config.trust_remote_code
-        } 
\ No newline at end of file
+            "trust_remote_code": self.config.trust_remote_code,
+            "backend": f"onnx{'-int8' if self._onnx.quantize else ''}" if self._onnx else "torch",
+            "micro_batching": self._query_batcher.stats() if self._query_batcher else None,
+            "process_pool": self._process_pool.stats() if self._process_pool else None
+        }
+    
+    def close(self) -> None:
+        """Release this embedder's references to the shared models"""
+        self._finalizer()
+
+
+def _release_all(keys: List[Any]) -> None:
+    for key in keys:
+        model_registry.release(key) 
\ No newline at end of file
@@ -0,0 +1,43 @@
+import asyncio
+from typing import List, Optional
+
+from langchain_core.embeddings import Embeddings
+
+from .base import BaseEmbedder
+
+
+class LangChainEmbeddings(Embeddings):
+    """LangChain ``Embeddings`` view over one of our ``BaseEmbedder`` instances.
+
+    Lets LangChain vector stores share the embedder (and its loaded model)
+    used by ``DocumentService`` instead of building their own.
+    """
+
+    def __init__(self, embedder: BaseEmbedder, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.embedder = embedder
+        self._loop = loop
+
+    def _run(self, coro):
+        # LangChain calls the sync methods from worker threads (asyncio.to_thread);
+        # run the coroutine on the app's event loop so embedder state stays on it
+        loop = self._loop
+        if loop is not None and loop.is_running():
+            try:
+                running = asyncio.get_running_loop()
+            except RuntimeError:
+                running = None
+            if running is not loop:
+                return asyncio.run_coroutine_threadsafe(coro, loop).result()
+        return asyncio.run(coro)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._run(self.aembed_documents(texts))
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._run(self.aembed_query(text))
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return (await self.embedder.embed_texts(texts)).tolist()
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self.embedder.embed_text(text)).tolist()
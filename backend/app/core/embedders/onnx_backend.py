@@ -0,0 +1,160 @@
+import re
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import torch
+from sentence_transformers import SentenceTransformer
+from sentence_transformers.models import Normalize, Pooling
+
+
+class _HiddenStateModule(torch.nn.Module):
+    """Wraps a HF transformer so export yields only last_hidden_state"""
+
+    def __init__(self, auto_model, input_names: List[str]):
+        super().__init__()
+        self.auto_model = auto_model
+        self.input_names = input_names
+
+    def forward(self, *inputs):
+        return self.auto_model(**dict(zip(self.input_names, inputs)))[0]
+
+
+class OnnxEncoder:
+    """Serves sentence embeddings through onnxruntime on CPU.
+
+    The transformer of a loaded SentenceTransformer is exported to ONNX once
+    (optionally with dynamic int8 quantization) and cached on disk; pooling
+    and normalization mirror the SentenceTransformer pipeline. Exports are
+    cached per model name and revision, with the int8 file beside the fp32
+    one, so a new revision or quantization setting never loads a stale export.
+    """
+
+    SUPPORTED_POOLING = ("mean", "cls", "max")
+
+    def __init__(
+        self,
+        st_model: SentenceTransformer,
+        model_name: str,
+        cache_dir: str,
+        quantize: bool = False,
+        intra_op_threads: Optional[int] = None,
+        revision: Optional[str] = None
+    ):
+        import onnxruntime as ort
+
+        self.st_model = st_model
+        self.tokenizer = st_model.tokenizer
+        self.max_seq_length = st_model.max_seq_length
+        self.quantize = quantize
+
+        pooling = next((m for m in st_model.modules() if isinstance(m, Pooling)), None)
+        self.pooling_mode = self._pooling_mode(pooling)
+        if self.pooling_mode not in self.SUPPORTED_POOLING:
+            raise ValueError(f"Unsupported pooling mode for ONNX backend: {self.pooling_mode}")
+        self.model_normalizes = any(isinstance(m, Normalize) for m in st_model.modules())
+
+        self.input_names = [
+            name for name in ("input_ids", "attention_mask", "token_type_ids")
+            if name in self.tokenizer.model_input_names
+        ]
+
+        export_dir = Path(cache_dir) / self._path_part(model_name) / self._path_part(revision or "main")
+        self.model_path = self._ensure_export(export_dir)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads:
+            options.intra_op_num_threads = intra_op_threads
+        self.session = ort.InferenceSession(
+            str(self.model_path), sess_options=options, providers=["CPUExecutionProvider"]
+        )
+
+    @staticmethod
+    def _path_part(name: str) -> str:
+        return re.sub(r"[^A-Za-z0-9_.-]+", "__", name)
+
+    @staticmethod
+    def _pooling_mode(pooling: Optional[Pooling]) -> str:
+        if pooling is None:
+            return "mean"
+        if hasattr(pooling, "get_pooling_mode_str"):
+            return pooling.get_pooling_mode_str()
+        return getattr(pooling, "pooling_mode", "mean")
+
+    def _ensure_export(self, export_dir: Path) -> Path:
+        """Export (and quantize) the transformer unless a cached copy exists"""
+        export_dir.mkdir(parents=True, exist_ok=True)
+        fp32_path = export_dir / "model.onnx"
+        int8_path = export_dir / "model.int8.onnx"
+
+        if not fp32_path.exists():
+            transformer = self.st_model[0].auto_model
+            sample = self.tokenizer(["export sample"], return_tensors="pt")
+            inputs = tuple(sample[name] for name in self.input_names)
+            dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in self.input_names}
+            dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+            tmp_path = export_dir / "model.onnx.tmp"
+            with torch.no_grad():
+                torch.onnx.export(
+                    _HiddenStateModule(transformer.eval(), self.input_names),
+                    inputs,
+                    str(tmp_path),
+                    input_names=self.input_names,
+                    output_names=["last_hidden_state"],
+                    dynamic_axes=dynamic_axes,
+                    opset_version=17,
+                    dynamo=False
+                )
+            tmp_path.replace(fp32_path)
+
+        if not self.quantize:
+            return fp32_path
+
+        if not int8_path.exists():
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+
+            tmp_path = export_dir / "model.int8.onnx.tmp"
+            quantize_dynamic(str(fp32_path), str(tmp_path), weight_type=QuantType.QInt8)
+            tmp_path.replace(int8_path)
+        return int8_path
+
+    def _pool(self, hidden: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        if self.pooling_mode == "cls":
+            return hidden[:, 0]
+        mask = mask[..., None].astype(hidden.dtype)
+        if self.pooling_mode == "max":
+            return np.where(mask > 0, hidden, -1e9).max(axis=1)
+        return (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+    def encode(self, texts: List[str], batch_size: int = 32, normalize_embeddings: bool = False) -> np.ndarray:
+        """Encode texts into a float32 array of shape (len(texts), dimension)"""
+        outputs = []
+        for i in range(0, len(texts), batch_size):
+            batch = texts[i:i + batch_size]
+            encoded = self.tokenizer(
+                batch,
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="np"
+            )
+            feeds = {name: encoded[name].astype(np.int64) for name in self.input_names}
+            hidden = self.session.run(["last_hidden_state"], feeds)[0]
+            outputs.append(self._pool(hidden, encoded["attention_mask"]))
+
+        if not outputs:
+            return np.zeros((0, self.st_model.get_sentence_embedding_dimension()), dtype=np.float32)
+
+        embeddings = np.concatenate(outputs).astype(np.float32)
+        if normalize_embeddings or self.model_normalizes:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings = embeddings / np.clip(norms, 1e-12, None)
+        return embeddings
+
+    def check_parity(self, texts: List[str]) -> float:
+        """Minimum cosine similarity between ONNX and torch embeddings of ``texts``"""
+        reference = self.st_model.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
+        candidate = self.encode(texts, normalize_embeddings=True)
+        return float(np.min(np.sum(reference * candidate, axis=1)))
@@ -1,9 +1,16 @@
 import asyncio
+import random
 from typing import List, Dict, Any
-from openai import AsyncOpenAI
+import numpy as np
+from openai import AsyncOpenAI, APIConnectionError, APIStatusError, APITimeoutError, RateLimitError
 
 from app.models.config import OpenAIEmbedderConfig
-from .base import BaseEmbedder
+from .base import BaseEmbedder, as_float32
+
+try:
+    import tiktoken
+except ImportError:  # Fall back to a character heuristic for token budgets
+    tiktoken = None
 
 
 class OpenAIEmbedder(BaseEmbedder):
@@ -15,7 +22,9 @@ class OpenAIEmbedder(BaseEmbedder):
         self.client = AsyncOpenAI(
             api_key=config.api_key,
             organization=config.organization,
-            timeout=config.timeout
+            base_url=config.base_url,
+            timeout=config.timeout,
+            max_retries=0  # Retries are handled by _create_embeddings
         )
         self.model_name = config.model_name
         
@@ -25,19 +34,97 @@ class OpenAIEmbedder(BaseEmbedder):
             "text-embedding-3-small": 1536,
             "text-embedding-3-large": 3072,
         }
+        
+        self._encoding = None
+        if tiktoken is not None:
+            try:
+                self._encoding = tiktoken.encoding_for_model(self.model_name)
+            except Exception:
+                try:
+                    self._encoding = tiktoken.get_encoding("cl100k_base")
+                except Exception:
+                    self._encoding = None
+    
+    def _count_tokens(self, text: str) -> int:
+        """Count (or estimate) the tokens in a text"""
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        # Simple heuristic: ~4 chars per token
+        return max(1, len(text) // 4)
+    
+    def _make_batches(self, texts: List[str]) -> List[List[str]]:
+        """Group texts into batches bounded by both count and token budget"""
+        batches = []
+        current: List[str] = []
+        current_tokens = 0
+        
+        for text in texts:
+            tokens = self._count_tokens(text)
+            if current and (
+                len(current) >= self.config.batch_size
+                or current_tokens + tokens > self.config.max_batch_tokens
+            ):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(text)
+            current_tokens += tokens
+        
+        if current:
+            batches.append(current)
+        return batches
+    
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        """Rate limits, server errors and transport failures are worth retrying"""
+        if isinstance(error, (RateLimitError, APIConnectionError, APITimeoutError)):
+            return True
+        if isinstance(error, APIStatusError):
+            return error.status_code == 429 or error.status_code >= 500
+        return False
+    
+    def _retry_delay(self, attempt: int, error: Exception) -> float:
+        """Exponential backoff with full jitter, honouring Retry-After when sent"""
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), self.config.retry_max_delay)
+            except ValueError:
+                pass
+        ceiling = min(self.config.retry_max_delay, self.config.retry_base_delay * (2 ** attempt))
+        return random.uniform(0, ceiling)
+    
+    async def _create_embeddings(self, batch: List[str]) -> List[List[float]]:
+        """Embed one batch, retrying transient failures"""
+        request_params = {
+            'model': self.model_name,
+            'input': batch
+        }
+        
+        # Add dimensions if specified (for newer models)
+        if self.config.dimensions and self.model_name in ['text-embedding-3-small', 'text-embedding-3-large']:
+            request_params['dimensions'] = self.config.dimensions
+        
+        attempt = 0
+        while True:
+            try:
+                response = await self.client.embeddings.create(**request_params)
+                # Order by the index the API reports rather than response order
+                return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+            except Exception as e:
+                if attempt >= self.config.max_retries or not self._is_retryable(e):
+                    raise
+                await asyncio.sleep(self._retry_delay(attempt, e))
+                attempt += 1
     
-    async def embed_text(self, text: str) -> List[float]:
+    async def embed_text(self, text: str) -> np.ndarray:
         """Generate embedding for a single text"""
         try:
-            response = await self.client.embeddings.create(
-                model=self.model_name,
-                input=text
-            )
-            return response.data[0].embedding
+            return as_float32((await self._create_embeddings([text]))[0])
         except Exception as e:
             raise RuntimeError(f"Failed to generate OpenAI embedding: {str(e)}")
     
-    async def embed_texts(self, texts: List[str]) -> List[List[float]]:
+    async def embed_texts(self, texts: List[str]) -> np.ndarray:
         """Generate embeddings for multiple texts"""
         try:
             # Filter texts based on configuration
@@ -47,28 +134,20 @@ class OpenAIEmbedder(BaseEmbedder):
             if self.config.strip_new_lines:
                 texts = [text.replace('\n', ' ').replace('\r', ' ') for text in texts]
             
-            # Use configured batch size
-            batch_size = self.config.batch_size
-            all_embeddings = []
+            # Dispatch batches concurrently, bounded by max_concurrency
+            semaphore = asyncio.Semaphore(max(1, self.config.max_concurrency))
             
-            for i in range(0, len(texts), batch_size):
-                batch = texts[i:i + batch_size]
-                
-                # Prepare request parameters
-                request_params = {
-                    'model': self.model_name,
-                    'input': batch
-                }
-                
-                # Add dimensions if specified (for newer models)
-                if self.config.dimensions and self.model_name in ['text-embedding-3-small', 'text-embedding-3-large']:
-                    request_params['dimensions'] = self.config.dimensions
-                
-                response = await self.client.embeddings.create(**request_params)
-                batch_embeddings = [item.embedding for item in response.data]
-                all_embeddings.extend(batch_embeddings)
+            async def run_batch(batch: List[str]) -> List[List[float]]:
+                async with semaphore:
+                    return await self._create_embeddings(batch)
             
-            return all_embeddings
+            batches = self._make_batches(texts)
+            results = await asyncio.gather(*[run_batch(batch) for batch in batches])
+            
+            # gather preserves batch order, so output order matches input order
+            if not results:
+                return np.empty((0, self.get_dimension()), dtype=np.float32)
+            return np.concatenate([as_float32(batch_embeddings) for batch_embeddings in results])
         except Exception as e:
             raise RuntimeError(f"Failed to generate OpenAI embeddings: {str(e)}")
     
@@ -84,4 +163,4 @@ class OpenAIEmbedder(BaseEmbedder):
             "dimension": self.get_dimension(),
             "max_tokens": 8191,  # OpenAI embedding models limit
             "api_version": "v1"
-        } 
\ No newline at end of file
+        }
@@ -0,0 +1,94 @@
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# Per-process model, loaded once by the pool initializer
+_worker_model = None
+
+
+def _init_worker(model_name: str, model_kwargs: Dict[str, Any], max_seq_length: Optional[int], torch_threads: Optional[int]) -> None:
+    global _worker_model
+
+    # Workers already run in parallel; keep each one from oversubscribing cores
+    os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    if torch_threads:
+        torch.set_num_threads(torch_threads)
+
+    _worker_model = SentenceTransformer(model_name, **model_kwargs)
+    if max_seq_length:
+        _worker_model.max_seq_length = max_seq_length
+
+
+def _encode_shard(texts: List[str], encode_kwargs: Dict[str, Any]) -> np.ndarray:
+    embeddings = _worker_model.encode(texts, **encode_kwargs)
+    return np.ascontiguousarray(embeddings, dtype=np.float32)
+
+
+def _ping() -> bool:
+    return _worker_model is not None
+
+
+class EmbeddingProcessPool:
+    """Pool of worker processes, each holding its own copy of a SentenceTransformer.
+
+    Used for bulk ingestion: batches are encoded in separate processes so
+    tokenization and inference use every core instead of contending for the GIL.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        model_kwargs: Dict[str, Any],
+        max_seq_length: Optional[int] = None,
+        workers: Optional[int] = None,
+        torch_threads: Optional[int] = None,
+        shutdown_timeout: float = 30.0
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.torch_threads = torch_threads or max(1, (os.cpu_count() or 1) // self.workers)
+        self.shutdown_timeout = shutdown_timeout
+        self.batches = 0
+
+        # Spawn rather than fork: forking a process with live torch threads can deadlock
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(model_name, model_kwargs, max_seq_length, self.torch_threads)
+        )
+
+        # Start every worker now so model load time isn't paid by the first ingest
+        for future in [self._executor.submit(_ping) for _ in range(self.workers)]:
+            future.result()
+
+    async def encode(self, texts: List[str], encode_kwargs: Dict[str, Any]) -> np.ndarray:
+        """Encode one batch in a worker process"""
+        self.batches += 1
+        return await asyncio.wrap_future(self._executor.submit(_encode_shard, texts, encode_kwargs))
+
+    def shutdown(self) -> None:
+        """Cancel batches not yet started and stop the workers, terminating any still busy after ``shutdown_timeout``"""
+        processes = list((getattr(self._executor, "_processes", None) or {}).values())
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+        deadline = time.monotonic() + self.shutdown_timeout
+        for process in processes:
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                process.terminate()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get pool size and throughput counters"""
+        return {
+            "workers": self.workers,
+            "torch_threads": self.torch_threads,
+            "batches": self.batches
+        }
@@ -0,0 +1,95 @@
+import json
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+def model_key(model_name: str, device: str, kwargs: Dict[str, Any]) -> Tuple[str, str, str]:
+    """Build a registry key from the model name, device and load-time kwargs"""
+    return (model_name, device, json.dumps(kwargs, sort_keys=True, default=str))
+
+
+class ModelRegistry:
+    """Process-wide, reference-counted store of loaded models.
+
+    ``acquire`` loads a model on first use and hands the same instance to every
+    later caller with the same key; ``release`` drops the registry's reference
+    once the last holder is done so the memory can be reclaimed.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._models: Dict[Hashable, Any] = {}
+        self._refs: Dict[Hashable, int] = {}
+        self._loading: Dict[Hashable, threading.Lock] = {}
+        self._unloaders: Dict[Hashable, Callable[[Any], None]] = {}
+        self.loads = 0
+
+    def acquire(
+        self,
+        key: Hashable,
+        loader: Callable[[], Any],
+        unload: Optional[Callable[[Any], None]] = None
+    ) -> Any:
+        """Get the model for ``key``, calling ``loader`` only if it isn't loaded yet.
+
+        ``unload`` is called with the model once its last reference is released.
+        """
+        with self._lock:
+            if key in self._models:
+                self._refs[key] += 1
+                return self._models[key]
+            load_lock = self._loading.setdefault(key, threading.Lock())
+
+        # Serialise loads of the same key without blocking other keys
+        with load_lock:
+            with self._lock:
+                if key in self._models:
+                    self._refs[key] += 1
+                    return self._models[key]
+            model = loader()
+            with self._lock:
+                self._models[key] = model
+                self._refs[key] = 1
+                self._loading.pop(key, None)
+                if unload is not None:
+                    self._unloaders[key] = unload
+                self.loads += 1
+            return model
+
+    def release(self, key: Hashable) -> None:
+        """Drop one reference, unloading the model when none remain"""
+        with self._lock:
+            if key not in self._refs:
+                return
+            self._refs[key] -= 1
+            if self._refs[key] > 0:
+                return
+            del self._refs[key]
+            model = self._models.pop(key)
+            unload = self._unloaders.pop(key, None)
+        if unload is not None:
+            unload(model)
+
+    def shutdown(self) -> None:
+        """Unload every model regardless of outstanding references"""
+        with self._lock:
+            items = [(self._models[key], self._unloaders.get(key)) for key in self._models]
+            self._models, self._refs, self._unloaders = {}, {}, {}
+        for model, unload in items:
+            if unload is not None:
+                unload(model)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get loaded models and their reference counts"""
+        with self._lock:
+            return {
+                "loads": self.loads,
+                "models": [
+                    {"key": list(key) if isinstance(key, tuple) else key, "refs": refs}
+                    for key, refs in self._refs.items()
+                ]
+            }
+
+
+# Global registry instance
+model_registry = ModelRegistry()
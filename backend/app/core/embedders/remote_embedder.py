@@ -0,0 +1,184 @@
+import asyncio
+import json
+import socket
+import struct
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from app.models.config import RemoteEmbedderConfig
+from .base import BaseEmbedder
+
+# Wire format (all integers big-endian):
+#   request:  u32 length | JSON {"op": "embed" | "info", "texts": [...], "query": bool}
+#   response: u8 status  | u32 length | payload
+#     STATUS_VECTORS payload: u32 rows | u32 cols | rows*cols little-endian float32
+#     STATUS_JSON / STATUS_ERROR payload: UTF-8 JSON
+STATUS_VECTORS = 0
+STATUS_JSON = 1
+STATUS_ERROR = 2
+
+_LENGTH = struct.Struct(">I")
+_RESPONSE = struct.Struct(">BI")
+_SHAPE = struct.Struct(">II")
+
+
+def encode_request(payload: Dict[str, Any]) -> bytes:
+    body = json.dumps(payload).encode("utf-8")
+    return _LENGTH.pack(len(body)) + body
+
+
+def encode_vectors(vectors: np.ndarray) -> bytes:
+    vectors = np.ascontiguousarray(vectors, dtype="<f4")
+    rows, cols = vectors.shape
+    payload = _SHAPE.pack(rows, cols) + vectors.tobytes()
+    return _RESPONSE.pack(STATUS_VECTORS, len(payload)) + payload
+
+
+def encode_json(status: int, payload: Dict[str, Any]) -> bytes:
+    body = json.dumps(payload).encode("utf-8")
+    return _RESPONSE.pack(status, len(body)) + body
+
+
+def decode_response(status: int, payload: bytes) -> Any:
+    if status == STATUS_VECTORS:
+        rows, cols = _SHAPE.unpack_from(payload)
+        return np.frombuffer(payload, dtype="<f4", offset=_SHAPE.size).reshape(rows, cols).astype(np.float32, copy=False)
+    data = json.loads(payload.decode("utf-8"))
+    if status == STATUS_ERROR:
+        raise RuntimeError(data.get("error", "embedding server error"))
+    return data
+
+
+async def read_request(reader: asyncio.StreamReader) -> Dict[str, Any]:
+    (length,) = _LENGTH.unpack(await reader.readexactly(_LENGTH.size))
+    return json.loads((await reader.readexactly(length)).decode("utf-8"))
+
+
+class RemoteEmbedder(BaseEmbedder):
+    """Client for the standalone embedding server (app.core.embedders.embedding_server).
+
+    Lets several API worker processes share one loaded model: requests go over a
+    Unix socket (or localhost TCP) and vectors come back as raw float32.
+    """
+
+    def __init__(self, config: RemoteEmbedderConfig):
+        super().__init__()
+        self.config = config
+        # Idle connections, and one semaphore slot per connection that may be open
+        self._connections: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._open = 0
+
+        # Fetch model details up front, like the in-process embedders do at load
+        self._info = self._fetch_info()
+        self.model_name = self._info.get("model_name")
+        self._dimension = int(self._info["dimension"])
+
+    def _address(self) -> str:
+        if self.config.port:
+            return f"{self.config.host}:{self.config.port}"
+        return self.config.socket_path
+
+    def _fetch_info(self) -> Dict[str, Any]:
+        """Blocking info request used during construction"""
+        if self.config.port:
+            sock = socket.create_connection((self.config.host, self.config.port), timeout=self.config.timeout)
+        else:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.config.timeout)
+            sock.connect(self.config.socket_path)
+        with sock, sock.makefile("rb") as stream:
+            sock.sendall(encode_request({"op": "info"}))
+            status, length = _RESPONSE.unpack(stream.read(_RESPONSE.size))
+            return decode_response(status, stream.read(length))
+
+    async def _connect(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        if self.config.port:
+            return await asyncio.open_connection(self.config.host, self.config.port)
+        return await asyncio.open_unix_connection(self.config.socket_path)
+
+    async def _acquire(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        """Take an idle connection or open one, waiting at most ``connect_timeout`` for a free slot"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Connections belong to the loop that opened them
+            self._loop = loop
+            self._connections = []
+            self._slots = asyncio.Semaphore(max(1, self.config.max_connections))
+            self._open = 0
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.config.connect_timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"No free connection to the embedding server within {self.config.connect_timeout}s")
+        if self._connections:
+            return self._connections.pop()
+        try:
+            connection = await asyncio.wait_for(self._connect(), self.config.connect_timeout)
+        except BaseException:
+            self._slots.release()
+            raise
+        self._open += 1
+        return connection
+
+    def _release(self, connection: Tuple[asyncio.StreamReader, asyncio.StreamWriter]) -> None:
+        self._connections.append(connection)
+        self._slots.release()
+
+    def _discard(self, writer: asyncio.StreamWriter) -> None:
+        # Freeing the slot lets a waiting caller open a fresh connection
+        self._open -= 1
+        writer.close()
+        self._slots.release()
+
+    async def _call(self, payload: Dict[str, Any]) -> Any:
+        reader, writer = await self._acquire()
+        try:
+            writer.write(encode_request(payload))
+            await writer.drain()
+            header = await asyncio.wait_for(reader.readexactly(_RESPONSE.size), self.config.timeout)
+            status, length = _RESPONSE.unpack(header)
+            body = await asyncio.wait_for(reader.readexactly(length), self.config.timeout)
+        except BaseException:
+            # Connection state is unknown after a failure; don't reuse it
+            self._discard(writer)
+            raise
+        self._release((reader, writer))
+        return decode_response(status, body)
+
+    async def embed_text(self, text: str) -> np.ndarray:
+        """Generate embedding for a single text"""
+        try:
+            return (await self._call({"op": "embed", "texts": [text], "query": True}))[0]
+        except Exception as e:
+            raise RuntimeError(f"Failed to get embedding from {self._address()}: {str(e)}")
+
+    async def embed_texts(self, texts: List[str]) -> np.ndarray:
+        """Generate embeddings for multiple texts"""
+        if not texts:
+            return np.empty((0, self._dimension), dtype=np.float32)
+        try:
+            return await self._call({"op": "embed", "texts": texts, "query": False})
+        except Exception as e:
+            raise RuntimeError(f"Failed to get embeddings from {self._address()}: {str(e)}")
+
+    def get_dimension(self) -> int:
+        """Get the dimension of the embeddings"""
+        return self._dimension
+
+    def get_model_info(self) -> Dict[str, Any]:
+        """Get information about the embedding model served by the sidecar"""
+        return {
+            **self._info,
+            "provider": "remote",
+            "server_provider": self._info.get("provider"),
+            "address": self._address()
+        }
+
+    def close(self) -> None:
+        """Close pooled connections"""
+        while self._connections:
+            _, writer = self._connections.pop()
+            writer.close()
+            self._open -= 1
@@ -0,0 +1,150 @@
+"""
+Named, bounded thread pools for blocking work (embedding, parsing, vector DB I/O).
+"""
+
+import asyncio
+import functools
+import itertools
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List
+
+# Pool names
+EMBEDDING = "embedding"
+PARSING = "parsing"
+VECTOR_DB = "vector_db"
+
+# Lower value runs first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BULK = 10
+
+
+class PriorityThreadPool:
+    """Fixed-size thread pool that serves queued work in priority order"""
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self._queue: "queue.PriorityQueue" = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._shutdown = False
+        self._active = 0
+        self.completed = 0
+        self.failed = 0
+
+    def _ensure_workers(self) -> None:
+        with self._lock:
+            while len(self._threads) < self.max_workers:
+                thread = threading.Thread(
+                    target=self._worker,
+                    name=f"{self.name}-{len(self._threads)}",
+                    daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def _worker(self) -> None:
+        while True:
+            _, _, item = self._queue.get()
+            if item is None:
+                return
+            future, fn = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            with self._lock:
+                self._active += 1
+            try:
+                future.set_result(fn())
+                self.completed += 1
+            except BaseException as e:
+                future.set_exception(e)
+                self.failed += 1
+            finally:
+                with self._lock:
+                    self._active -= 1
+
+    def submit(self, fn: Callable[..., Any], *args, priority: int = PRIORITY_BULK, **kwargs) -> Future:
+        """Queue ``fn(*args, **kwargs)`` and return a concurrent Future"""
+        if self._shutdown:
+            raise RuntimeError(f"Executor '{self.name}' has been shut down")
+        self._ensure_workers()
+        future: Future = Future()
+        self._queue.put((priority, next(self._seq), (future, functools.partial(fn, *args, **kwargs))))
+        return future
+
+    async def run(self, fn: Callable[..., Any], *args, priority: int = PRIORITY_BULK, **kwargs) -> Any:
+        """Run ``fn`` in the pool and await its result"""
+        return await asyncio.wrap_future(self.submit(fn, *args, priority=priority, **kwargs))
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Get queue depth and throughput counters"""
+        return {
+            "max_workers": self.max_workers,
+            "queue_depth": self.queue_depth,
+            "active": self._active,
+            "completed": self.completed,
+            "failed": self.failed
+        }
+
+    def shutdown(self) -> None:
+        """Stop accepting work and let workers exit once the queue drains"""
+        if self._shutdown:
+            return
+        self._shutdown = True
+        for _ in self._threads:
+            # Sorts after all real work so queued jobs still finish
+            self._queue.put((float("inf"), next(self._seq), None))
+
+
+class ExecutorRegistry:
+    """Owns the named pools; started and shut down by the app lifespan"""
+
+    DEFAULT_SIZES = {EMBEDDING: 2, PARSING: 2, VECTOR_DB: 8}
+
+    def __init__(self):
+        self._pools: Dict[str, PriorityThreadPool] = {}
+        self._sizes: Dict[str, int] = dict(self.DEFAULT_SIZES)
+
+    def configure(self, sizes: Dict[str, int]) -> None:
+        """Set pool sizes (takes effect for pools created afterwards)"""
+        self._sizes.update(sizes)
+
+    def get(self, name: str) -> PriorityThreadPool:
+        """Get a pool by name, creating it on first use"""
+        pool = self._pools.get(name)
+        if pool is None:
+            pool = PriorityThreadPool(name, self._sizes.get(name, 1))
+            self._pools[name] = pool
+        return pool
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Get metrics for every pool created so far"""
+        return {name: pool.metrics() for name, pool in self._pools.items()}
+
+    def shutdown(self) -> None:
+        """Shut down all pools"""
+        for pool in self._pools.values():
+            pool.shutdown()
+        self._pools = {}
+
+
+# Global executor registry
+executor_registry = ExecutorRegistry()
+
+
+async def run_in_pool(
+    name: str,
+    fn: Callable[..., Any],
+    *args,
+    priority: int = PRIORITY_BULK,
+    **kwargs
+) -> Any:
+    """Run a blocking callable in the named pool"""
+    return await executor_registry.get(name).run(fn, *args, priority=priority, **kwargs)
@@ -1,10 +1,21 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Union
+
+import numpy as np
 
 from app.models.document import DocumentChunk
 from app.models.search import SearchResult
 
 
+# Embedders produce float32 arrays; plain lists are still accepted
+Vector = Union[np.ndarray, List[float]]
+
+
+def vector_to_list(vector: Vector) -> List[float]:
+    """Convert a vector to a list of floats for clients that require JSON-able input"""
+    return vector.tolist() if isinstance(vector, np.ndarray) else list(vector)
+
+
 class BaseVectorDBClient(ABC):
     """Abstract base class for vector database clients"""
     
@@ -39,7 +50,7 @@ class BaseVectorDBClient(ABC):
     @abstractmethod
     async def search_vectors(
         self, 
-        query_vector: List[float], 
+        query_vector: Vector, 
         top_k: int = 5, 
         threshold: float = 0.0,
         filter_metadata: Optional[Dict[str, Any]] = None
@@ -52,6 +63,11 @@ class BaseVectorDBClient(ABC):
         """Delete vectors by their IDs"""
         pass
     
+    @abstractmethod
+    async def update_metadata(self, updates: Dict[str, Dict[str, Any]]) -> bool:
+        """Merge metadata fields into the payloads of existing vectors, keyed by vector ID"""
+        pass
+    
     @abstractmethod
     async def get_collection_stats(self) -> Dict[str, Any]:
         """Get statistics about the collection"""
@@ -59,7 +75,7 @@ class BaseVectorDBClient(ABC):
     
     async def search(
         self, 
-        query_embedding: List[float], 
+        query_embedding: Vector, 
         top_k: int = 5, 
         similarity_threshold: float = 0.0,
         filter_metadata: Optional[Dict[str, Any]] = None
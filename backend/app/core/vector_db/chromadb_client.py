@@ -1,12 +1,13 @@
-import asyncio
 from typing import List, Dict, Any, Optional
 import chromadb
+import numpy as np
 from chromadb.config import Settings
 
 from app.models.config import ChromaDBConfig
 from app.models.document import DocumentChunk
 from app.models.search import SearchResult
-from .base import BaseVectorDBClient
+from app.core.executors import run_in_pool, VECTOR_DB, PRIORITY_INTERACTIVE
+from .base import BaseVectorDBClient, Vector
 
 
 class ChromaDBClient(BaseVectorDBClient):
@@ -110,17 +111,18 @@ class ChromaDBClient(BaseVectorDBClient):
             documents = []
             
             for chunk in chunks:
-                if chunk.embedding:
+                if chunk.embedding is not None:
                     ids.append(chunk.id)
                     embeddings.append(chunk.embedding)
                     metadatas.append(chunk.metadata)
                     documents.append(chunk.content)
             
             if ids:
-                await asyncio.to_thread(
+                await run_in_pool(
+                    VECTOR_DB,
                     self.collection.upsert,
                     ids=ids,
-                    embeddings=embeddings,
+                    embeddings=np.stack(embeddings).astype(np.float32, copy=False),
                     metadatas=metadatas,
                     documents=documents
                 )
@@ -131,7 +133,7 @@ class ChromaDBClient(BaseVectorDBClient):
     
     async def search_vectors(
         self, 
-        query_vector: List[float], 
+        query_vector: Vector, 
         top_k: int = 5, 
         threshold: float = 0.0,
         filter_metadata: Optional[Dict[str, Any]] = None
@@ -142,9 +144,11 @@ class ChromaDBClient(BaseVectorDBClient):
                 await self.initialize()
             
             # Perform search (run in thread to avoid blocking event loop)
-            results = await asyncio.to_thread(
+            results = await run_in_pool(
+                VECTOR_DB,
                 self.collection.query,
-                query_embeddings=[query_vector],
+                priority=PRIORITY_INTERACTIVE,
+                query_embeddings=np.asarray([query_vector], dtype=np.float32),
                 n_results=top_k,
                 where=filter_metadata,
                 include=["metadatas", "documents", "distances"]
@@ -179,19 +183,36 @@ class ChromaDBClient(BaseVectorDBClient):
             if not self.collection:
                 await self.initialize()
             
-            await asyncio.to_thread(self.collection.delete, ids=chunk_ids)
+            await run_in_pool(VECTOR_DB, self.collection.delete, ids=chunk_ids)
             return True
         except Exception as e:
             raise RuntimeError(f"Failed to delete vectors from ChromaDB: {str(e)}")
     
+    async def update_metadata(self, updates: Dict[str, Dict[str, Any]]) -> bool:
+        """Merge metadata fields into existing ChromaDB records"""
+        try:
+            if not self.collection:
+                await self.initialize()
+            
+            if updates:
+                await run_in_pool(
+                    VECTOR_DB,
+                    self.collection.update,
+                    ids=list(updates),
+                    metadatas=list(updates.values())
+                )
+            return True
+        except Exception as e:
+            raise RuntimeError(f"Failed to update metadata in ChromaDB: {str(e)}")
+    
     async def get_collection_stats(self) -> Dict[str, Any]:
         """Get ChromaDB collection statistics"""
         try:
             if not self.collection:
                 await self.initialize()
             
-            count = await asyncio.to_thread(self.collection.count)
-            metadata = await asyncio.to_thread(lambda: self.collection.metadata)
+            count = await run_in_pool(VECTOR_DB, self.collection.count)
+            metadata = await run_in_pool(VECTOR_DB, lambda: self.collection.metadata)
             return {
                 "total_vectors": count,
                 "collection_name": self.collection_name,
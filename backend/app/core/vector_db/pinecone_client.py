@@ -1,11 +1,11 @@
-import asyncio
 from typing import List, Dict, Any, Optional
 from pinecone import Pinecone, ServerlessSpec
 
 from app.models.config import PineconeDBConfig
 from app.models.document import DocumentChunk
 from app.models.search import SearchResult
-from .base import BaseVectorDBClient
+from app.core.executors import run_in_pool, VECTOR_DB, PRIORITY_INTERACTIVE
+from .base import BaseVectorDBClient, Vector, vector_to_list
 
 
 class PineconeClient(BaseVectorDBClient):
@@ -94,10 +94,10 @@ class PineconeClient(BaseVectorDBClient):
             # Prepare vectors for upsert
             vectors = []
             for chunk in chunks:
-                if chunk.embedding:
+                if chunk.embedding is not None:
                     vectors.append({
                         "id": chunk.id,
-                        "values": chunk.embedding,
+                        "values": vector_to_list(chunk.embedding),
                         "metadata": {
                             **chunk.metadata,
                             "content": chunk.content[:1000]  # Limit content size
@@ -105,7 +105,7 @@ class PineconeClient(BaseVectorDBClient):
                     })
             
             if vectors:
-                await asyncio.to_thread(self.index.upsert, vectors=vectors)
+                await run_in_pool(VECTOR_DB, self.index.upsert, vectors=vectors)
             
             return True
         except Exception as e:
@@ -113,7 +113,7 @@ class PineconeClient(BaseVectorDBClient):
     
     async def search_vectors(
         self, 
-        query_vector: List[float], 
+        query_vector: Vector, 
         top_k: int = 5, 
         threshold: float = 0.0,
         filter_metadata: Optional[Dict[str, Any]] = None
@@ -124,9 +124,11 @@ class PineconeClient(BaseVectorDBClient):
                 await self.initialize()
             
             # Perform search (run in thread to avoid blocking event loop)
-            results = await asyncio.to_thread(
+            results = await run_in_pool(
+                VECTOR_DB,
                 self.index.query,
-                vector=query_vector,
+                priority=PRIORITY_INTERACTIVE,
+                vector=vector_to_list(query_vector),
                 top_k=top_k,
                 include_metadata=True,
                 filter=filter_metadata
@@ -155,18 +157,30 @@ class PineconeClient(BaseVectorDBClient):
             if not self.index:
                 await self.initialize()
             
-            await asyncio.to_thread(self.index.delete, ids=chunk_ids)
+            await run_in_pool(VECTOR_DB, self.index.delete, ids=chunk_ids)
             return True
         except Exception as e:
             raise RuntimeError(f"Failed to delete vectors from Pinecone: {str(e)}")
     
+    async def update_metadata(self, updates: Dict[str, Dict[str, Any]]) -> bool:
+        """Merge metadata fields into existing Pinecone vectors"""
+        try:
+            if not self.index:
+                await self.initialize()
+            
+            for vector_id, metadata in updates.items():
+                await run_in_pool(VECTOR_DB, self.index.update, id=vector_id, set_metadata=metadata)
+            return True
+        except Exception as e:
+            raise RuntimeError(f"Failed to update metadata in Pinecone: {str(e)}")
+    
     async def get_collection_stats(self) -> Dict[str, Any]:
         """Get Pinecone index statistics"""
         try:
             if not self.index:
                 await self.initialize()
             
-            stats = await asyncio.to_thread(self.index.describe_index_stats)
+            stats = await run_in_pool(VECTOR_DB, self.index.describe_index_stats)
             return {
                 "total_vectors": stats.total_vector_count,
                 "dimension": stats.dimension,
@@ -6,7 +6,7 @@ from qdrant_client.models import Distance, VectorParams, PointStruct, Filter, Fi
 from app.models.config import QdrantDBConfig
 from app.models.document import DocumentChunk
 from app.models.search import SearchResult
-from .base import BaseVectorDBClient
+from .base import BaseVectorDBClient, Vector, vector_to_list
 
 
 class QdrantDBClient(BaseVectorDBClient):
@@ -98,10 +98,10 @@ class QdrantDBClient(BaseVectorDBClient):
             # Prepare points for upsert
             points = []
             for chunk in chunks:
-                if chunk.embedding:
+                if chunk.embedding is not None:
                     point = PointStruct(
                         id=chunk.id,
-                        vector=chunk.embedding,
+                        vector=vector_to_list(chunk.embedding),
                         payload={
                             **chunk.metadata,
                             "content": chunk.content
@@ -121,7 +121,7 @@ class QdrantDBClient(BaseVectorDBClient):
     
     async def search_vectors(
         self, 
-        query_vector: List[float], 
+        query_vector: Vector, 
         top_k: int = 5, 
         threshold: float = 0.0,
         filter_metadata: Optional[Dict[str, Any]] = None
@@ -144,7 +144,7 @@ class QdrantDBClient(BaseVectorDBClient):
             # Perform search
             results = await self.client.search(
                 collection_name=self.collection_name,
-                query_vector=query_vector,
+                query_vector=vector_to_list(query_vector),
                 limit=top_k,
                 score_threshold=threshold,
                 query_filter=query_filter,
@@ -181,6 +181,22 @@ class QdrantDBClient(BaseVectorDBClient):
         except Exception as e:
             raise RuntimeError(f"Failed to delete vectors from Qdrant: {str(e)}")
     
+    async def update_metadata(self, updates: Dict[str, Dict[str, Any]]) -> bool:
+        """Merge fields into existing Qdrant point payloads"""
+        try:
+            if not self.client:
+                await self.initialize()
+            
+            for point_id, metadata in updates.items():
+                await self.client.set_payload(
+                    collection_name=self.collection_name,
+                    payload=metadata,
+                    points=[point_id]
+                )
+            return True
+        except Exception as e:
+            raise RuntimeError(f"Failed to update payloads in Qdrant: {str(e)}")
+    
     async def get_collection_stats(self) -> Dict[str, Any]:
         """Get Qdrant collection statistics"""
         try:
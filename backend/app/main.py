@@ -8,6 +8,10 @@ from fastapi.responses import JSONResponse
 from app.config.settings import settings, config_manager
 from app.services.factory import service_factory
 from app.services.document_service import document_service
+from app.core.executors import executor_registry, EMBEDDING, PARSING, VECTOR_DB
+from app.core.embedders.registry import model_registry
+from app.core.document_processor.parsing_pool import parsing_pool
+from app.services.job_queue import ingestion_queue
 from app.routers import upload, config, chat, auth
 
 
@@ -17,6 +21,24 @@ async def lifespan(app: FastAPI):
     # Startup
     print("Starting Document Embedding Platform...")
     
+    # Size the dedicated worker pools before any service uses them
+    executor_registry.configure({
+        EMBEDDING: settings.embedding_workers,
+        PARSING: settings.parsing_workers,
+        VECTOR_DB: settings.vector_db_workers
+    })
+    parsing_pool.configure(
+        processes=settings.parsing_processes,
+        timeout=settings.parsing_timeout,
+        memory_limit_mb=settings.parsing_memory_limit_mb
+    )
+    ingestion_queue.configure(
+        path=settings.ingest_jobs_path,
+        workers=settings.ingest_workers,
+        max_attempts=settings.ingest_max_attempts,
+        retry_delay=settings.ingest_retry_delay
+    )
+    
     # Initialize Keycloak authentication
     try:
         from app.auth.keycloak import init_keycloak_auth
@@ -44,11 +66,35 @@ async def lifespan(app: FastAPI):
     else:
         print("No configuration found. Please configure embedder and vector database.")
     
+    document_service.open_registry(settings.document_registry_path)
+    
+    # Start ingest workers once services exist, resuming jobs a previous run left unfinished
+    await ingestion_queue.start(document_service.run_ingest_job, document_service.fail_ingest_job)
+    if ingestion_queue.resumed:
+        print(f"Resuming {ingestion_queue.resumed} interrupted ingestion job(s)")
+    
     print(f"Server starting on {settings.host}:{settings.port}")
     yield
     
     # Shutdown
     print("Shutting down Document Embedding Platform...")
+    try:
+        from app.auth.keycloak import close_keycloak_auth
+        await close_keycloak_auth()
+    except Exception as e:
+        print(f"Failed to close Keycloak auth: {e}")
+    
+    # Stop ingest workers first; interrupted jobs resume on the next start
+    await ingestion_queue.stop()
+    document_service.close_registry()
+    
+    # Release shared models and stop any embedding worker processes
+    if document_service.embedder:
+        document_service.embedder.close()
+    model_registry.shutdown()
+    
+    parsing_pool.shutdown()
+    executor_registry.shutdown()
 
 
 # Create FastAPI app
@@ -101,6 +147,17 @@ async def health_check():
     }
 
 
+@app.get("/metrics")
+async def metrics():
+    """Runtime metrics for worker pools and the ingestion pipeline"""
+    return {
+        "executors": executor_registry.metrics(),
+        "parsing_pool": parsing_pool.metrics(),
+        "ingestion": document_service.pipeline_metrics(),
+        "ingestion_queue": ingestion_queue.metrics()
+    }
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     """Global exception handler"""
@@ -0,0 +1,180 @@
+from enum import Enum
+from typing import Optional, Dict, Any
+from pydantic import BaseModel, Field
+
+
+class EmbedderType(str, Enum):
+    OPENAI = "openai"
+    HUGGINGFACE = "huggingface"
+    REMOTE = "remote"
+
+
+class VectorDBType(str, Enum):
+    PINECONE = "pinecone"
+    CHROMADB = "chromadb"
+    QDRANT = "qdrant"
+
+
+class ChatModelType(str, Enum):
+    OPENAI = "openai"
+    GEMINI = "gemini"
+    LOCAL = "local"
+
+
+class OpenAIEmbedderConfig(BaseModel):
+    api_key: str = Field(..., description="OpenAI API key")
+    model_name: str = Field(default="text-embedding-ada-002", description="OpenAI embedding model")
+    organization: Optional[str] = Field(None, description="OpenAI organization ID")
+    timeout: int = Field(default=30, description="Request timeout in seconds")
+    batch_size: int = Field(default=100, description="Batch size for processing multiple texts")
+    max_retries: int = Field(default=3, description="Maximum number of retries for failed requests")
+    max_concurrency: int = Field(default=4, description="Maximum embedding requests in flight at once")
+    max_batch_tokens: int = Field(default=100_000, description="Token budget per embedding request")
+    retry_base_delay: float = Field(default=0.5, description="Initial backoff delay in seconds for retries")
+    retry_max_delay: float = Field(default=30.0, description="Maximum backoff delay in seconds for retries")
+    base_url: Optional[str] = Field(None, description="Override the OpenAI API base URL (proxies, compatible servers)")
+    request_timeout: int = Field(default=30, description="Request timeout in seconds")
+    dimensions: Optional[int] = Field(None, description="Vector dimensions (auto-detected if not specified)")
+    strip_new_lines: bool = Field(default=True, description="Strip new lines from input text")
+    skip_empty: bool = Field(default=True, description="Skip empty texts")
+
+
+class HuggingFaceEmbedderConfig(BaseModel):
+    model_name: str = Field(default="sentence-transformers/all-MiniLM-L6-v2", description="HuggingFace model name")
+    revision: Optional[str] = Field(None, description="Model revision (branch, tag or commit) to load; latest if not set")
+    device: str = Field(default="cpu", description="Device to run the model on")
+    trust_remote_code: bool = Field(default=False, description="Trust remote code")
+    cache_dir: Optional[str] = Field(None, description="Cache directory for models")
+    batch_size: int = Field(default=32, description="Batch size for processing multiple texts")
+    max_seq_length: Optional[int] = Field(None, description="Maximum sequence length (auto-detected if not specified)")
+    dimensions: Optional[int] = Field(None, description="Vector dimensions (auto-detected if not specified)")
+    normalize_embeddings: bool = Field(default=False, description="Normalize embeddings to unit length")
+    show_progress_bar: bool = Field(default=False, description="Show progress bar during encoding")
+    convert_to_numpy: bool = Field(default=True, description="Convert output to numpy arrays")
+    convert_to_tensor: bool = Field(default=False, description="Convert output to tensors")
+    device_map: Optional[str] = Field(None, description="Device mapping for multi-GPU setups")
+    model_kwargs: Optional[Dict[str, Any]] = Field(default=None, description="Additional model arguments")
+    encode_kwargs: Optional[Dict[str, Any]] = Field(default=None, description="Additional encoding arguments")
+    micro_batching: bool = Field(default=True, description="Coalesce concurrent single-text embeddings into one batch")
+    micro_batch_max_wait_ms: float = Field(default=5.0, description="Maximum time to gather a query batch, in milliseconds")
+    micro_batch_max_size: int = Field(default=32, description="Maximum number of queries per coalesced batch")
+    length_sorted_batching: bool = Field(default=True, description="Bucket texts by character length before batching to reduce padding")
+    backend: str = Field(default="torch", description="Inference backend: torch or onnx (CPU onnxruntime)")
+    onnx_quantize: bool = Field(default=False, description="Apply dynamic int8 quantization to the ONNX export")
+    onnx_cache_dir: str = Field(default="onnx_cache", description="Directory for cached ONNX exports")
+    onnx_threads: Optional[int] = Field(None, description="onnxruntime intra-op threads (library default if not set)")
+    onnx_parity_threshold: float = Field(default=0.98, description="Minimum cosine similarity vs torch required to use ONNX")
+    multi_process: bool = Field(default=False, description="Encode bulk embed_texts batches in a pool of worker processes")
+    multi_process_workers: Optional[int] = Field(None, description="Number of embedding worker processes (CPU count if not set)")
+    multi_process_torch_threads: Optional[int] = Field(None, description="torch threads per worker process (cores / workers if not set)")
+    multi_process_shutdown_timeout: float = Field(default=30.0, description="Seconds to wait for worker processes to exit on shutdown")
+
+
+class RemoteEmbedderConfig(BaseModel):
+    socket_path: str = Field(default="/tmp/embedding-server.sock", description="Unix socket of the embedding server")
+    host: str = Field(default="127.0.0.1", description="Embedding server host (used when port is set)")
+    port: Optional[int] = Field(None, description="Embedding server TCP port (Unix socket if not set)")
+    timeout: float = Field(default=60.0, description="Request timeout in seconds")
+    max_connections: int = Field(default=8, description="Maximum pooled connections to the server")
+    connect_timeout: float = Field(default=10.0, description="Seconds to wait for a free pooled connection or a new connection")
+
+
+class EmbeddingCacheConfig(BaseModel):
+    enabled: bool = Field(default=False, description="Reuse previously computed embeddings from disk")
+    path: str = Field(default="embedding_cache/embeddings.sqlite3", description="SQLite file for cached vectors")
+    max_entries: int = Field(default=500_000, description="Maximum cached vectors before LRU eviction")
+
+
+class EmbedderConfig(BaseModel):
+    type: EmbedderType
+    openai: Optional[OpenAIEmbedderConfig] = None
+    huggingface: Optional[HuggingFaceEmbedderConfig] = None
+    remote: Optional[RemoteEmbedderConfig] = None
+    cache: Optional[EmbeddingCacheConfig] = Field(None, description="Persistent embedding cache settings")
+
+
+class PineconeDBConfig(BaseModel):
+    api_key: str = Field(..., description="Pinecone API key")
+    environment: str = Field(..., description="Pinecone environment")
+    index_name: str = Field(..., description="Pinecone index name")
+    dimension: int = Field(default=384, description="Vector dimension")
+    metric: str = Field(default="cosine", description="Distance metric")
+
+
+class ChromaDBConfig(BaseModel):
+    host: str = Field(default="localhost", description="ChromaDB host")
+    port: int = Field(default=8000, description="ChromaDB port")
+    collection_name: str = Field(default="documents", description="Collection name")
+    persist_directory: Optional[str] = Field(None, description="Persist directory for local ChromaDB")
+
+
+class QdrantDBConfig(BaseModel):
+    host: str = Field(default="localhost", description="Qdrant host")
+    port: int = Field(default=6333, description="Qdrant port")
+    collection_name: str = Field(default="documents", description="Collection name")
+    api_key: Optional[str] = Field(None, description="Qdrant API key")
+    https: bool = Field(default=False, description="Use HTTPS")
+
+
+class VectorDBConfig(BaseModel):
+    type: VectorDBType
+    pinecone: Optional[PineconeDBConfig] = None
+    chromadb: Optional[ChromaDBConfig] = None
+    qdrant: Optional[QdrantDBConfig] = None
+
+
+class OpenAIChatConfig(BaseModel):
+    api_key: str = Field(..., description="OpenAI API key")
+    model: str = Field(default="gpt-3.5-turbo", description="OpenAI chat model")
+    organization: Optional[str] = Field(None, description="OpenAI organization ID")
+    temperature: float = Field(default=0.7, description="Sampling temperature (0.0 to 2.0)")
+    max_tokens: int = Field(default=1000, description="Maximum tokens in response")
+    top_p: float = Field(default=1.0, description="Nucleus sampling parameter")
+    frequency_penalty: float = Field(default=0.0, description="Frequency penalty (-2.0 to 2.0)")
+    presence_penalty: float = Field(default=0.0, description="Presence penalty (-2.0 to 2.0)")
+
+
+class GeminiChatConfig(BaseModel):
+    api_key: str = Field(..., description="Google AI API key")
+    model: str = Field(default="gemini-2.0-flash", description="Gemini model name")
+    temperature: float = Field(default=0.7, description="Sampling temperature (0.0 to 1.0)")
+    max_tokens: int = Field(default=1000, description="Maximum tokens in response")
+    top_p: float = Field(default=1.0, description="Nucleus sampling parameter")
+    top_k: int = Field(default=40, description="Top-k sampling parameter")
+
+
+class LocalChatConfig(BaseModel):
+    provider: str = Field(default="ollama", description="Local provider (ollama or transformers)")
+    model: str = Field(default="llama2", description="Model name")
+    temperature: float = Field(default=0.7, description="Sampling temperature")
+    max_tokens: int = Field(default=1000, description="Maximum tokens in response")
+    top_p: float = Field(default=1.0, description="Nucleus sampling parameter")
+    top_k: int = Field(default=40, description="Top-k sampling parameter")
+    ollama_url: str = Field(default="http://localhost:11434", description="Ollama server URL")
+    trust_remote_code: bool = Field(default=True, description="Trust remote code (for transformers)")
+
+
+class ChatModelConfig(BaseModel):
+    type: ChatModelType
+    openai: Optional[OpenAIChatConfig] = None
+    gemini: Optional[GeminiChatConfig] = None
+    local: Optional[LocalChatConfig] = None
+
+
+class AppConfig(BaseModel):
+    embedder: EmbedderConfig
+    vector_db: VectorDBConfig
+    chat_model: Optional[ChatModelConfig] = Field(None, description="Chat model configuration")
+    max_file_size: int = Field(default=10 * 1024 * 1024, description="Max file size in bytes")
+    chunk_size: int = Field(default=1000, description="Text chunk size for splitting")
+    chunk_overlap: int = Field(default=200, description="Overlap between chunks")
+    
+    # RAG-specific settings
+    rag_top_k: int = Field(default=5, description="Number of top chunks to retrieve for RAG")
+    rag_similarity_threshold: float = Field(default=0.7, description="Minimum similarity threshold for retrieval")
+    rag_max_context_length: int = Field(default=4000, description="Maximum context length for RAG")
+    
+    # Session settings
+    session_storage_type: str = Field(default="memory", description="Session storage type (memory, file)")
+    session_storage_path: str = Field(default="sessions", description="Path for file-based session storage")
+    session_max_age_days: int = Field(default=30, description="Maximum age of sessions in days") 
\ No newline at end of file
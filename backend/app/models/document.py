@@ -0,0 +1,80 @@
+from datetime import datetime
+from typing import List, Optional, Dict, Any
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field, field_serializer
+from enum import Enum
+
+
+class DocumentType(str, Enum):
+    PDF = "pdf"
+    DOCX = "docx"
+    TXT = "txt"
+    HTML = "html"
+    MARKDOWN = "markdown"
+    PPTX = "pptx"
+    XLSX = "xlsx"
+    XLS = "xls"
+
+
+class DocumentStatus(str, Enum):
+    UPLOADED = "uploaded"
+    PROCESSING = "processing"
+    PROCESSED = "processed"
+    EMBEDDED = "embedded"
+    ERROR = "error"
+
+
+class DocumentChunk(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+    
+    id: str = Field(..., description="Unique chunk ID")
+    content: str = Field(..., description="Chunk text content")
+    metadata: Dict[str, Any] = Field(default_factory=dict, description="Chunk metadata")
+    embedding: Optional[np.ndarray] = Field(None, description="Vector embedding (float32)")
+    
+    @field_serializer("embedding")
+    def serialize_embedding(self, embedding: Optional[np.ndarray]) -> Optional[List[float]]:
+        return embedding.tolist() if embedding is not None else None
+    
+    
+class Document(BaseModel):
+    id: str = Field(..., description="Unique document ID")
+    filename: str = Field(..., description="Original filename")
+    file_type: DocumentType = Field(..., description="Document type")
+    file_size: Optional[int] = Field(None, description="Uploaded file size in bytes")
+    content_hash: Optional[str] = Field(None, description="SHA-256 of the uploaded file")
+    content: Optional[str] = Field(None, description="Full document content")
+    chunks: List[DocumentChunk] = Field(default_factory=list, description="Document chunks")
+    chunks_count: int = Field(default=0, description="Number of chunks, kept after chunks are released")
+    metadata: Dict[str, Any] = Field(default_factory=dict, description="Document metadata")
+    status: DocumentStatus = Field(default=DocumentStatus.UPLOADED, description="Processing status")
+    created_at: datetime = Field(default_factory=datetime.utcnow, description="Creation timestamp")
+    processed_at: Optional[datetime] = Field(None, description="Processing completion timestamp")
+    error_message: Optional[str] = Field(None, description="Error message if processing failed")
+
+
+class DocumentUploadRequest(BaseModel):
+    filename: str = Field(..., description="Document filename")
+    file_type: DocumentType = Field(..., description="Document type")
+
+
+class DocumentUploadResponse(BaseModel):
+    document_id: str = Field(..., description="Created document ID")
+    status: DocumentStatus = Field(..., description="Document status")
+    message: str = Field(..., description="Status message")
+    duplicate: bool = Field(False, description="Whether the upload matched an existing document's file bytes")
+    indexing: Optional[Dict[str, int]] = Field(
+        None, description="Chunks embedded, reused and removed by the document's last completed ingest"
+    )
+
+
+class DocumentProcessingStatus(BaseModel):
+    document_id: str = Field(..., description="Document ID")
+    status: DocumentStatus = Field(..., description="Current status")
+    chunks_count: int = Field(default=0, description="Number of chunks created")
+    embedded_count: int = Field(default=0, description="Number of chunks embedded")
+    error_message: Optional[str] = Field(None, description="Error message if any")
+    progress_percentage: float = Field(default=0.0, description="Processing progress percentage")
+    indexing: Optional[Dict[str, int]] = Field(
+        None, description="Chunks embedded, reused and removed by the last completed ingest; None while one runs"
+    )
@@ -4,9 +4,18 @@ Keycloak authentication router for FastAPI backend.
 from typing import Dict, Any, Optional
 
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.security import HTTPAuthorizationCredentials
 from pydantic import BaseModel
 
-from app.auth.keycloak import get_current_user, get_keycloak_auth, KeycloakUser
+from app.auth.keycloak import (
+    get_current_user,
+    get_user_info,
+    get_token_cache_stats,
+    get_upstream_cache_stats,
+    introspect_token as keycloak_introspect_token,
+    KeycloakUser,
+    security
+)
 
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
@@ -51,10 +60,16 @@ async def get_current_user_info(user: KeycloakUser = Depends(get_current_user)):
 
 
 @router.get("/userinfo")
-async def get_detailed_user_info(user: KeycloakUser = Depends(get_current_user)) -> Dict[str, Any]:
+async def get_detailed_user_info(
+    user: KeycloakUser = Depends(get_current_user),
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> Dict[str, Any]:
     """Get detailed user information from Keycloak."""
-    # This would require the access token, which we can get from the request
-    # For now, return the basic user info
+    user_info = await get_user_info(credentials.credentials)
+    if user_info:
+        return user_info
+    
+    # Fall back to the claims in the verified token
     return {
         "sub": user.sub,
         "email": user.email,
@@ -71,8 +86,9 @@ async def get_detailed_user_info(user: KeycloakUser = Depends(get_current_user))
 async def introspect_token(token: str):
     """Introspect a token to get its information."""
     try:
-        auth = get_keycloak_auth()
-        token_info = auth.introspect_token(token)
+        token_info = await keycloak_introspect_token(token)
+        if token_info is None:
+            raise ValueError("Keycloak introspection unavailable")
         
         return TokenInfoResponse(
             active=token_info.get("active", False),
@@ -87,6 +103,15 @@ async def introspect_token(token: str):
         raise HTTPException(status_code=400, detail=f"Token introspection failed: {str(e)}")
 
 
+@router.get("/cache/stats")
+async def get_auth_cache_stats(user: KeycloakUser = Depends(get_current_user)) -> Dict[str, Any]:
+    """Get authentication cache counters."""
+    return {
+        "verified_tokens": get_token_cache_stats(),
+        **get_upstream_cache_stats()
+    }
+
+
 @router.get("/config")
 async def get_auth_config():
     """Get Keycloak configuration for frontend."""
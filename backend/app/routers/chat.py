@@ -33,6 +33,9 @@ from app.services.mongo_chat_store import get_mongo_store
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
+# Display names for embedder providers in the health check
+EMBEDDER_LABELS = {"huggingface": "HuggingFace", "openai": "OpenAI", "remote": "Remote"}
+
 # Global Hybrid RAG service instance
 hybrid_rag_service: Optional[HybridRAGService] = None
 chat_graph_service = None
@@ -458,7 +461,12 @@ async def chat_health():
         # Get embedder info as string
         embedder_info = "Unknown"
         if rag_service.embeddings:
-            if hasattr(rag_service.embeddings, 'model_name'):
+            if hasattr(rag_service.embeddings, 'embedder'):
+                # Our LangChain adapter: describe the embedder it wraps
+                model_info = rag_service.embeddings.embedder.get_model_info()
+                provider = EMBEDDER_LABELS.get(model_info.get("provider"), model_info.get("provider"))
+                embedder_info = f"{provider} {model_info.get('model_name')}"
+            elif hasattr(rag_service.embeddings, 'model_name'):
                 embedder_info = f"HuggingFace {rag_service.embeddings.model_name}"
             elif hasattr(rag_service.embeddings, 'model'):
                 embedder_info = f"OpenAI {rag_service.embeddings.model}"
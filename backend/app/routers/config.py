@@ -59,11 +59,13 @@ async def update_embedder_config(embedder_config: EmbedderConfig):
         # Test embedder health
         is_healthy = await embedder.health_check()
         if not is_healthy:
+            embedder.close()
             raise HTTPException(status_code=400, detail="Embedder health check failed")
         
         # Save configuration
         success = await config_manager.update_embedder_config(embedder_config)
         if not success:
+            embedder.close()
             raise HTTPException(status_code=500, detail="Failed to save embedder configuration")
         
         # Reset chat service to pick up new configuration
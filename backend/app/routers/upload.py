@@ -1,12 +1,13 @@
 import os
 import asyncio
 from typing import List
-from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks, Depends
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Query
 from fastapi.responses import JSONResponse
 
-from app.models.document import DocumentType, DocumentUploadResponse, DocumentProcessingStatus
+from app.models.document import DocumentStatus, DocumentType, DocumentUploadResponse, DocumentProcessingStatus
 from app.models.search import SearchRequest, SearchResponse
 from app.services.document_service import document_service
+from app.services.upload_spool import spool_upload, UploadTooLarge
 from app.config.settings import settings
 from app.auth.keycloak import get_current_user, KeycloakUser
 
@@ -35,43 +36,50 @@ def get_document_type(filename: str) -> DocumentType:
     return type_mapping[extension]
 
 
-async def process_document_background(document_id: str, file_content: bytes):
-    """Background task for processing documents"""
-    try:
-        await document_service.process_and_embed_document(document_id, file_content)
-    except Exception as e:
-        print(f"Error processing document {document_id}: {e}")
-
-
 @router.post("/", response_model=DocumentUploadResponse)
 async def upload_document(
-    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     current_user: KeycloakUser = Depends(get_current_user)
 ):
     """Upload and process a document"""
     try:
-        # Validate file size
-        file_content = await file.read()
-        if len(file_content) > settings.max_file_size:
-            raise HTTPException(
-                status_code=413,
-                detail=f"File too large. Maximum size is {settings.max_file_size} bytes"
-            )
-        
         # Determine file type
         file_type = get_document_type(file.filename)
         
-        # Create document record
-        document = await document_service.create_document(file.filename, file_type)
+        # Stream to the spool directory, rejecting as soon as the size limit is passed
+        try:
+            spooled = await spool_upload(
+                file,
+                os.path.join(settings.upload_dir, "spool"),
+                settings.max_file_size,
+                chunk_size=settings.upload_chunk_size
+            )
+        except UploadTooLarge as e:
+            raise HTTPException(status_code=413, detail=str(e))
         
-        # Start background processing
-        background_tasks.add_task(process_document_background, document.id, file_content)
+        # Reuse a document with identical bytes, otherwise create one and queue the spooled file for ingestion
+        try:
+            existing = await document_service.find_duplicate(spooled.sha256)
+            if existing is not None:
+                spooled.discard()
+                return DocumentUploadResponse(
+                    document_id=existing.id,
+                    status=existing.status,
+                    message=f"Document '{file.filename}' is identical to '{existing.filename}'. Using the existing document.",
+                    duplicate=True
+                )
+            document = await document_service.create_document(
+                file.filename, file_type, file_size=spooled.size, content_hash=spooled.sha256
+            )
+            await document_service.enqueue_document(document, spooled.path)
+        except Exception:
+            spooled.discard()
+            raise
         
         return DocumentUploadResponse(
             document_id=document.id,
             status=document.status,
-            message=f"Document '{file.filename}' uploaded successfully. Processing started."
+            message=f"Document '{file.filename}' uploaded successfully. Queued for processing."
         )
         
     except HTTPException:
@@ -80,11 +88,75 @@ async def upload_document(
         raise HTTPException(status_code=500, detail=f"Failed to upload document: {str(e)}")
 
 
+@router.put("/{document_id}", response_model=DocumentUploadResponse)
+async def update_document(
+    document_id: str,
+    file: UploadFile = File(...),
+    current_user: KeycloakUser = Depends(get_current_user)
+):
+    """Upload a revised version of a document, re-embedding only its new or changed chunks"""
+    try:
+        file_type = get_document_type(file.filename)
+        document = await asyncio.to_thread(document_service.get_document, document_id)
+        if not document:
+            raise HTTPException(status_code=404, detail="Document not found")
+        
+        try:
+            spooled = await spool_upload(
+                file,
+                os.path.join(settings.upload_dir, "spool"),
+                settings.max_file_size,
+                chunk_size=settings.upload_chunk_size
+            )
+        except UploadTooLarge as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        
+        if spooled.sha256 == document.content_hash and document.status != DocumentStatus.ERROR:
+            spooled.discard()
+            return DocumentUploadResponse(
+                document_id=document.id,
+                status=document.status,
+                message=f"Document '{file.filename}' is unchanged.",
+                duplicate=True,
+                indexing=document.metadata.get("indexing")
+            )
+        
+        try:
+            document = await document_service.update_document(
+                document_id, file.filename, file_type, spooled.path,
+                file_size=spooled.size, content_hash=spooled.sha256
+            )
+        except ValueError as e:
+            spooled.discard()
+            raise HTTPException(status_code=409, detail=str(e))
+        except Exception:
+            spooled.discard()
+            raise
+        if document is None:
+            spooled.discard()
+            raise HTTPException(status_code=404, detail="Document not found")
+        
+        return DocumentUploadResponse(
+            document_id=document.id,
+            status=document.status,
+            message=(
+                f"Document '{file.filename}' uploaded successfully. Queued for re-indexing; "
+                f"GET /upload/status/{document.id} reports chunks embedded, reused and removed once done."
+            ),
+            indexing=document.metadata.get("indexing")
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to update document: {str(e)}")
+
+
 @router.get("/status/{document_id}", response_model=DocumentProcessingStatus)
 async def get_document_status(document_id: str, current_user: KeycloakUser = Depends(get_current_user)):
     """Get document processing status"""
     try:
-        status = document_service.get_document_status(document_id)
+        status = await asyncio.to_thread(document_service.get_document_status, document_id)
         if not status:
             raise HTTPException(status_code=404, detail="Document not found")
         
@@ -97,10 +169,18 @@ async def get_document_status(document_id: str, current_user: KeycloakUser = Dep
 
 
 @router.get("/list")
-async def list_documents(current_user: KeycloakUser = Depends(get_current_user)):
-    """List all documents"""
+async def list_documents(
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: KeycloakUser = Depends(get_current_user)
+):
+    """List documents, a page at a time"""
     try:
-        documents = document_service.list_documents()
+        # Registry reads are SQLite queries; keep them off the event loop
+        documents, total = await asyncio.gather(
+            asyncio.to_thread(document_service.list_documents, offset=offset, limit=limit),
+            asyncio.to_thread(document_service.count_documents)
+        )
         return {
             "documents": [
                 {
@@ -110,12 +190,15 @@ async def list_documents(current_user: KeycloakUser = Depends(get_current_user))
                     "status": doc.status,
                     "created_at": doc.created_at,
                     "processed_at": doc.processed_at,
-                    "chunks_count": len(doc.chunks),
-                    "error_message": doc.error_message
+                    "chunks_count": len(doc.chunks) or doc.chunks_count,
+                    "error_message": doc.error_message,
+                    "indexing": doc.metadata.get("indexing")
                 }
                 for doc in documents
             ],
-            "total": len(documents)
+            "total": total,
+            "offset": offset,
+            "limit": limit
         }
         
     except Exception as e:
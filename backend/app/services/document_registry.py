@@ -0,0 +1,327 @@
+"""
+Persistent document registry: document metadata and chunk references, without content or vectors.
+
+Chunks are content-addressed: each distinct normalised chunk text is stored as
+one vector, and every document chunk with that text references it. The vector's
+payload describes one of those documents, its owner, recorded in chunk_vectors.
+"""
+
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.models.document import Document, DocumentStatus, DocumentType
+
+_DOCUMENT_COLUMNS = (
+    "id", "filename", "file_type", "file_size", "content_hash", "status",
+    "chunks_count", "metadata", "error_message", "created_at", "processed_at"
+)
+_UPDATES = ", ".join(f"{column} = excluded.{column}" for column in _DOCUMENT_COLUMNS[1:])
+
+
+class DocumentRegistry:
+    """SQLite-backed registry of documents and the IDs/offsets of their stored chunks"""
+
+    # Stay well below SQLite's bound-parameter limit
+    _LOOKUP_BATCH = 500
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS documents ("
+            "id TEXT PRIMARY KEY, filename TEXT NOT NULL, file_type TEXT NOT NULL, file_size INTEGER, "
+            "content_hash TEXT, status TEXT NOT NULL, chunks_count INTEGER NOT NULL, metadata TEXT NOT NULL, "
+            "error_message TEXT, created_at TEXT NOT NULL, processed_at TEXT)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_documents_created_at ON documents(created_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_documents_content_hash ON documents(content_hash)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS chunks ("
+            "id TEXT PRIMARY KEY, document_id TEXT NOT NULL REFERENCES documents(id) ON DELETE CASCADE, "
+            "chunk_index INTEGER NOT NULL, chunk_start INTEGER, chunk_end INTEGER, page INTEGER, "
+            "content_hash TEXT, vector_id TEXT)"
+        )
+        # Registries created before chunk deduplication lack the last two columns
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(chunks)")}
+        for column in ("content_hash", "vector_id"):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE chunks ADD COLUMN {column} TEXT")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_chunks_document ON chunks(document_id, chunk_index)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_chunks_vector ON chunks(vector_id)")
+        # Which stored vector holds each distinct chunk text, and whose details its payload carries
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS chunk_vectors ("
+            "content_hash TEXT PRIMARY KEY, vector_id TEXT NOT NULL, document_id TEXT)"
+        )
+        if "document_id" not in {row[1] for row in self._conn.execute("PRAGMA table_info(chunk_vectors)")}:
+            # Before owners were tracked, a vector's payload came from the chunk it was stored as
+            self._conn.execute("ALTER TABLE chunk_vectors ADD COLUMN document_id TEXT")
+            self._conn.execute(
+                "UPDATE chunk_vectors SET document_id = "
+                "(SELECT document_id FROM chunks WHERE chunks.id = chunk_vectors.vector_id)"
+            )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_chunk_vectors_owner ON chunk_vectors(document_id)")
+        self._conn.commit()
+
+    @staticmethod
+    def _row(document: Document) -> Tuple:
+        return (
+            document.id,
+            document.filename,
+            document.file_type.value,
+            document.file_size,
+            document.content_hash,
+            document.status.value,
+            len(document.chunks) or document.chunks_count,
+            json.dumps(document.metadata, default=str),
+            document.error_message,
+            document.created_at.isoformat(),
+            document.processed_at.isoformat() if document.processed_at else None
+        )
+
+    @staticmethod
+    def _document(row: Tuple) -> Document:
+        values = dict(zip(_DOCUMENT_COLUMNS, row))
+        return Document(
+            id=values["id"],
+            filename=values["filename"],
+            file_type=DocumentType(values["file_type"]),
+            file_size=values["file_size"],
+            content_hash=values["content_hash"],
+            status=DocumentStatus(values["status"]),
+            chunks_count=values["chunks_count"],
+            metadata=json.loads(values["metadata"]),
+            error_message=values["error_message"],
+            created_at=datetime.fromisoformat(values["created_at"]),
+            processed_at=datetime.fromisoformat(values["processed_at"]) if values["processed_at"] else None
+        )
+
+    def save(self, document: Document) -> None:
+        """Write a document's record and, if it has chunks, replace its chunk references"""
+        placeholders = ",".join("?" * len(_DOCUMENT_COLUMNS))
+        with self._lock:
+            # Upsert rather than REPLACE, which would cascade-delete the chunk references
+            self._conn.execute(
+                f"INSERT INTO documents ({','.join(_DOCUMENT_COLUMNS)}) VALUES ({placeholders}) "
+                f"ON CONFLICT(id) DO UPDATE SET {_UPDATES}",
+                self._row(document)
+            )
+            if document.chunks:
+                self._conn.execute("DELETE FROM chunks WHERE document_id = ?", (document.id,))
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO chunks "
+                    "(id, document_id, chunk_index, chunk_start, chunk_end, page, content_hash, vector_id) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            chunk.id,
+                            document.id,
+                            chunk.metadata.get("chunk_index", i),
+                            chunk.metadata.get("chunk_start"),
+                            chunk.metadata.get("chunk_end"),
+                            chunk.metadata.get("page"),
+                            chunk.metadata.get("content_hash"),
+                            chunk.metadata.get("vector_id", chunk.id)
+                        )
+                        for i, chunk in enumerate(document.chunks)
+                    ]
+                )
+            self._conn.commit()
+
+    def update_status(self, document_id: str, status: DocumentStatus, error_message: Optional[str] = None) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE documents SET status = ?, error_message = ? WHERE id = ?",
+                (status.value, error_message, document_id)
+            )
+            self._conn.commit()
+
+    def get(self, document_id: str) -> Optional[Document]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {','.join(_DOCUMENT_COLUMNS)} FROM documents WHERE id = ?", (document_id,)
+            ).fetchone()
+        return self._document(row) if row else None
+
+    def find_by_hash(self, content_hash: str) -> Optional[Document]:
+        """Most recent document uploaded with these exact file bytes that hasn't failed"""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {','.join(_DOCUMENT_COLUMNS)} FROM documents WHERE content_hash = ? AND status != ? "
+                "ORDER BY created_at DESC LIMIT 1",
+                (content_hash, DocumentStatus.ERROR.value)
+            ).fetchone()
+        return self._document(row) if row else None
+
+    def list(self, offset: int = 0, limit: int = 100) -> List[Document]:
+        """Page through documents, oldest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {','.join(_DOCUMENT_COLUMNS)} FROM documents ORDER BY created_at, id LIMIT ? OFFSET ?",
+                (limit, offset)
+            ).fetchall()
+        return [self._document(row) for row in rows]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def chunk_refs(self, document_id: str) -> List[Dict[str, Any]]:
+        """Chunk IDs and offsets of a document, in chunk order"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, chunk_index, chunk_start, chunk_end, page FROM chunks "
+                "WHERE document_id = ? ORDER BY chunk_index",
+                (document_id,)
+            ).fetchall()
+        return [
+            {"id": row[0], "chunk_index": row[1], "chunk_start": row[2], "chunk_end": row[3], "page": row[4]}
+            for row in rows
+        ]
+
+    def chunk_ids(self, document_id: str) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id FROM chunks WHERE document_id = ? ORDER BY chunk_index", (document_id,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def vector_ids(self, document_id: str) -> List[str]:
+        """Distinct vectors a document's chunks reference"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT vector_id FROM chunks WHERE document_id = ?", (document_id,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def find_vectors(self, content_hashes: List[str]) -> Dict[str, str]:
+        """Map chunk content hashes to the IDs of vectors already stored for them"""
+        found: Dict[str, str] = {}
+        with self._lock:
+            for i in range(0, len(content_hashes), self._LOOKUP_BATCH):
+                batch = content_hashes[i:i + self._LOOKUP_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                found.update(self._conn.execute(
+                    f"SELECT content_hash, vector_id FROM chunk_vectors WHERE content_hash IN ({placeholders})", batch
+                ).fetchall())
+        return found
+
+    def add_vectors(self, entries: List[Tuple[str, str, str]]) -> None:
+        """Record (content hash, vector ID, owning document ID) for newly stored vectors"""
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO chunk_vectors (content_hash, vector_id, document_id) VALUES (?, ?, ?)", entries
+            )
+            self._conn.commit()
+
+    def owned_vectors(self, vector_ids: List[str], document_id: str) -> List[str]:
+        """The given vectors whose payload describes ``document_id``"""
+        owned: List[str] = []
+        with self._lock:
+            for i in range(0, len(vector_ids), self._LOOKUP_BATCH):
+                batch = vector_ids[i:i + self._LOOKUP_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                owned.extend(row[0] for row in self._conn.execute(
+                    f"SELECT vector_id FROM chunk_vectors WHERE vector_id IN ({placeholders}) AND document_id = ?",
+                    (*batch, document_id)
+                ))
+        return owned
+
+    def orphaned_payloads(self, document_id: str) -> List[Dict[str, Any]]:
+        """Vectors whose payload describes ``document_id`` although only other documents reference them now.
+
+        For each, pick the earliest-created remaining document and return the
+        payload fields that describe its chunk: call after the document's own
+        chunk references were replaced or deleted, then ``set_owners``.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT cv.vector_id, d.id, d.filename, d.file_type, d.content_hash, "
+                "c.chunk_index, c.chunk_start, c.chunk_end, c.page "
+                "FROM chunk_vectors cv JOIN chunks c ON c.vector_id = cv.vector_id "
+                "JOIN documents d ON d.id = c.document_id "
+                "WHERE cv.document_id = ? AND NOT EXISTS "
+                "(SELECT 1 FROM chunks own WHERE own.vector_id = cv.vector_id AND own.document_id = ?) "
+                "ORDER BY cv.vector_id, d.created_at, d.id, c.chunk_index",
+                (document_id, document_id)
+            ).fetchall()
+        moves: Dict[str, Dict[str, Any]] = {}
+        for vector_id, owner, filename, file_type, content_hash, chunk_index, start, end, page in rows:
+            if vector_id in moves:
+                continue
+            metadata = {
+                "document_id": owner,
+                "document_hash": content_hash,
+                "filename": filename,
+                "file_type": file_type,
+                "chunk_index": chunk_index,
+                "chunk_start": start,
+                "chunk_end": end,
+                "page": page
+            }
+            moves[vector_id] = {key: value for key, value in metadata.items() if value is not None}
+        return [{"vector_id": vector_id, "metadata": metadata} for vector_id, metadata in moves.items()]
+
+    def set_owners(self, owners: Dict[str, str]) -> None:
+        """Record which document each vector's payload now describes, keyed by vector ID"""
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE chunk_vectors SET document_id = ? WHERE vector_id = ?",
+                [(document_id, vector_id) for vector_id, document_id in owners.items()]
+            )
+            self._conn.commit()
+
+    def documents_for_vectors(self, vector_ids: List[str]) -> Dict[str, List[Dict[str, str]]]:
+        """Every document referencing each vector, oldest first, as {"document_id", "filename"}"""
+        found: Dict[str, List[Dict[str, str]]] = {}
+        with self._lock:
+            for i in range(0, len(vector_ids), self._LOOKUP_BATCH):
+                batch = vector_ids[i:i + self._LOOKUP_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    "SELECT DISTINCT c.vector_id, d.id, d.filename, d.created_at FROM chunks c "
+                    f"JOIN documents d ON d.id = c.document_id WHERE c.vector_id IN ({placeholders}) "
+                    "ORDER BY d.created_at, d.id",
+                    batch
+                ).fetchall()
+                for vector_id, document_id, filename, _ in rows:
+                    found.setdefault(vector_id, []).append({"document_id": document_id, "filename": filename})
+        return found
+
+    def unreferenced(self, vector_ids: List[str], document_id: str) -> List[str]:
+        """The given vectors that no chunk of any other document references"""
+        referenced = set()
+        with self._lock:
+            for i in range(0, len(vector_ids), self._LOOKUP_BATCH):
+                batch = vector_ids[i:i + self._LOOKUP_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                referenced.update(row[0] for row in self._conn.execute(
+                    f"SELECT DISTINCT vector_id FROM chunks WHERE vector_id IN ({placeholders}) AND document_id != ?",
+                    (*batch, document_id)
+                ))
+        return [vector_id for vector_id in vector_ids if vector_id not in referenced]
+
+    def forget_vectors(self, vector_ids: List[str]) -> None:
+        """Drop content hash entries for vectors deleted from the vector DB"""
+        with self._lock:
+            self._conn.executemany("DELETE FROM chunk_vectors WHERE vector_id = ?", [(v,) for v in vector_ids])
+            self._conn.commit()
+
+    def delete(self, document_id: str) -> None:
+        """Remove a document and its chunk references"""
+        with self._lock:
+            self._conn.execute("DELETE FROM documents WHERE id = ?", (document_id,))
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -1,7 +1,7 @@
 import uuid
 import asyncio
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Awaitable, Callable, Dict, List, Optional, Any, Set, Union
 from pathlib import Path
 
 from app.models.document import Document, DocumentStatus, DocumentType, DocumentProcessingStatus
@@ -9,45 +9,140 @@ from app.models.search import SearchRequest, SearchResponse, SearchResult
 from app.core.document_processor.langchain_processor import LangChainDocumentProcessor
 from app.core.embedders.base import BaseEmbedder
 from app.core.vector_db.base import BaseVectorDBClient
-from app.config.settings import config_manager
+from app.config.settings import config_manager, settings
+from app.services.ingestion_pipeline import IngestionPipeline, StageStats, STAGES
+from app.services.job_queue import ingestion_queue, IngestJob, QUEUED, RUNNING, DONE, FAILED
+from app.services.document_registry import DocumentRegistry
 
 
 class DocumentService:
     """Service for managing document processing and embedding operations"""
     
     def __init__(self):
+        # Documents with work in progress; released once their vectors are stored.
+        # Everything else lives in the registry as metadata and chunk references only.
         self.documents: Dict[str, Document] = {}
+        self.registry: Optional[DocumentRegistry] = None
         self.document_processor = None
         self.embedder: Optional[BaseEmbedder] = None
         self.vector_db: Optional[BaseVectorDBClient] = None
         
+        # Per-stage counters shared by every ingestion, and pipelines still running
+        self.pipeline_stats: Dict[str, StageStats] = {name: StageStats(name) for name in STAGES}
+        self._pipelines: Dict[str, IngestionPipeline] = {}
+        # Chunks embedded vs. reused from stored vectors, and vectors released by re-indexing
+        self.reuse_stats: Dict[str, int] = {"updates": 0, "embedded": 0, "reused": 0, "removed": 0}
+        # Documents an update is queueing a new version for, claimed before its first await
+        self._updating: Set[str] = set()
+        
     def _initialize_processor(self):
         """Initialize document processor with current settings"""
         config = config_manager.get_current_config()
         if config:
             self.document_processor = LangChainDocumentProcessor(
                 chunk_size=config.chunk_size,
-                chunk_overlap=config.chunk_overlap
+                chunk_overlap=config.chunk_overlap,
+                pdf_parallel_min_pages=settings.pdf_parallel_min_pages,
+                memory_load_max_bytes=settings.text_memory_load_max_bytes
             )
         else:
-            self.document_processor = LangChainDocumentProcessor()
+            self.document_processor = LangChainDocumentProcessor(
+                pdf_parallel_min_pages=settings.pdf_parallel_min_pages,
+                memory_load_max_bytes=settings.text_memory_load_max_bytes
+            )
+    
+    def open_registry(self, path: str) -> None:
+        """Open the persistent document registry"""
+        self.registry = DocumentRegistry(path)
+    
+    def close_registry(self) -> None:
+        """Close the persistent document registry"""
+        if self.registry is not None:
+            self.registry.close()
+            self.registry = None
+    
+    def _store(self) -> DocumentRegistry:
+        if self.registry is None:
+            raise RuntimeError("Document registry is not open")
+        return self.registry
+    
+    def _load(self, document_id: str) -> Optional[Document]:
+        """Get a document to work on, loading its record from the registry if it isn't in memory"""
+        document = self.documents.get(document_id)
+        if document is None and self.registry is not None:
+            document = self.registry.get(document_id)
+            if document is not None:
+                self.documents[document_id] = document
+        return document
+    
+    async def _persist(self, document: Document, release: bool = False) -> None:
+        """Save a document's record and chunk references; ``release`` drops its content and chunks from memory"""
+        await asyncio.to_thread(self._store().save, document)
+        if release:
+            self.documents.pop(document.id, None)
+    
+    async def _release_vectors(self, document_id: str, vector_ids: List[str]) -> List[str]:
+        """Delete those of a document's former vectors that no other document references; return them"""
+        vector_ids = await asyncio.to_thread(self._store().unreferenced, vector_ids, document_id)
+        # Ingests in progress haven't saved their chunk references yet
+        in_progress = {
+            chunk.metadata.get("vector_id")
+            for other_id, other in self.documents.items() if other_id != document_id
+            for chunk in other.chunks
+        }
+        vector_ids = [vector_id for vector_id in vector_ids if vector_id not in in_progress]
+        if vector_ids:
+            await self.vector_db.delete_vectors(vector_ids)
+            await asyncio.to_thread(self._store().forget_vectors, vector_ids)
+        return vector_ids
+    
+    async def _hand_over_vectors(self, document_id: str) -> None:
+        """Repoint payloads of shared vectors that described a document no longer referencing them"""
+        moves = await asyncio.to_thread(self._store().orphaned_payloads, document_id)
+        if not moves:
+            return
+        await self.vector_db.update_metadata({move["vector_id"]: move["metadata"] for move in moves})
+        await asyncio.to_thread(
+            self._store().set_owners, {move["vector_id"]: move["metadata"]["document_id"] for move in moves}
+        )
+    
+    async def _mark_error(self, document_id: str, error: Exception) -> None:
+        """Record a failure in the registry and release the document's in-memory state"""
+        document = self.documents.pop(document_id, None)
+        if document is not None:
+            document.status = DocumentStatus.ERROR
+            document.error_message = str(error)
+        if self.registry is not None:
+            await asyncio.to_thread(self.registry.update_status, document_id, DocumentStatus.ERROR, str(error))
     
-    async def create_document(self, filename: str, file_type: DocumentType) -> Document:
+    async def create_document(
+        self,
+        filename: str,
+        file_type: DocumentType,
+        file_size: Optional[int] = None,
+        content_hash: Optional[str] = None
+    ) -> Document:
         """Create a new document record"""
         document_id = str(uuid.uuid4())
         document = Document(
             id=document_id,
             filename=filename,
             file_type=file_type,
+            file_size=file_size,
+            content_hash=content_hash,
             status=DocumentStatus.UPLOADED
         )
-        self.documents[document_id] = document
+        await self._persist(document)
         return document
     
-    async def process_document(self, document_id: str, file_content: bytes) -> bool:
+    async def find_duplicate(self, content_hash: str) -> Optional[Document]:
+        """Find a document already uploaded with identical file bytes that hasn't failed"""
+        return await asyncio.to_thread(self._store().find_by_hash, content_hash)
+    
+    async def process_document(self, document_id: str, file_content: Union[bytes, Path]) -> bool:
         """Process a document: extract text, clean, and split into chunks"""
         try:
-            document = self.documents.get(document_id)
+            document = self._load(document_id)
             if not document:
                 raise ValueError(f"Document {document_id} not found")
             
@@ -65,14 +160,13 @@ class DocumentService:
             self.documents[document_id] = processed_document
             processed_document.status = DocumentStatus.PROCESSED
             processed_document.processed_at = datetime.utcnow()
+            await self._persist(processed_document)
             
             return True
             
         except Exception as e:
             # Update status to error
-            if document_id in self.documents:
-                self.documents[document_id].status = DocumentStatus.ERROR
-                self.documents[document_id].error_message = str(e)
+            await self._mark_error(document_id, e)
             raise e
     
     async def embed_document(self, document_id: str) -> bool:
@@ -93,7 +187,7 @@ class DocumentService:
             # Generate embeddings
             embeddings = await self.embedder.embed_texts(texts)
             
-            # Update chunks with embeddings
+            # Update chunks with embeddings (row views into one float32 array)
             for i, chunk in enumerate(document.chunks):
                 if i < len(embeddings):
                     chunk.embedding = embeddings[i]
@@ -103,9 +197,7 @@ class DocumentService:
             
         except Exception as e:
             # Update status to error
-            if document_id in self.documents:
-                self.documents[document_id].status = DocumentStatus.ERROR
-                self.documents[document_id].error_message = str(e)
+            await self._mark_error(document_id, e)
             raise e
     
     async def store_vectors(self, document_id: str) -> bool:
@@ -119,7 +211,7 @@ class DocumentService:
                 raise ValueError("Vector database not configured")
             
             # Filter chunks that have embeddings
-            embedded_chunks = [chunk for chunk in document.chunks if chunk.embedding]
+            embedded_chunks = [chunk for chunk in document.chunks if chunk.embedding is not None]
             if not embedded_chunks:
                 raise ValueError("No embedded chunks to store")
             
@@ -128,32 +220,174 @@ class DocumentService:
             if not success:
                 raise RuntimeError("Failed to store vectors")
             
+            # Vectors are in the vector DB now; keep only the record and chunk references
+            await self._persist(document, release=True)
             return True
             
         except Exception as e:
             # Update status to error
-            if document_id in self.documents:
-                self.documents[document_id].status = DocumentStatus.ERROR
-                self.documents[document_id].error_message = str(e)
+            await self._mark_error(document_id, e)
             raise e
     
-    async def process_and_embed_document(self, document_id: str, file_content: bytes) -> bool:
-        """Complete document processing pipeline"""
+    async def process_and_embed_document(
+        self,
+        document_id: str,
+        file_content: Union[bytes, Path],
+        resume_from: int = 0,
+        on_batch_stored: Optional[Callable[[int, int], Awaitable[None]]] = None
+    ) -> bool:
+        """Complete document processing pipeline, streaming chunk batches through embed and upsert"""
         try:
-            # Process document
-            await self.process_document(document_id, file_content)
+            document = self._load(document_id)
+            if not document:
+                raise ValueError(f"Document {document_id} not found")
             
-            # Generate embeddings
-            await self.embed_document(document_id)
+            if not self.embedder:
+                raise ValueError("Embedder not configured")
+            
+            if not self.vector_db:
+                raise ValueError("Vector database not configured")
+            
+            # Initialize processor if needed
+            if not self.document_processor:
+                self._initialize_processor()
             
-            # Store vectors
-            await self.store_vectors(document_id)
+            # Vectors of the version being replaced, if this is a re-index
+            previous = await asyncio.to_thread(self._store().vector_ids, document_id) if self.registry else []
             
+            pipeline = IngestionPipeline(
+                self.document_processor,
+                self.embedder,
+                self.vector_db,
+                batch_size=settings.ingest_batch_size,
+                queue_size=settings.ingest_queue_size,
+                stats=self.pipeline_stats,
+                resume_from=resume_from,
+                on_batch_stored=on_batch_stored,
+                chunk_index=self.registry
+            )
+            self._pipelines[document_id] = pipeline
+            try:
+                await pipeline.run(document, file_content)
+            finally:
+                del self._pipelines[document_id]
+            
+            current = {chunk.metadata.get("vector_id", chunk.id) for chunk in document.chunks}
+            document.metadata["indexing"] = {
+                "embedded": pipeline.embedded,
+                "reused": pipeline.deduplicated,
+                "removed": 0
+            }
+            
+            # Keep only the record and chunk references once every vector is stored
+            await self._persist(document, release=True)
+            
+            # Re-index: drop only the previous version's vectors that are no longer referenced
+            stale = [vector_id for vector_id in previous if vector_id not in current]
+            if stale:
+                removed = await self._release_vectors(document_id, stale)
+                document.metadata["indexing"]["removed"] = len(removed)
+                await asyncio.to_thread(self._store().save, document)
+                # Stale vectors other documents still use must stop citing this one
+                await self._hand_over_vectors(document_id)
+            
+            if previous:
+                self.reuse_stats["updates"] += 1
+            for key in ("embedded", "reused", "removed"):
+                self.reuse_stats[key] += document.metadata["indexing"][key]
             return True
             
         except Exception as e:
+            # Update status to error
+            await self._mark_error(document_id, e)
             raise e
     
+    async def run_ingest_job(self, job: IngestJob, checkpoint: Callable[[int, int], Awaitable[None]]) -> None:
+        """Ingestion queue handler: process a spooled upload, resuming after its last stored batch"""
+        document = self._load(job.document_id)
+        if document is not None:
+            # A retry after a failed attempt starts clean
+            document.error_message = None
+        else:
+            # Job without a registry record; recreate the document from the job
+            self.documents[job.document_id] = Document(
+                id=job.document_id,
+                filename=job.filename,
+                file_type=DocumentType(job.file_type),
+                file_size=job.file_size,
+                content_hash=job.content_hash,
+                status=DocumentStatus.UPLOADED
+            )
+        await self.process_and_embed_document(
+            job.document_id, Path(job.file_path), resume_from=job.stored, on_batch_stored=checkpoint
+        )
+    
+    async def fail_ingest_job(self, job: IngestJob, error: str) -> None:
+        """Ingestion queue callback for a job given up on before it ran: mark its document failed"""
+        await self._mark_error(job.document_id, RuntimeError(error))
+    
+    async def update_document(
+        self,
+        document_id: str,
+        filename: str,
+        file_type: DocumentType,
+        file_path: Path,
+        file_size: Optional[int] = None,
+        content_hash: Optional[str] = None
+    ) -> Optional[Document]:
+        """Queue a revised version of a document for incremental re-indexing.
+
+        The new version is re-chunked under the same document ID; chunks whose
+        text is unchanged reuse their stored vectors, only new or changed
+        chunks are embedded, and vectors of removed chunks are deleted once
+        the new version is stored. Returns None if the document doesn't exist.
+        """
+        document = self._load(document_id)
+        if document is None:
+            return None
+        job = ingestion_queue.get(document_id)
+        if document_id in self._updating or document.status in (DocumentStatus.PROCESSING, DocumentStatus.PROCESSED) or (
+            job is not None and job.status in (QUEUED, RUNNING)
+        ):
+            raise ValueError(f"Document {document_id} is still being processed")
+        
+        # Claim the document before awaiting, so a concurrent update is refused above
+        self._updating.add(document_id)
+        try:
+            document.filename = filename
+            document.file_type = file_type
+            document.file_size = file_size
+            document.content_hash = content_hash
+            document.status = DocumentStatus.UPLOADED
+            document.error_message = None
+            document.processed_at = None
+            # The previous version's report no longer describes what is indexed
+            document.metadata.pop("indexing", None)
+            await self._persist(document)
+            await self.enqueue_document(document, file_path)
+        finally:
+            self._updating.discard(document_id)
+        return document
+    
+    async def enqueue_document(self, document: Document, file_path: Path) -> None:
+        """Queue a created document's spooled upload for ingestion"""
+        await ingestion_queue.enqueue(IngestJob(
+            document_id=document.id,
+            filename=document.filename,
+            file_type=document.file_type.value,
+            file_path=str(file_path),
+            file_size=document.file_size,
+            content_hash=document.content_hash
+        ))
+    
+    def pipeline_metrics(self) -> Dict[str, Any]:
+        """Get per-stage ingestion throughput counters"""
+        return {
+            "active": len(self._pipelines),
+            "stages": {name: stats.metrics() for name, stats in self.pipeline_stats.items()},
+            "reuse": dict(self.reuse_stats)
+        }
+    
     async def search_documents(self, request: SearchRequest) -> SearchResponse:
         """Search for similar documents"""
         start_time = asyncio.get_event_loop().time()
@@ -176,6 +410,15 @@ class DocumentService:
                 filter_metadata=request.filter_metadata
             )
             
+            # A deduplicated chunk belongs to every document that contains it
+            if results and self.registry is not None:
+                documents = await asyncio.to_thread(
+                    self.registry.documents_for_vectors, [result.chunk_id for result in results]
+                )
+                for result in results:
+                    if result.chunk_id in documents:
+                        result.metadata["documents"] = documents[result.chunk_id]
+            
             execution_time = asyncio.get_event_loop().time() - start_time
             
             return SearchResponse(
@@ -189,64 +432,111 @@ class DocumentService:
             raise RuntimeError(f"Failed to search documents: {str(e)}")
     
     def get_document(self, document_id: str) -> Optional[Document]:
-        """Get document by ID"""
-        return self.documents.get(document_id)
+        """Get document by ID, in memory while being worked on and from the registry otherwise"""
+        document = self.documents.get(document_id)
+        if document is None and self.registry is not None:
+            document = self.registry.get(document_id)
+        return document
     
     def get_document_status(self, document_id: str) -> Optional[DocumentProcessingStatus]:
-        """Get document processing status"""
-        document = self.documents.get(document_id)
-        if not document:
+        """Get document processing status, from the ingestion queue when the document has a job"""
+        document = self.get_document(document_id)
+        job = ingestion_queue.get(document_id)
+        if not document and not job:
             return None
+        document_chunks = (len(document.chunks) or document.chunks_count) if document else 0
         
-        embedded_count = sum(1 for chunk in document.chunks if chunk.embedding)
+        if job:
+            chunks_count = max(job.chunks_count, document_chunks)
+            pipeline = self._pipelines.get(document_id)
+            embedded_count = pipeline.stored if pipeline is not None else job.stored
+            if job.status == QUEUED:
+                status = DocumentStatus.UPLOADED
+            elif job.status == DONE:
+                status = DocumentStatus.EMBEDDED
+            elif job.status == FAILED:
+                status = DocumentStatus.ERROR
+            else:
+                status = document.status if document else DocumentStatus.PROCESSING
+            error_message = job.error if job.status == FAILED else None
+        else:
+            # Streamed ingests drop vectors once stored, so count from the pipeline
+            chunks_count = document_chunks
+            pipeline = self._pipelines.get(document_id)
+            if pipeline is not None:
+                embedded_count = pipeline.stored
+            elif document.status == DocumentStatus.EMBEDDED:
+                embedded_count = chunks_count
+            else:
+                embedded_count = sum(1 for chunk in document.chunks if chunk.embedding is not None)
+            status = document.status
+            error_message = document.error_message
         progress = 0.0
         
-        if document.status == DocumentStatus.UPLOADED:
+        if status == DocumentStatus.UPLOADED:
             progress = 0.0
-        elif document.status == DocumentStatus.PROCESSING:
+        elif status == DocumentStatus.PROCESSING:
             progress = 25.0
-        elif document.status == DocumentStatus.PROCESSED:
-            progress = 50.0
-        elif document.status == DocumentStatus.EMBEDDED:
+        elif status == DocumentStatus.PROCESSED:
+            progress = 50.0 + 50.0 * embedded_count / max(1, chunks_count)
+        elif status == DocumentStatus.EMBEDDED:
             progress = 100.0
-        elif document.status == DocumentStatus.ERROR:
+        elif status == DocumentStatus.ERROR:
             progress = 0.0
         
         return DocumentProcessingStatus(
             document_id=document_id,
-            status=document.status,
-            chunks_count=len(document.chunks),
+            status=status,
+            chunks_count=chunks_count,
             embedded_count=embedded_count,
-            error_message=document.error_message,
-            progress_percentage=progress
+            error_message=error_message,
+            progress_percentage=progress,
+            indexing=document.metadata.get("indexing") if document and status == DocumentStatus.EMBEDDED else None
         )
     
-    def list_documents(self) -> List[Document]:
-        """List all documents"""
-        return list(self.documents.values())
+    def list_documents(self, offset: int = 0, limit: int = 100) -> List[Document]:
+        """Page through documents in the registry, showing live state for those being worked on"""
+        return [self.documents.get(doc.id, doc) for doc in self._store().list(offset, limit)]
+    
+    def count_documents(self) -> int:
+        """Number of documents in the registry"""
+        return self._store().count()
     
     async def delete_document(self, document_id: str) -> bool:
         """Delete document and its vectors"""
         try:
-            document = self.documents.get(document_id)
+            document = self.get_document(document_id)
             if not document:
                 return False
             
-            # Delete vectors from vector database if configured
-            if self.vector_db and document.chunks:
-                chunk_ids = [chunk.id for chunk in document.chunks]
-                await self.vector_db.delete_vectors(chunk_ids)
+            # Delete vectors from vector database if configured, keeping those other documents share
+            if self.vector_db:
+                if document.chunks:
+                    vector_ids = list(dict.fromkeys(
+                        chunk.metadata.get("vector_id", chunk.id) for chunk in document.chunks
+                    ))
+                else:
+                    vector_ids = await asyncio.to_thread(self._store().vector_ids, document_id)
+                await self._release_vectors(document_id, vector_ids)
+            
+            # Remove from memory, the registry and the job table
+            self.documents.pop(document_id, None)
+            await asyncio.to_thread(self._store().delete, document_id)
+            await ingestion_queue.remove(document_id)
             
-            # Remove from memory
-            del self.documents[document_id]
+            # Shared vectors that survive the delete must stop citing the deleted document
+            if self.vector_db:
+                await self._hand_over_vectors(document_id)
             return True
             
         except Exception as e:
             raise RuntimeError(f"Failed to delete document: {str(e)}")
     
     def set_embedder(self, embedder: BaseEmbedder):
-        """Set the embedder instance"""
-        self.embedder = embedder
+        """Set the embedder instance, releasing the one it replaces"""
+        previous, self.embedder = self.embedder, embedder
+        if previous is not None and previous is not embedder:
+            previous.close()
     
     def set_vector_db(self, vector_db: BaseVectorDBClient):
         """Set the vector database instance"""
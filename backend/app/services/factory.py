@@ -4,6 +4,8 @@ from app.models.config import AppConfig, EmbedderType, VectorDBType, ChatModelTy
 from app.core.embedders.base import BaseEmbedder
 from app.core.embedders.openai_embedder import OpenAIEmbedder
 from app.core.embedders.huggingface_embedder import HuggingFaceEmbedder
+from app.core.embedders.remote_embedder import RemoteEmbedder
+from app.core.embedders.cached_embedder import CachedEmbedder
 from app.core.vector_db.base import BaseVectorDBClient
 from app.core.vector_db.pinecone_client import PineconeClient
 from app.core.vector_db.chromadb_client import ChromaDBClient
@@ -26,15 +28,26 @@ class ServiceFactory:
             if embedder_config.type == EmbedderType.OPENAI:
                 if not embedder_config.openai:
                     raise ValueError("OpenAI configuration is required")
-                return OpenAIEmbedder(embedder_config.openai)
+                embedder = OpenAIEmbedder(embedder_config.openai)
             
             elif embedder_config.type == EmbedderType.HUGGINGFACE:
                 if not embedder_config.huggingface:
                     raise ValueError("HuggingFace configuration is required")
-                return HuggingFaceEmbedder(embedder_config.huggingface)
+                embedder = HuggingFaceEmbedder(embedder_config.huggingface)
+            
+            elif embedder_config.type == EmbedderType.REMOTE:
+                if not embedder_config.remote:
+                    raise ValueError("Remote embedder configuration is required")
+                embedder = RemoteEmbedder(embedder_config.remote)
             
             else:
                 raise ValueError(f"Unsupported embedder type: {embedder_config.type}")
+            
+            # Optionally reuse vectors we've already computed
+            if embedder_config.cache and embedder_config.cache.enabled:
+                embedder = CachedEmbedder(embedder, embedder_config.cache)
+            
+            return embedder
                 
         except Exception as e:
             print(f"Failed to create embedder: {e}")
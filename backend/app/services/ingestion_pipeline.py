@@ -0,0 +1,243 @@
+"""
+Staged ingestion pipeline: whole-document load -> clean -> split, then streamed embed and upsert batches.
+"""
+
+import asyncio
+import hashlib
+import time
+import unicodedata
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple, Union
+
+from app.models.document import Document, DocumentChunk, DocumentStatus
+from app.core.document_processor.base import BaseDocumentProcessor
+from app.core.embedders.base import BaseEmbedder
+from app.core.vector_db.base import BaseVectorDBClient
+from app.core.executors import run_in_pool, PARSING
+from app.services.document_registry import DocumentRegistry
+
+STAGES = ("load", "clean", "split", "embed", "upsert")
+
+
+def chunk_content_hash(text: str) -> str:
+    """SHA-256 of chunk text after Unicode (NFKC) and whitespace normalisation"""
+    normalised = unicodedata.normalize("NFKC", " ".join(text.split()))
+    return hashlib.sha256(normalised.encode("utf-8")).hexdigest()
+
+
+class StageStats:
+    """Throughput counters for one pipeline stage"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 0
+        self.batches = 0
+        self.busy_seconds = 0.0
+        self.failed = 0
+
+    def record(self, items: int, seconds: float) -> None:
+        self.items += items
+        self.batches += 1
+        self.busy_seconds += seconds
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "items": self.items,
+            "batches": self.batches,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "items_per_second": self.items / self.busy_seconds if self.busy_seconds else 0.0,
+            "failed": self.failed
+        }
+
+
+class IngestionPipeline:
+    """Runs one document through load -> clean -> split, then streams its chunks through embed -> upsert.
+
+    Load, clean and split are not streamed: each runs over the whole
+    document, so the cleaned text and every chunk (without vectors) are in
+    memory before the first batch is embedded, and that part of peak memory
+    grows with document size. Only embed and upsert are bounded stages joined
+    by queues: chunks flow to the embedder and the vector DB in batches,
+    embedding batch N+1 overlaps with upserting batch N, and at most
+    ``queue_size`` batches of vectors are held in memory at once.
+
+    ``resume_from`` skips chunks a previous run already stored, and
+    ``on_batch_stored(stored, total)`` is awaited after every upserted batch
+    so callers can checkpoint progress.
+
+    With a ``chunk_index``, chunks whose normalised text is already stored
+    (by this or any other document) skip embedding and upserting; they
+    reference the existing vector through ``metadata["vector_id"]``. When the
+    existing vector's payload describes this same document (an earlier
+    version of it), the payload is rewritten with the new chunk's metadata,
+    so offsets, page and chunk index match the version now indexed.
+    """
+
+    def __init__(
+        self,
+        processor: BaseDocumentProcessor,
+        embedder: BaseEmbedder,
+        vector_db: BaseVectorDBClient,
+        batch_size: int = 64,
+        queue_size: int = 2,
+        stats: Optional[Dict[str, StageStats]] = None,
+        resume_from: int = 0,
+        on_batch_stored: Optional[Callable[[int, int], Awaitable[None]]] = None,
+        chunk_index: Optional[DocumentRegistry] = None
+    ):
+        self.processor = processor
+        self.embedder = embedder
+        self.vector_db = vector_db
+        self.batch_size = max(1, batch_size)
+        self.queue_size = max(1, queue_size)
+        self.stats = stats if stats is not None else {name: StageStats(name) for name in STAGES}
+        self.resume_from = max(0, resume_from)
+        self.on_batch_stored = on_batch_stored
+        self.chunk_index = chunk_index
+        self.stored = self.resume_from
+        self.total = 0
+        self.embedded = 0
+        self.deduplicated = 0
+        # Content hash -> vector ID for chunks this run has stored or queued
+        self._vectors: Dict[str, str] = {}
+        # Stored vectors describing an earlier version of this document, not yet given the new payload
+        self._stale_payloads: Set[str] = set()
+        self._document_id: Optional[str] = None
+
+    async def _timed(self, stage: str, awaitable, items: Optional[int] = None):
+        """Await a stage's work, counting ``items`` (or the result length) toward its throughput"""
+        start = time.perf_counter()
+        try:
+            result = await awaitable
+        except BaseException:
+            self.stats[stage].failed += 1
+            raise
+        self.stats[stage].record(len(result) if items is None else items, time.perf_counter() - start)
+        return result
+
+    async def run(self, document: Document, file_content: Union[bytes, Path]) -> Document:
+        """Ingest a document from its bytes or spooled upload file, updating status and chunks as stages complete"""
+        document.status = DocumentStatus.PROCESSING
+        self._document_id = document.id
+
+        pages = await self._timed("load", self.processor.load_content(file_content, document.file_type), items=1)
+        del file_content
+        original_length = sum(len(text) for _, text in pages) + 2 * max(0, len(pages) - 1)
+        cleaned_text, page_starts = await self._timed(
+            "clean", run_in_pool(PARSING, self.processor.clean_pages, pages), items=len(pages)
+        )
+        metadata = self.processor.build_metadata(document, original_length, cleaned_text)
+        del pages
+        chunks = await self._timed(
+            "split", run_in_pool(PARSING, self.processor.split_pages, cleaned_text, metadata, page_starts)
+        )
+
+        document.content = cleaned_text
+        document.chunks = chunks
+        document.metadata = metadata
+        document.status = DocumentStatus.PROCESSED
+        document.processed_at = datetime.utcnow()
+
+        if not chunks:
+            raise ValueError("No chunks to embed")
+        self.total = len(chunks)
+
+        if self.chunk_index is not None:
+            for chunk in chunks:
+                chunk.metadata["content_hash"] = chunk_content_hash(chunk.content)
+            resumed = chunks[:self.resume_from]
+            if resumed:
+                # Point chunks stored by the interrupted run at the vectors they ended up referencing
+                known = await asyncio.to_thread(
+                    self.chunk_index.find_vectors, list({chunk.metadata["content_hash"] for chunk in resumed})
+                )
+                for chunk in resumed:
+                    chunk.metadata["vector_id"] = known.get(chunk.metadata["content_hash"], chunk.id)
+
+        embed_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        upsert_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+
+        try:
+            async with asyncio.TaskGroup() as group:
+                group.create_task(self._produce(chunks, embed_queue))
+                group.create_task(self._embed(embed_queue, upsert_queue))
+                group.create_task(self._upsert(upsert_queue))
+        except BaseExceptionGroup as group_error:
+            # Surface the first stage failure rather than the group wrapper
+            raise group_error.exceptions[0]
+
+        document.status = DocumentStatus.EMBEDDED
+        return document
+
+    async def _produce(self, chunks: List[DocumentChunk], out: asyncio.Queue) -> None:
+        for i in range(min(self.resume_from, len(chunks)), len(chunks), self.batch_size):
+            await out.put(chunks[i:i + self.batch_size])
+        await out.put(None)
+
+    async def _deduplicate(self, batch: List[DocumentChunk]) -> Tuple[List[DocumentChunk], Dict[str, Dict[str, Any]]]:
+        """Link chunks whose text is already stored to the existing vector.
+
+        Returns the chunks still to embed, and new payloads for reused vectors
+        that still describe an earlier version of this document.
+        """
+        hashes = {chunk.metadata["content_hash"] for chunk in batch} - self._vectors.keys()
+        if hashes:
+            found = await asyncio.to_thread(self.chunk_index.find_vectors, list(hashes))
+            self._vectors.update(found)
+            if found:
+                self._stale_payloads.update(await asyncio.to_thread(
+                    self.chunk_index.owned_vectors, list(found.values()), self._document_id
+                ))
+
+        fresh = []
+        payloads: Dict[str, Dict[str, Any]] = {}
+        for chunk in batch:
+            content_hash = chunk.metadata["content_hash"]
+            vector_id = self._vectors.setdefault(content_hash, chunk.id)
+            chunk.metadata["vector_id"] = vector_id
+            if vector_id == chunk.id:
+                fresh.append(chunk)
+            elif vector_id in self._stale_payloads:
+                # The first chunk with this text in the new version describes the vector
+                self._stale_payloads.discard(vector_id)
+                payloads[vector_id] = dict(chunk.metadata)
+        self.deduplicated += len(batch) - len(fresh)
+        return fresh, payloads
+
+    async def _embed(self, source: asyncio.Queue, out: asyncio.Queue) -> None:
+        while (batch := await source.get()) is not None:
+            fresh, payloads = await self._deduplicate(batch) if self.chunk_index is not None else (batch, {})
+            if fresh:
+                embeddings = await self._timed(
+                    "embed", self.embedder.embed_texts([chunk.content for chunk in fresh]), items=len(fresh)
+                )
+                for chunk, embedding in zip(fresh, embeddings):
+                    chunk.embedding = embedding
+                self.embedded += len(fresh)
+            await out.put((batch, fresh, payloads))
+        await out.put(None)
+
+    async def _upsert(self, source: asyncio.Queue) -> None:
+        while (item := await source.get()) is not None:
+            batch, fresh, payloads = item
+            if fresh:
+                success = await self._timed(
+                    "upsert", self.vector_db.batch_upsert_vectors(fresh), items=len(fresh)
+                )
+                if not success:
+                    raise RuntimeError("Failed to store vectors")
+
+                # The vectors now live in the vector DB; don't keep a second copy
+                for chunk in fresh:
+                    chunk.embedding = None
+                if self.chunk_index is not None:
+                    entries: List[Tuple[str, str, str]] = [
+                        (chunk.metadata["content_hash"], chunk.id, self._document_id) for chunk in fresh
+                    ]
+                    await asyncio.to_thread(self.chunk_index.add_vectors, entries)
+            if payloads and not await self.vector_db.update_metadata(payloads):
+                raise RuntimeError("Failed to update reused vectors' metadata")
+            self.stored += len(batch)
+            if self.on_batch_stored is not None:
+                await self.on_batch_stored(self.stored, self.total)
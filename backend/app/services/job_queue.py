@@ -0,0 +1,309 @@
+"""
+Persistent ingestion job queue: SQLite-backed jobs worked by a fixed number of coroutines.
+"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+Checkpoint = Callable[[int, int], Awaitable[None]]
+
+
+class IngestJob:
+    """One document ingest, as stored in the job table"""
+
+    FIELDS = (
+        "document_id", "filename", "file_type", "file_path", "file_size", "content_hash",
+        "status", "attempts", "stored", "chunks_count", "error", "created_at", "updated_at"
+    )
+
+    def __init__(
+        self,
+        document_id: str,
+        filename: str,
+        file_type: str,
+        file_path: str,
+        file_size: Optional[int] = None,
+        content_hash: Optional[str] = None,
+        status: str = QUEUED,
+        attempts: int = 0,
+        stored: int = 0,
+        chunks_count: int = 0,
+        error: Optional[str] = None,
+        created_at: Optional[float] = None,
+        updated_at: Optional[float] = None
+    ):
+        self.document_id = document_id
+        self.filename = filename
+        self.file_type = file_type
+        self.file_path = file_path
+        self.file_size = file_size
+        self.content_hash = content_hash
+        self.status = status
+        self.attempts = attempts
+        self.stored = stored
+        self.chunks_count = chunks_count
+        self.error = error
+        self.created_at = created_at if created_at is not None else time.time()
+        self.updated_at = updated_at if updated_at is not None else self.created_at
+
+    def values(self) -> tuple:
+        return tuple(getattr(self, field) for field in self.FIELDS)
+
+
+class JobStore:
+    """SQLite table of ingestion jobs and their checkpoints"""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "document_id TEXT PRIMARY KEY, filename TEXT NOT NULL, file_type TEXT NOT NULL, "
+            "file_path TEXT NOT NULL, file_size INTEGER, content_hash TEXT, status TEXT NOT NULL, "
+            "attempts INTEGER NOT NULL, stored INTEGER NOT NULL, chunks_count INTEGER NOT NULL, "
+            "error TEXT, created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, created_at)")
+        self._conn.commit()
+
+    def add(self, job: IngestJob) -> None:
+        placeholders = ",".join("?" * len(IngestJob.FIELDS))
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO jobs ({','.join(IngestJob.FIELDS)}) VALUES ({placeholders})",
+                job.values()
+            )
+            self._conn.commit()
+
+    def get(self, document_id: str) -> Optional[IngestJob]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {','.join(IngestJob.FIELDS)} FROM jobs WHERE document_id = ?", (document_id,)
+            ).fetchone()
+        return IngestJob(*row) if row else None
+
+    def update(self, document_id: str, **fields: Any) -> None:
+        """Set job columns, stamping updated_at"""
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE jobs SET {assignments} WHERE document_id = ?", (*fields.values(), document_id)
+            )
+            self._conn.commit()
+
+    def pending(self) -> List[IngestJob]:
+        """Queued jobs and jobs that were running when the process stopped, oldest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {','.join(IngestJob.FIELDS)} FROM jobs WHERE status IN (?, ?) ORDER BY created_at",
+                (QUEUED, RUNNING)
+            ).fetchall()
+        return [IngestJob(*row) for row in rows]
+
+    def delete(self, document_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM jobs WHERE document_id = ?", (document_id,))
+            self._conn.commit()
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return dict(rows)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class IngestionQueue:
+    """Runs ingestion jobs on ``workers`` coroutines, persisting progress so jobs survive restarts.
+
+    The handler reports progress through a checkpoint callback after every
+    upserted batch. A job interrupted by a crash or shutdown stays ``running``
+    in the table, is requeued on the next start, and resumes after its last
+    stored batch. A job whose handler raises is requeued after
+    ``retry_delay * 2 ** (attempts - 1)`` seconds, also resuming after its
+    last stored batch. Every start counts as an attempt, whether it ended in
+    an error or a crash. A job is failed once ``max_attempts`` are used up,
+    and its spooled upload is only deleted when it is done or failed. A
+    document runs on at most one worker at a time.
+    """
+
+    def __init__(
+        self,
+        path: str = "data/ingest_jobs.sqlite3",
+        workers: int = 2,
+        max_attempts: int = 3,
+        retry_delay: float = 2.0
+    ):
+        self.path = path
+        self.workers = max(1, workers)
+        self.max_attempts = max(1, max_attempts)
+        self.retry_delay = max(0.0, retry_delay)
+        self.store: Optional[JobStore] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._retries: Set[asyncio.TimerHandle] = set()
+        # Document IDs a worker is running now
+        self._running: Set[str] = set()
+        self._handler: Optional[Callable[[IngestJob, Checkpoint], Awaitable[None]]] = None
+        self._on_failure: Optional[Callable[[IngestJob, str], Awaitable[None]]] = None
+        self.active = 0
+        self.completed = 0
+        self.failed = 0
+        self.resumed = 0
+        self.retried = 0
+
+    def configure(self, path: str, workers: int, max_attempts: int, retry_delay: float = 2.0) -> None:
+        """Set the job database, worker count and retry policy (takes effect on the next start)"""
+        self.path = path
+        self.workers = max(1, workers)
+        self.max_attempts = max(1, max_attempts)
+        self.retry_delay = max(0.0, retry_delay)
+
+    async def start(
+        self,
+        handler: Callable[[IngestJob, Checkpoint], Awaitable[None]],
+        on_failure: Optional[Callable[[IngestJob, str], Awaitable[None]]] = None
+    ) -> None:
+        """Open the job table, requeue unfinished jobs and start the workers.
+
+        ``on_failure`` is called for a job given up on without running the
+        handler (its attempts were used up before a restart), so the document
+        can be marked failed the way a failing handler marks it.
+        """
+        self.store = JobStore(self.path)
+        self._queue = asyncio.Queue()
+        self._handler = handler
+        self._on_failure = on_failure
+        for job in self.store.pending():
+            if job.status == RUNNING:
+                self.resumed += 1
+            self._queue.put_nowait(job.document_id)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def enqueue(self, job: IngestJob) -> None:
+        """Persist a job, then hand it to the workers"""
+        if self.store is None or self._queue is None:
+            raise RuntimeError("Ingestion queue is not running")
+        await asyncio.to_thread(self.store.add, job)
+        self._queue.put_nowait(job.document_id)
+
+    def get(self, document_id: str) -> Optional[IngestJob]:
+        """Get a job's persisted state"""
+        return self.store.get(document_id) if self.store is not None else None
+
+    async def remove(self, document_id: str) -> None:
+        """Forget a job, e.g. when its document is deleted"""
+        if self.store is not None:
+            await asyncio.to_thread(self.store.delete, document_id)
+
+    async def _worker(self) -> None:
+        while True:
+            document_id = await self._queue.get()
+            job = await asyncio.to_thread(self.store.get, document_id)
+            if job is None or job.status not in (QUEUED, RUNNING):
+                continue
+
+            if job.attempts >= self.max_attempts:
+                error = f"Gave up after {job.attempts} attempts"
+                await self._finish(job, FAILED, error)
+                if self._on_failure is not None:
+                    await self._on_failure(job, error)
+                continue
+
+            if document_id in self._running:
+                # Queued twice, e.g. by an update racing a retry; one run at a time
+                continue
+            self._running.add(document_id)
+            job.attempts += 1
+            await asyncio.to_thread(self.store.update, document_id, status=RUNNING, attempts=job.attempts)
+
+            async def checkpoint(stored: int, chunks_count: int) -> None:
+                await asyncio.to_thread(self.store.update, document_id, stored=stored, chunks_count=chunks_count)
+
+            self.active += 1
+            try:
+                await self._handler(job, checkpoint)
+            except asyncio.CancelledError:
+                # Shutting down: leave the job running so the next start resumes it
+                raise
+            except Exception as e:
+                if job.attempts >= self.max_attempts:
+                    await self._finish(job, FAILED, str(e))
+                else:
+                    await self._retry(job, str(e))
+            else:
+                await self._finish(job, DONE, None)
+            finally:
+                self.active -= 1
+                self._running.discard(document_id)
+
+    async def _retry(self, job: IngestJob, error: str) -> None:
+        """Requeue a failed attempt after an exponential backoff, keeping its spooled upload"""
+        await asyncio.to_thread(self.store.update, job.document_id, status=QUEUED, error=error)
+        self.retried += 1
+        delay = self.retry_delay * 2 ** (job.attempts - 1)
+        queue = self._queue
+
+        def requeue() -> None:
+            self._retries.discard(handle)
+            queue.put_nowait(job.document_id)
+
+        handle = asyncio.get_running_loop().call_later(delay, requeue)
+        self._retries.add(handle)
+
+    async def _finish(self, job: IngestJob, status: str, error: Optional[str]) -> None:
+        await asyncio.to_thread(self.store.update, job.document_id, status=status, error=error)
+        if status == DONE:
+            self.completed += 1
+        else:
+            self.failed += 1
+        # The spooled upload is only needed while the job can still run
+        Path(job.file_path).unlink(missing_ok=True)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Get worker, queue and outcome counters"""
+        return {
+            "workers": self.workers,
+            "running": bool(self._tasks),
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "active": self.active,
+            "completed": self.completed,
+            "failed": self.failed,
+            "resumed": self.resumed,
+            "retried": self.retried,
+            "jobs": self.store.counts() if self.store is not None else {}
+        }
+
+    async def stop(self) -> None:
+        """Stop the workers; jobs in progress or awaiting a retry resume on the next start"""
+        for handle in self._retries:
+            handle.cancel()
+        self._retries = set()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self.store is not None:
+            self.store.close()
+            self.store = None
+
+
+# Global ingestion queue, configured and started by the app lifespan
+ingestion_queue = IngestionQueue()
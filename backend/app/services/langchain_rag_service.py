@@ -10,9 +10,8 @@ from langchain.memory import ConversationBufferWindowMemory
 from langchain.schema import BaseMessage, HumanMessage, AIMessage
 from langchain_community.vectorstores import Pinecone as LangChainPinecone
 from langchain_community.vectorstores import Chroma as LangChainChroma
-from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+from langchain_openai import ChatOpenAI
 from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_huggingface import HuggingFaceEmbeddings
 from langchain.chains import ConversationalRetrievalChain
 from langchain.prompts import PromptTemplate
 from langchain.callbacks.base import BaseCallbackHandler
@@ -20,6 +19,9 @@ from langchain.callbacks.base import BaseCallbackHandler
 from pydantic import BaseModel
 
 from app.models.config import AppConfig, EmbedderType, VectorDBType, ChatModelType
+from app.core.embedders.langchain_adapter import LangChainEmbeddings
+from app.services.factory import service_factory
+from app.services.document_service import document_service
 from app.core.session.session_manager import SessionManager, ChatSession
 
 
@@ -120,30 +122,20 @@ class LangChainRAGService:
         embedder_config = self.config.embedder
         print(f"    Embedder type: {embedder_config.type}")
         
-        if embedder_config.type == EmbedderType.OPENAI:
-            if not embedder_config.openai:
-                raise ValueError("OpenAI embedder configuration required")
-            
-            self.embeddings = OpenAIEmbeddings(
-                openai_api_key=embedder_config.openai.api_key,
-                model=embedder_config.openai.model,
-                dimensions=embedder_config.openai.dimensions if embedder_config.openai.dimensions else None
-            )
-            
-        elif embedder_config.type == EmbedderType.HUGGINGFACE:
-            if not embedder_config.huggingface:
-                raise ValueError("HuggingFace embedder configuration required")
-            
-            model_kwargs = embedder_config.huggingface.model_kwargs or {}
-            encode_kwargs = embedder_config.huggingface.encode_kwargs or {}
-            
-            self.embeddings = HuggingFaceEmbeddings(
-                model_name=embedder_config.huggingface.model_name,
-                model_kwargs=model_kwargs,
-                encode_kwargs=encode_kwargs
-            )
-        else:
+        if embedder_config.type not in (EmbedderType.OPENAI, EmbedderType.HUGGINGFACE, EmbedderType.REMOTE):
             raise ValueError(f"Unsupported embedder type: {embedder_config.type}")
+        
+        # Reuse DocumentService's embedder so its model, cache and connections are
+        # shared; if it has none yet, build one and hand it over so it is closed
+        # with the rest at shutdown or when the configuration changes
+        embedder = document_service.embedder
+        if embedder is None:
+            embedder = service_factory.create_embedder(self.config)
+            if not embedder:
+                raise ValueError(f"Failed to create {embedder_config.type} embedder")
+            document_service.set_embedder(embedder)
+        
+        self.embeddings = LangChainEmbeddings(embedder, loop=asyncio.get_running_loop())
     
     async def _initialize_vectorstore(self):
         """Initialize vectorstore based on configuration"""
@@ -0,0 +1,75 @@
+"""
+Streams uploads to a spool directory, enforcing the size limit and hashing as it goes.
+"""
+
+import asyncio
+import hashlib
+import os
+import uuid
+from pathlib import Path
+from typing import BinaryIO
+
+from fastapi import UploadFile
+
+
+class UploadTooLarge(ValueError):
+    """Raised as soon as an upload passes the size limit"""
+
+    def __init__(self, max_size: int):
+        super().__init__(f"File too large. Maximum size is {max_size} bytes")
+        self.max_size = max_size
+
+
+class SpooledUpload:
+    """An upload written to the spool directory"""
+
+    def __init__(self, path: Path, size: int, sha256: str):
+        self.path = path
+        self.size = size
+        self.sha256 = sha256
+
+    def discard(self) -> None:
+        """Delete the spooled file"""
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _write_chunk(out: BinaryIO, digest, chunk: bytes) -> None:
+    digest.update(chunk)
+    out.write(chunk)
+
+
+async def spool_upload(
+    file: UploadFile,
+    directory: str,
+    max_size: int,
+    chunk_size: int = 1024 * 1024
+) -> SpooledUpload:
+    """Copy an upload to ``directory`` in chunks, hashing it and stopping once it passes ``max_size``"""
+    # Starlette records the part size while parsing; reject without copying anything
+    declared = getattr(file, "size", None)
+    if declared is not None and declared > max_size:
+        raise UploadTooLarge(max_size)
+
+    spool_dir = Path(directory)
+    spool_dir.mkdir(parents=True, exist_ok=True)
+    suffix = Path(file.filename or "").suffix.lower()
+    path = spool_dir / f"{uuid.uuid4().hex}{suffix}"
+
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(path, "wb") as out:
+            while chunk := await file.read(chunk_size):
+                size += len(chunk)
+                if size > max_size:
+                    raise UploadTooLarge(max_size)
+                await asyncio.to_thread(_write_chunk, out, digest, chunk)
+    except BaseException:
+        if path.exists():
+            os.unlink(path)
+        raise
+
+    return SpooledUpload(path, size, digest.hexdigest())
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark: chunk offset tracking on a multi-megabyte text.
+
+Generates a text of repeated boilerplate paragraphs (the case where
+``text.find(chunk)`` returns the wrong occurrence) mixed with unique ones,
+then compares the previous approach, splitting into strings and locating each
+chunk with ``text.find``, against OffsetTextSplitter.split_spans, which
+reports offsets while splitting. Reports time, chunks per second and how many
+offsets each approach gets wrong.
+
+Usage:
+    python benchmarks/bench_chunk_offsets.py [--megabytes N] [--chunk-size C] [--chunk-overlap O]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add the backend directory to the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.document_processor.text_splitter import OffsetTextSplitter
+
+
+BOILERPLATE = (
+    "This document is confidential and intended solely for the addressee. "
+    "If you have received it in error please notify the sender immediately.\n"
+)
+
+
+def generate_text(megabytes: int) -> str:
+    rng = random.Random(0)
+    words = ["revenue", "customer", "pipeline", "quarter", "forecast", "margin", "region", "contract"]
+    parts, size = [], 0
+    while size < megabytes * 1024 * 1024:
+        if rng.random() < 0.3:
+            paragraph = BOILERPLATE
+        else:
+            sentences = [" ".join(rng.choice(words) for _ in range(rng.randint(8, 20))) + "."
+                         for _ in range(rng.randint(2, 8))]
+            paragraph = " ".join(sentences) + f" Ref {size}.\n"
+        parts.append(paragraph + "\n")
+        size += len(paragraph) + 1
+    return "".join(parts)
+
+
+def find_offsets(splitter: OffsetTextSplitter, text: str) -> list:
+    """The previous split_text behaviour: split to strings, then search for each chunk"""
+    return [text.find(chunk) if chunk in text else -1 for chunk in splitter.split_text(text)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--megabytes", type=int, default=8)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--chunk-overlap", type=int, default=200)
+    args = parser.parse_args()
+
+    print("✂️  Chunk offset benchmark")
+    print("=========================")
+    text = generate_text(args.megabytes)
+    splitter = OffsetTextSplitter(args.chunk_size, args.chunk_overlap)
+    print(f"  {len(text) / 2**20:.1f}MB of text, chunk size {args.chunk_size}, overlap {args.chunk_overlap}")
+
+    start = time.perf_counter()
+    spans = splitter.split_spans(text)
+    span_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    found = find_offsets(splitter, text)
+    find_time = time.perf_counter() - start
+
+    wrong_spans = sum(1 for s, e in spans if text[s:e] != text[s:e].strip() or e - s > args.chunk_size)
+    wrong_found = sum(1 for (s, _), f in zip(spans, found) if s != f)
+
+    print(f"  text.find offsets {find_time:8.2f}s {len(found) / find_time:10.0f} chunks/s, "
+          f"{wrong_found} wrong offsets")
+    print(f"  split_spans       {span_time:8.2f}s {len(spans) / span_time:10.0f} chunks/s, "
+          f"{wrong_spans} malformed spans")
+    print(f"  Speedup:          {find_time / span_time:8.1f}x over {len(spans)} chunks")
+
+
+if __name__ == "__main__":
+    main()
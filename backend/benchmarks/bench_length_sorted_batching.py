@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark: length-sorted batching in HuggingFaceEmbedder.embed_texts.
+
+Embeds a mixed-length corpus (short headings through full-size chunks, like
+LangChainDocumentProcessor output) three ways and reports texts/second:
+
+- one model.encode call over the whole corpus, as embed_texts did before
+  batches were submitted one at a time (the baseline; sentence-transformers
+  sorts by length inside that call),
+- embed_texts with length_sorted_batching off (batches in input order),
+- embed_texts with length_sorted_batching on.
+
+Length-sorted batching is expected to roughly match the single call: its job
+is to keep per-batch submission, which lets queries jump ahead of a large
+ingest, from padding every batch to its longest text.
+
+Usage:
+    python benchmarks/bench_length_sorted_batching.py [--model NAME] [--texts N]
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add the backend directory to the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.models.config import HuggingFaceEmbedderConfig
+from app.core.embedders.huggingface_embedder import HuggingFaceEmbedder
+
+
+WORDS = (
+    "the quarterly report covers revenue growth customer retention regional "
+    "expansion product roadmap hiring plans infrastructure costs security "
+    "compliance onboarding documentation policy handbook section overview"
+).split()
+
+
+def make_corpus(n: int, seed: int = 42) -> list:
+    """Mixed-length chunks: mostly full chunks with many short fragments"""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(n):
+        kind = rng.random()
+        if kind < 0.3:
+            length = rng.randint(3, 12)      # headings, table cells
+        elif kind < 0.6:
+            length = rng.randint(30, 80)     # partial chunks at section ends
+        else:
+            length = rng.randint(150, 220)   # full ~1000 character chunks
+        corpus.append(" ".join(rng.choice(WORDS) for _ in range(length)))
+    rng.shuffle(corpus)
+    return corpus
+
+
+async def best_rate(embed, corpus: list, repeats: int) -> float:
+    await embed(corpus[:64])  # warm-up
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        await embed(corpus)
+        best = min(best, time.perf_counter() - start)
+    return len(corpus) / best
+
+
+async def run(embedder: HuggingFaceEmbedder, corpus: list, sorted_batches: bool, repeats: int) -> float:
+    embedder.config.length_sorted_batching = sorted_batches
+    return await best_rate(embedder.embed_texts, corpus, repeats)
+
+
+async def run_single_encode(embedder: HuggingFaceEmbedder, corpus: list, repeats: int) -> float:
+    async def encode(texts):
+        return await asyncio.to_thread(
+            embedder.model.encode, texts,
+            batch_size=embedder.batch_size, convert_to_numpy=True, show_progress_bar=False
+        )
+    return await best_rate(encode, corpus, repeats)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="sentence-transformers/all-MiniLM-L6-v2")
+    parser.add_argument("--texts", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    print("📏 Length-sorted batching benchmark")
+    print("===================================")
+    embedder = HuggingFaceEmbedder(HuggingFaceEmbedderConfig(
+        model_name=args.model,
+        batch_size=args.batch_size,
+        show_progress_bar=False,
+        encode_kwargs={"show_progress_bar": False}
+    ))
+    corpus = make_corpus(args.texts)
+    lengths = sorted(len(text) for text in corpus)
+    print(f"  Model: {args.model}, batch size {args.batch_size}")
+    print(f"  Corpus: {len(corpus)} texts, chars min/median/max = "
+          f"{lengths[0]}/{lengths[len(lengths) // 2]}/{lengths[-1]}")
+
+    baseline = await run_single_encode(embedder, corpus, repeats=args.repeats)
+    print(f"  Single encode call:       {baseline:8.1f} texts/s  (baseline)")
+    unsorted = await run(embedder, corpus, sorted_batches=False, repeats=args.repeats)
+    print(f"  Batches in input order:   {unsorted:8.1f} texts/s  ({unsorted / baseline:.2f}x)")
+    bucketed = await run(embedder, corpus, sorted_batches=True, repeats=args.repeats)
+    print(f"  Length-sorted batches:    {bucketed:8.1f} texts/s  ({bucketed / baseline:.2f}x)")
+    embedder.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark: torch vs ONNX Runtime (fp32 and dynamic int8) embedding backends.
+
+Reports the parity of each ONNX variant against the torch output (min/mean
+cosine similarity over the corpus) and texts/second on CPU.
+
+Usage:
+    python benchmarks/bench_onnx_backend.py [--model NAME] [--texts N] [--cache-dir DIR]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add the backend directory to the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.models.config import HuggingFaceEmbedderConfig
+from app.core.embedders.huggingface_embedder import HuggingFaceEmbedder
+from bench_length_sorted_batching import make_corpus
+
+
+async def throughput(embedder: HuggingFaceEmbedder, corpus: list, repeats: int) -> float:
+    await embedder.embed_texts(corpus[:64])  # warm-up
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        await embedder.embed_texts(corpus)
+        best = min(best, time.perf_counter() - start)
+    return len(corpus) / best
+
+
+def make_embedder(args, **overrides) -> HuggingFaceEmbedder:
+    return HuggingFaceEmbedder(HuggingFaceEmbedderConfig(
+        model_name=args.model,
+        batch_size=args.batch_size,
+        normalize_embeddings=True,
+        onnx_cache_dir=args.cache_dir,
+        onnx_parity_threshold=0.0,  # report parity here instead of falling back
+        encode_kwargs={"show_progress_bar": False},
+        **overrides
+    ))
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="sentence-transformers/all-MiniLM-L6-v2")
+    parser.add_argument("--texts", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--cache-dir", default="onnx_cache")
+    args = parser.parse_args()
+
+    print("⚡ ONNX backend benchmark")
+    print("========================")
+    corpus = make_corpus(args.texts)
+
+    torch_embedder = make_embedder(args)
+    reference = np.asarray(await torch_embedder.embed_texts(corpus), dtype=np.float32)
+    baseline = await throughput(torch_embedder, corpus, args.repeats)
+    print(f"  torch:       {baseline:8.1f} texts/s")
+
+    for label, quantize in (("onnx fp32", False), ("onnx int8", True)):
+        embedder = make_embedder(args, backend="onnx", onnx_quantize=quantize)
+        if embedder._onnx is None:
+            print(f"  {label}:   unavailable")
+            continue
+        candidate = np.asarray(await embedder.embed_texts(corpus), dtype=np.float32)
+        cosines = np.sum(reference * candidate, axis=1)
+        rate = await throughput(embedder, corpus, args.repeats)
+        print(f"  {label}:   {rate:8.1f} texts/s ({rate / baseline:.2f}x), "
+              f"cosine vs torch min {cosines.min():.4f} / mean {cosines.mean():.4f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark: text cleaning on large spreadsheet and HTML extracts.
+
+Generates text shaped like UnstructuredExcelLoader output (tab-separated rows
+with many empty cells) and UnstructuredHTMLLoader output (indented fragments
+separated by runs of blank lines), then times the previous line-by-line
+cleaning loop against the single-pass clean_text and checks both agree.
+
+Usage:
+    python benchmarks/bench_text_cleaning.py [--megabytes N] [--repeats R]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add the backend directory to the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.document_processor.text_cleaner import clean_text
+
+
+def previous_clean_text(text: str) -> str:
+    lines = text.split('\n')
+    cleaned_lines = []
+    for line in lines:
+        line = ' '.join(line.split())
+        if len(line.strip()) < 3:
+            continue
+        cleaned_lines.append(line)
+    cleaned_text = '\n'.join(cleaned_lines)
+    while '\n\n\n' in cleaned_text:
+        cleaned_text = cleaned_text.replace('\n\n\n', '\n\n')
+    return cleaned_text.strip()
+
+
+def spreadsheet_extract(megabytes: int) -> str:
+    rng = random.Random(0)
+    rows, size = [], 0
+    while size < megabytes * 1024 * 1024:
+        cells = [rng.choice(["", "", str(rng.randint(0, 99999)), "North", "Q3 total", "n/a"]) for _ in range(12)]
+        row = "\t".join(cells) + ("\t" * rng.randint(0, 6))
+        rows.append(row)
+        size += len(row) + 1
+    return "\n".join(rows)
+
+
+def html_extract(megabytes: int) -> str:
+    rng = random.Random(1)
+    parts, size = [], 0
+    while size < megabytes * 1024 * 1024:
+        indent = " " * rng.randint(0, 24)
+        fragment = rng.choice(["Home", "|", "Products and services", "©", "Read more about our pricing plans.",
+                               "Contact", "•", "The quarterly report shows   strong growth   across regions."])
+        part = indent + fragment + "\n" * rng.randint(1, 6)
+        parts.append(part)
+        size += len(part)
+    return "".join(parts)
+
+
+def best_of(fn, text: str, repeats: int):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn(text)
+        timings.append(time.perf_counter() - start)
+    return result, min(timings)
+
+
+def measure(label: str, text: str, repeats: int) -> None:
+    expected, previous = best_of(previous_clean_text, text, repeats)
+    cleaned, current = best_of(clean_text, text, repeats)
+
+    assert cleaned == expected, f"{label}: output differs from the previous cleaner"
+    mb = len(text) / 2**20
+    print(f"  {label:<12} {mb:6.1f}MB  previous {previous:6.2f}s ({mb / previous:6.1f} MB/s)  "
+          f"current {current:6.2f}s ({mb / current:6.1f} MB/s)  {previous / current:5.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--megabytes", type=int, default=20)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    print("🧽 Text cleaning benchmark")
+    print("==========================")
+    measure("spreadsheet", spreadsheet_extract(args.megabytes), args.repeats)
+    measure("html", html_extract(args.megabytes), args.repeats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Test script for deterministic chunk IDs.
+Splits and ingests the same upload twice and checks the second run overwrites
+the first run's vectors instead of adding new ones.
+"""
+
+import asyncio
+import sys
+import traceback
+import uuid
+from pathlib import Path
+
+import numpy as np
+
+# Add the backend directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.models.document import Document, DocumentType
+from app.core.document_processor.langchain_processor import LangChainDocumentProcessor
+from app.core.embedders.base import BaseEmbedder
+from app.services.ingestion_pipeline import IngestionPipeline
+
+
+class ConstantEmbedder(BaseEmbedder):
+    async def embed_text(self, text):
+        return (await self.embed_texts([text]))[0]
+
+    async def embed_texts(self, texts):
+        return np.ones((len(texts), 4), dtype=np.float32)
+
+    def get_dimension(self):
+        return 4
+
+    def get_model_info(self):
+        return {"provider": "stand-in", "model_name": "stand-in"}
+
+
+class RecordingVectorDB:
+    """Keyed by ID, like an upsert into Chroma, Qdrant or Pinecone"""
+
+    def __init__(self):
+        self.vectors = {}
+        self.upserts = 0
+
+    async def batch_upsert_vectors(self, chunks):
+        for chunk in chunks:
+            self.vectors[chunk.id] = chunk.content
+        self.upserts += len(chunks)
+        return True
+
+
+def make_document(content_hash: str = "a" * 64, document_id: str = "doc-1") -> Document:
+    return Document(id=document_id, filename="notes.txt", file_type=DocumentType.TXT, content_hash=content_hash)
+
+
+async def test_chunk_ids():
+    """Test IDs are stable per document version and unique across versions and documents"""
+    print("🔑 Testing deterministic chunk IDs...")
+
+    try:
+        processor = LangChainDocumentProcessor(chunk_size=200, chunk_overlap=40)
+        text = "\n\n".join(f"Paragraph {i}. " + "Lorem ipsum dolor sit amet. " * (i % 7 + 1) for i in range(60))
+        metadata = processor.build_metadata(make_document(), len(text), text)
+
+        first = processor.split_text(text, metadata)
+        second = processor.split_text(text, dict(metadata))
+        assert len(first) > 20
+        assert [chunk.id for chunk in first] == [chunk.id for chunk in second]
+        assert len({chunk.id for chunk in first}) == len(first), "chunk IDs must be unique within a document"
+        assert all(uuid.UUID(chunk.id).version == 5 for chunk in first)
+        print(f"  ✅ Re-splitting gives the same {len(first)} UUIDv5 chunk IDs")
+
+        revised = processor.split_text(text, processor.build_metadata(make_document("b" * 64), len(text), text))
+        other = processor.split_text(text, processor.build_metadata(make_document(document_id="doc-2"), len(text), text))
+        ids = {chunk.id for chunk in first}
+        assert ids.isdisjoint(chunk.id for chunk in revised), "a new version must not overwrite shared vectors"
+        assert [chunk.id for chunk in other] == [chunk.id for chunk in first], "IDs depend on content, not document ID"
+        assert [c.id for c in processor.split_text(text)] == [c.id for c in processor.split_text(text)]
+        print("  ✅ IDs differ across document versions, match for identical content, and are stable without metadata")
+
+        vector_db = RecordingVectorDB()
+        for attempt in range(2):
+            pipeline = IngestionPipeline(processor, ConstantEmbedder(), vector_db, batch_size=8)
+            document = await pipeline.run(make_document(), text.encode("utf-8"))
+        assert vector_db.upserts == 2 * len(document.chunks)
+        assert len(vector_db.vectors) == len(document.chunks), "a retried ingest should overwrite its vectors"
+        print(f"  ✅ Ingesting twice upserted {vector_db.upserts} times into {len(vector_db.vectors)} vectors")
+
+        print("  🎉 Chunk ID test completed successfully!")
+        return True
+
+    except Exception as e:
+        print(f"  ❌ Chunk ID test failed: {e}")
+        traceback.print_exc()
+        return False
+
+
+async def main():
+    """Main test function"""
+    print("🔧 Deterministic Chunk ID Test")
+    print("==============================")
+
+    success = await test_chunk_ids()
+
+    print("\n📊 Test Results:")
+    print("================")
+    if success:
+        print("✅ Chunk IDs are deterministic!")
+    else:
+        print("❌ Chunk IDs have issues.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
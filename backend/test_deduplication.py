@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Test script for content-hash deduplication.
+Ingests documents that share chunks through IngestionPipeline with a registry
+as the chunk index and checks shared chunks are embedded and stored once, then
+checks through DocumentService who a shared vector cites before and after a delete.
+"""
+
+import asyncio
+import sys
+import tempfile
+import traceback
+from pathlib import Path
+
+import numpy as np
+
+# Add the backend directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.models.document import Document, DocumentChunk, DocumentStatus, DocumentType
+from app.models.search import SearchRequest, SearchResult
+from app.core.document_processor.base import BaseDocumentProcessor
+from app.core.embedders.base import BaseEmbedder
+from app.services.document_registry import DocumentRegistry
+from app.services.ingestion_pipeline import IngestionPipeline, chunk_content_hash
+
+
+class LineProcessor(BaseDocumentProcessor):
+    """One chunk per line, with IDs unique to the document"""
+
+    async def load_document(self, file_path, file_type):
+        return file_path.read_text()
+
+    def clean_text(self, text):
+        return text
+
+    def split_text(self, text, metadata=None):
+        return [
+            DocumentChunk(id=f"{metadata['filename']}-{i}", content=line, metadata={**metadata, "chunk_index": i})
+            for i, line in enumerate(text.split("\n"))
+        ]
+
+
+class CountingEmbedder(BaseEmbedder):
+    def __init__(self):
+        self.texts = []
+
+    async def embed_text(self, text):
+        return (await self.embed_texts([text]))[0]
+
+    async def embed_texts(self, texts):
+        self.texts.extend(texts)
+        return np.ones((len(texts), 4), dtype=np.float32)
+
+    def get_dimension(self):
+        return 4
+
+    def get_model_info(self):
+        return {"provider": "stand-in", "model_name": "stand-in"}
+
+
+class RecordingVectorDB:
+    def __init__(self):
+        self.vectors = {}
+
+    async def batch_upsert_vectors(self, chunks):
+        for chunk in chunks:
+            self.vectors[chunk.id] = chunk.content
+        return True
+
+
+class TextEmbedder(CountingEmbedder):
+    """Identical texts get identical vectors, so a search can find them again"""
+
+    async def embed_texts(self, texts):
+        self.texts.extend(texts)
+        return np.array([[len(text), sum(map(ord, text))] for text in texts], dtype=np.float32)
+
+
+class PayloadVectorDB(RecordingVectorDB):
+    """Keeps payloads and cites ``filename`` as the document, like the real clients"""
+
+    def __init__(self):
+        super().__init__()
+        self.payloads = {}
+
+    async def batch_upsert_vectors(self, chunks):
+        for chunk in chunks:
+            self.vectors[chunk.id] = chunk.embedding
+            self.payloads[chunk.id] = dict(chunk.metadata)
+        return True
+
+    async def update_metadata(self, updates):
+        for vector_id, metadata in updates.items():
+            self.payloads[vector_id].update(metadata)
+        return True
+
+    async def delete_vectors(self, chunk_ids):
+        for chunk_id in chunk_ids:
+            del self.vectors[chunk_id], self.payloads[chunk_id]
+        return True
+
+    async def search_vectors(self, query_vector, top_k=5, threshold=0.0, filter_metadata=None):
+        return [
+            SearchResult(
+                chunk_id=vector_id,
+                document_id=self.payloads[vector_id].get("filename", "unknown"),
+                content="",
+                score=1.0,
+                metadata=dict(self.payloads[vector_id])
+            )
+            for vector_id, vector in self.vectors.items() if np.array_equal(vector, query_vector)
+        ][:top_k]
+
+
+async def ingest(registry, embedder, vector_db, tmp: Path, name: str, lines) -> Document:
+    path = tmp / name
+    path.write_text("\n".join(lines))
+    document = Document(id=name, filename=name, file_type=DocumentType.TXT)
+    pipeline = IngestionPipeline(LineProcessor(), embedder, vector_db, batch_size=4, chunk_index=registry)
+    await pipeline.run(document, path)
+    registry.save(document)
+    return document
+
+
+async def test_deduplication():
+    """Test chunk hashing, shared vectors across documents, and reference-aware deletes"""
+    print("🧬 Testing content-hash deduplication...")
+
+    try:
+        assert chunk_content_hash("Shared  footer\n text") == chunk_content_hash("Shared footer text")
+        assert chunk_content_hash("ﬁle") == chunk_content_hash("file"), "NFKC should fold ligatures"
+        assert chunk_content_hash("Shared footer") != chunk_content_hash("shared footer")
+        print("  ✅ Chunk hashes ignore whitespace and Unicode compatibility differences, not case")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            registry = DocumentRegistry(str(tmp / "documents.sqlite3"))
+            embedder, vector_db = CountingEmbedder(), RecordingVectorDB()
+            footer = "Confidential - do not distribute"
+
+            first = await ingest(
+                registry, embedder, vector_db, tmp, "a.txt",
+                [f"alpha {i}" if i % 3 else footer for i in range(12)]
+            )
+            assert first.status == DocumentStatus.EMBEDDED
+            assert embedder.texts.count(footer) == 1, "a chunk repeated within a document should embed once"
+            assert len(vector_db.vectors) == 9
+            assert {chunk.metadata["vector_id"] for chunk in first.chunks if chunk.content == footer} == {"a.txt-0"}
+            print("  ✅ Repeated chunks within a document are embedded and stored once")
+
+            embedder.texts.clear()
+            second = await ingest(
+                registry, embedder, vector_db, tmp, "b.txt",
+                [f"alpha {i}" for i in (1, 2, 4, 5)] + [footer, "beta"]
+            )
+            assert embedder.texts == ["beta"], f"only the new chunk should be embedded, got {embedder.texts}"
+            assert len(vector_db.vectors) == 10
+            assert second.chunks[0].metadata["vector_id"] == "a.txt-1"
+            print("  ✅ Chunks already stored by another document reference its vectors")
+
+            shared = registry.unreferenced(registry.vector_ids("a.txt"), "a.txt")
+            assert sorted(shared) == sorted(f"a.txt-{i}" for i in (7, 8, 10, 11))
+            assert registry.unreferenced(registry.vector_ids("b.txt"), "b.txt") == ["b.txt-5"]
+            registry.forget_vectors(shared)
+            registry.delete("a.txt")
+            assert registry.find_vectors([chunk_content_hash(footer)]) == {chunk_content_hash(footer): "a.txt-0"}
+            assert registry.find_vectors([chunk_content_hash("alpha 8")]) == {}
+            print("  ✅ Deleting a document only releases vectors no other document references")
+
+            registry.save(Document(
+                id="c.txt", filename="c.txt", file_type=DocumentType.TXT, content_hash="f" * 64,
+                status=DocumentStatus.ERROR
+            ))
+            assert registry.find_by_hash("f" * 64) is None, "failed uploads should not be reused"
+            registry.save(Document(
+                id="d.txt", filename="d.txt", file_type=DocumentType.TXT, content_hash="f" * 64
+            ))
+            assert registry.find_by_hash("f" * 64).id == "d.txt"
+            registry.close()
+            print("  ✅ Identical uploads find the existing document by file hash")
+
+        print("  🎉 Deduplication test completed successfully!")
+        return True
+
+    except Exception as e:
+        print(f"  ❌ Deduplication test failed: {e}")
+        traceback.print_exc()
+        return False
+
+
+async def test_shared_vector_attribution():
+    """Test search attribution of shared vectors before and after deleting the first uploader"""
+    print("🏷️  Testing shared vector attribution...")
+
+    try:
+        from app.services.document_service import DocumentService
+
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            service = DocumentService()
+            service.document_processor = LineProcessor()
+            service.embedder, service.vector_db = TextEmbedder(), PayloadVectorDB()
+            service.open_registry(str(tmp / "documents.sqlite3"))
+            footer = "Confidential - do not distribute"
+
+            ids = {}
+            for name, lines in (("a.txt", ["alpha", footer]), ("b.txt", ["beta", "gamma", footer])):
+                document = await service.create_document(name, DocumentType.TXT, content_hash=name * 8)
+                (tmp / name).write_text("\n".join(lines))
+                await service.process_and_embed_document(document.id, tmp / name)
+                ids[name] = document.id
+
+            response = await service.search_documents(SearchRequest(query=footer))
+            [result] = response.results
+            assert result.document_id == "a.txt"
+            assert [doc["filename"] for doc in result.metadata["documents"]] == ["a.txt", "b.txt"]
+            print("  ✅ A shared chunk is attributed to every document containing it")
+
+            assert await service.delete_document(ids["a.txt"])
+            response = await service.search_documents(SearchRequest(query=footer))
+            [result] = response.results
+            assert result.document_id == "b.txt", f"deleted document still cited: {result.document_id}"
+            assert result.metadata["document_id"] == ids["b.txt"] and result.metadata["chunk_index"] == 2
+            assert [doc["filename"] for doc in result.metadata["documents"]] == ["b.txt"]
+            assert not (await service.search_documents(SearchRequest(query="alpha"))).results
+            print("  ✅ After deleting the first uploader, the shared vector cites the remaining document")
+            service.close_registry()
+
+        print("  🎉 Shared vector attribution test completed successfully!")
+        return True
+
+    except Exception as e:
+        print(f"  ❌ Shared vector attribution test failed: {e}")
+        traceback.print_exc()
+        return False
+
+
+async def main():
+    """Main test function"""
+    print("🔧 Deduplication Test")
+    print("=====================")
+
+    success = await test_deduplication()
+    success = await test_shared_vector_attribution() and success
+
+    print("\n📊 Test Results:")
+    print("================")
+    if success:
+        print("✅ Deduplication is working correctly!")
+    else:
+        print("❌ Deduplication has issues.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test script for the persistent document registry.
+Saves documents with chunks to a temporary SQLite file and checks what is kept.
+"""
+
+import sys
+import tempfile
+import traceback
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+# Add the backend directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.models.document import Document, DocumentChunk, DocumentStatus, DocumentType
+from app.services.document_registry import DocumentRegistry
+
+
+def make_document(i: int, chunks: int) -> Document:
+    return Document(
+        id=f"doc-{i}",
+        filename=f"report-{i}.pdf",
+        file_type=DocumentType.PDF,
+        file_size=1000 + i,
+        content_hash=f"{i:064x}",
+        content="full cleaned text " * 1000,
+        status=DocumentStatus.EMBEDDED,
+        metadata={"filename": f"report-{i}.pdf", "cleaned_length": 17000},
+        created_at=datetime(2024, 1, 1) + timedelta(minutes=i),
+        chunks=[
+            DocumentChunk(
+                id=f"doc-{i}-chunk-{j}",
+                content="chunk text",
+                metadata={"chunk_index": j, "chunk_start": j * 800, "chunk_end": j * 800 + 1000, "page": j // 3 + 1},
+                embedding=np.ones(384, dtype=np.float32)
+            )
+            for j in range(chunks)
+        ]
+    )
+
+
+def test_document_registry():
+    """Test records, chunk references, paging, deletes and persistence"""
+    print("🗂️  Testing document registry...")
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "documents.sqlite3")
+            registry = DocumentRegistry(path)
+            for i in range(25):
+                registry.save(make_document(i, chunks=10))
+
+            document = registry.get("doc-3")
+            assert document.status == DocumentStatus.EMBEDDED and document.chunks_count == 10
+            assert document.content is None and document.chunks == [], "content and chunks should not be stored"
+            assert document.content_hash == f"{3:064x}" and document.metadata["cleaned_length"] == 17000
+            refs = registry.chunk_refs("doc-3")
+            assert [ref["id"] for ref in refs] == [f"doc-3-chunk-{j}" for j in range(10)]
+            assert refs[4]["chunk_start"] == 3200 and refs[4]["chunk_end"] == 4200 and refs[4]["page"] == 2
+            print("  ✅ Records keep status, hashes and chunk IDs/offsets, but not content or vectors")
+
+            pages = [registry.list(offset, 10) for offset in (0, 10, 20)]
+            assert [len(page) for page in pages] == [10, 10, 5] and registry.count() == 25
+            assert [doc.id for page in pages for doc in page] == [f"doc-{i}" for i in range(25)]
+            print("  ✅ Listing pages through the store in creation order")
+
+            registry.update_status("doc-4", DocumentStatus.ERROR, "embedder offline")
+            registry.delete("doc-5")
+            assert registry.get("doc-5") is None and registry.chunk_ids("doc-5") == []
+            registry.close()
+
+            registry = DocumentRegistry(path)
+            assert registry.count() == 24
+            assert registry.get("doc-4").status == DocumentStatus.ERROR
+            assert registry.get("doc-4").error_message == "embedder offline"
+            assert len(registry.chunk_ids("doc-6")) == 10
+            registry.close()
+            print("  ✅ Status updates and deletes (with chunk references) persist across reopen")
+
+        print("  🎉 Document registry test completed successfully!")
+        return True
+
+    except Exception as e:
+        print(f"  ❌ Document registry test failed: {e}")
+        traceback.print_exc()
+        return False
+
+
+def main():
+    """Main test function"""
+    print("🔧 Document Registry Test")
+    print("=========================")
+
+    success = test_document_registry()
+
+    print("\n📊 Test Results:")
+    print("================")
+    if success:
+        print("✅ Document registry is working correctly!")
+    else:
+        print("❌ Document registry has issues.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test script for the multi-process embedding pool.
+Encodes through a 2-worker EmbeddingProcessPool, directly and via
+HuggingFaceEmbedder, and checks order and parity with in-process encoding.
+Downloads sentence-transformers/all-MiniLM-L6-v2 on first run.
+"""
+
+import asyncio
+import sys
+import traceback
+from pathlib import Path
+
+import numpy as np
+
+# Add the backend directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.models.config import HuggingFaceEmbedderConfig
+from app.core.embedders.huggingface_embedder import HuggingFaceEmbedder
+from app.core.embedders.process_pool import EmbeddingProcessPool
+
+MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+def make_texts(count: int):
+    """Texts of very different lengths, so length bucketing reorders them"""
+    return [f"Document {i}: " + "the quarterly report covers revenue and churn. " * (i % 9 + 1) for i in range(count)]
+
+
+async def test_process_pool():
+    """Test sharded encoding matches in-process encoding, in input order"""
+    print("🧮 Testing embedding process pool...")
+
+    try:
+        from sentence_transformers import SentenceTransformer
+
+        texts = make_texts(48)
+        reference = SentenceTransformer(MODEL_NAME, device="cpu").encode(texts, convert_to_numpy=True)
+
+        print("  Encoding 6 shards concurrently on 2 workers...")
+        pool = EmbeddingProcessPool(MODEL_NAME, {"device": "cpu"}, workers=2, torch_threads=1)
+        try:
+            shards = [texts[i:i + 8] for i in range(0, len(texts), 8)]
+            results = await asyncio.gather(*[pool.encode(shard, {"convert_to_numpy": True}) for shard in shards])
+            assert len(getattr(pool._executor, "_processes", {})) == 2, "expected 2 worker processes"
+            assert pool.stats()["batches"] == len(shards)
+        finally:
+            pool.shutdown()
+        sharded = np.concatenate(results)
+        assert sharded.dtype == np.float32 and sharded.shape == reference.shape
+        assert np.allclose(sharded, reference, atol=1e-5), "pool output differs from in-process encoding"
+        print("  ✅ Shards come back in submission order and match in-process encoding")
+
+        print("  Encoding through HuggingFaceEmbedder with multi_process enabled...")
+        config = dict(model_name=MODEL_NAME, batch_size=8, length_sorted_batching=True, micro_batching=False)
+        pooled = HuggingFaceEmbedder(HuggingFaceEmbedderConfig(
+            **config, multi_process=True, multi_process_workers=2, multi_process_torch_threads=1
+        ))
+        local = HuggingFaceEmbedder(HuggingFaceEmbedderConfig(**config))
+        try:
+            pooled_vectors = await pooled.embed_texts(texts)
+            local_vectors = await local.embed_texts(texts)
+            assert pooled.get_model_info()["process_pool"]["batches"] >= len(texts) // 8
+        finally:
+            pooled.close()
+            local.close()
+        assert np.allclose(pooled_vectors, local_vectors, atol=1e-5), "pooled embedder differs from in-process"
+        assert np.allclose(pooled_vectors, reference, atol=1e-5), "length-bucketed shards were scattered out of order"
+        print("  ✅ Length-bucketed shards are scattered back into input order")
+
+        print("  🎉 Embedding process pool test completed successfully!")
+        return True
+
+    except Exception as e:
+        print(f"  ❌ Embedding process pool test failed: {e}")
+        traceback.print_exc()
+        return False
+
+
+async def main():
+    """Main test function"""
+    print("🔧 Embedding Process Pool Test")
+    print("==============================")
+
+    success = await test_process_pool()
+
+    print("\n📊 Test Results:")
+    print("================")
+    if success:
+        print("✅ Embedding process pool is working correctly!")
+    else:
+        print("❌ Embedding process pool has issues.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test script for the bounded, prioritised thread pools used for blocking work.
+Blocks a pool's workers, queues bulk and interactive work behind them and
+checks run order, the worker bound, metrics and the named-pool registry.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+
+# Add the backend directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.core.executors import (
+    ExecutorRegistry, PriorityThreadPool, PRIORITY_BULK, PRIORITY_INTERACTIVE, EMBEDDING, VECTOR_DB
+)
+
+
+async def test_executors():
+    """Test priority order, bounded concurrency, metrics and the registry"""
+    print("🧵 Testing prioritised thread pools...")
+
+    try:
+        pool = PriorityThreadPool("test", max_workers=1)
+        gate, order = threading.Event(), []
+        blocker = asyncio.ensure_future(pool.run(gate.wait))
+        await asyncio.sleep(0.05)
+
+        jobs = [pool.submit(order.append, f"bulk-{i}", priority=PRIORITY_BULK) for i in range(3)]
+        jobs += [pool.submit(order.append, f"query-{i}", priority=PRIORITY_INTERACTIVE) for i in range(2)]
+        metrics = pool.metrics()
+        assert metrics["queue_depth"] == 5 and metrics["active"] == 1, metrics
+        gate.set()
+        await asyncio.gather(blocker, *map(asyncio.wrap_future, jobs))
+        assert order == ["query-0", "query-1", "bulk-0", "bulk-1", "bulk-2"], order
+        print("  ✅ Queued interactive work ran before bulk work, FIFO within each priority")
+
+        pool = PriorityThreadPool("bounded", max_workers=3)
+        lock, running = threading.Lock(), {"now": 0, "peak": 0}
+
+        def work():
+            with lock:
+                running["now"] += 1
+                running["peak"] = max(running["peak"], running["now"])
+            time.sleep(0.03)
+            with lock:
+                running["now"] -= 1
+            return threading.current_thread().name
+
+        names = await asyncio.gather(*[pool.run(work) for _ in range(12)])
+        assert running["peak"] == 3, f"expected at most 3 concurrent jobs, saw {running['peak']}"
+        assert len(set(names)) == 3 and len(pool._threads) == 3
+        print(f"  ✅ 12 jobs ran on {len(set(names))} threads, never more than 3 at once")
+
+        try:
+            await pool.run(lambda: 1 / 0)
+            raise AssertionError("expected the job's exception")
+        except ZeroDivisionError:
+            pass
+        metrics = pool.metrics()
+        assert metrics == {"max_workers": 3, "queue_depth": 0, "active": 0, "completed": 12, "failed": 1}, metrics
+        print("  ✅ Exceptions reach the caller; completed, failed, active and queue depth are reported")
+
+        registry = ExecutorRegistry()
+        registry.configure({EMBEDDING: 4})
+        embedding = registry.get(EMBEDDING)
+        assert registry.get(EMBEDDING) is embedding and embedding.max_workers == 4
+        assert registry.get(VECTOR_DB).max_workers == ExecutorRegistry.DEFAULT_SIZES[VECTOR_DB]
+        assert await embedding.run(sum, [1, 2, 3]) == 6
+        assert set(registry.metrics()) == {EMBEDDING, VECTOR_DB}
+        registry.shutdown()
+        try:
+            embedding.submit(print)
+            raise AssertionError("a shut-down pool should refuse work")
+        except RuntimeError:
+            pass
+        assert registry.metrics() == {}
+        print("  ✅ Registry creates each named pool once at its configured size and shuts them all down")
+
+        print("  🎉 Executor test completed successfully!")
+        return True
+
+    except Exception as e:
+        print(f"  ❌ Executor test failed: {e}")
+        traceback.print_exc()
+        return False
+
+
+async def main():
+    """Main test function"""
+    print("🔧 Executor Test")
+    print("================")
+
+    success = await test_executors()
+
+    print("\n📊 Test Results:")
+    print("================")
+    if success:
+        print("✅ Executors are working correctly!")
+    else:
+        print("❌ Executors have issues.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Test script for the persistent ingestion job queue.
+Runs stand-in ingests through IngestionPipeline, stops the queue mid-ingest and
+checks a fresh queue on the same job table resumes after the last stored batch,
+then checks failed attempts are retried until max_attempts, a job out of
+attempts at restart reaches the failure callback and a document queued twice
+only runs once at a time.
+"""
+
+import asyncio
+import sys
+import tempfile
+import traceback
+from pathlib import Path
+
+import numpy as np
+
+# Add the backend directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.models.document import Document, DocumentChunk, DocumentType
+from app.core.document_processor.base import BaseDocumentProcessor
+from app.core.embedders.base import BaseEmbedder
+from app.services.ingestion_pipeline import IngestionPipeline
+from app.services.job_queue import IngestionQueue, IngestJob, JobStore, DONE, FAILED, QUEUED, RUNNING
+
+
+class LineProcessor(BaseDocumentProcessor):
+    async def load_document(self, file_path, file_type):
+        return file_path.read_text()
+
+    def clean_text(self, text):
+        return text.strip()
+
+    def split_text(self, text, metadata=None):
+        return [
+            DocumentChunk(id=f"chunk-{i}", content=line, metadata={"chunk_index": i})
+            for i, line in enumerate(text.split("\n"))
+        ]
+
+
+class IndexEmbedder(BaseEmbedder):
+    async def embed_text(self, text):
+        return (await self.embed_texts([text]))[0]
+
+    async def embed_texts(self, texts):
+        await asyncio.sleep(0.01)
+        return np.array([[float(t.split("-")[1])] for t in texts], dtype=np.float32)
+
+    def get_dimension(self):
+        return 1
+
+    def get_model_info(self):
+        return {"provider": "stand-in", "model_name": "stand-in"}
+
+
+class RecordingVectorDB:
+    """Counts every upsert so re-stored chunks show up; fails the first ``failures`` upserts"""
+
+    def __init__(self, failures: int = 0):
+        self.upserts = {}
+        self.failures = failures
+
+    async def batch_upsert_vectors(self, chunks):
+        await asyncio.sleep(0.02)
+        if self.failures:
+            self.failures -= 1
+            raise TimeoutError("vector DB timed out")
+        for chunk in chunks:
+            self.upserts[chunk.id] = self.upserts.get(chunk.id, 0) + 1
+        return True
+
+
+def make_handler(vector_db, concurrency=None):
+    async def handler(job, checkpoint):
+        if concurrency is not None:
+            concurrency["now"] += 1
+            concurrency["peak"] = max(concurrency["peak"], concurrency["now"])
+        try:
+            document = Document(id=job.document_id, filename=job.filename, file_type=DocumentType(job.file_type))
+            pipeline = IngestionPipeline(
+                LineProcessor(), IndexEmbedder(), vector_db, batch_size=10,
+                resume_from=job.stored, on_batch_stored=checkpoint
+            )
+            await pipeline.run(document, Path(job.file_path))
+        finally:
+            if concurrency is not None:
+                concurrency["now"] -= 1
+    return handler
+
+
+def write_job(tmp: Path, name: str, lines: int) -> IngestJob:
+    path = tmp / f"{name}.txt"
+    path.write_text("\n".join(f"line-{i}" for i in range(lines)))
+    return IngestJob(document_id=name, filename=f"{name}.txt", file_type="txt", file_path=str(path))
+
+
+async def wait_for(condition, timeout=10.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("timed out waiting for the queue")
+        await asyncio.sleep(0.01)
+
+
+async def test_job_queue():
+    """Test bounded workers, persistence, checkpoints and resume"""
+    print("📋 Testing ingestion job queue...")
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            db_path = str(tmp / "jobs.sqlite3")
+
+            print("  Running 6 jobs on 2 workers...")
+            vector_db, concurrency = RecordingVectorDB(), {"now": 0, "peak": 0}
+            queue = IngestionQueue(db_path, workers=2)
+            await queue.start(make_handler(vector_db, concurrency))
+            for i in range(6):
+                await queue.enqueue(write_job(tmp, f"doc-{i}", 20))
+            await wait_for(lambda: queue.completed == 6)
+            assert concurrency["peak"] == 2, f"expected 2 concurrent jobs, saw {concurrency['peak']}"
+            job = queue.get("doc-0")
+            assert job.status == DONE and job.stored == 20 and job.chunks_count == 20
+            assert not Path(job.file_path).exists(), "spooled file should be removed when done"
+            print("  ✅ Jobs ran at most 2 at a time, finished with checkpoints, spool files removed")
+
+            queue._handler = make_handler(twice := RecordingVectorDB())
+            await queue.enqueue(write_job(tmp, "twice", 40))
+            queue._queue.put_nowait("twice")
+            await wait_for(lambda: queue.completed == 7)
+            await asyncio.sleep(0.1)
+            assert queue.get("twice").attempts == 1 and queue.completed == 7
+            assert len(twice.upserts) == 40 and set(twice.upserts.values()) == {1}, "a job queued twice should only run once at a time"
+            print("  ✅ A document queued twice runs on one worker, not both")
+
+            print("  Stopping the queue in the middle of a 200-chunk ingest...")
+            await queue.stop()
+            vector_db = RecordingVectorDB()
+            queue_two = IngestionQueue(db_path, workers=1)
+            await queue_two.start(make_handler(vector_db))
+            await queue_two.enqueue(write_job(tmp, "big", 200))
+            await wait_for(lambda: queue_two.get("big").stored >= 50)
+            await queue_two.stop()
+            queue_three = IngestionQueue(db_path, workers=1, retry_delay=0.05)
+            await queue_three.start(make_handler(vector_db))
+            assert queue_three.resumed == 1, "interrupted job should be requeued"
+            checkpoint = queue_three.get("big").stored
+            assert queue_three.get("big").status == RUNNING and checkpoint >= 50
+            await wait_for(lambda: queue_three.completed == 1)
+            assert queue_three.get("big").status == DONE and queue_three.get("big").stored == 200
+            assert sorted(vector_db.upserts) == sorted(f"chunk-{i}" for i in range(200))
+            restored = sum(count - 1 for count in vector_db.upserts.values())
+            assert restored <= 10, f"{restored} chunks were stored twice"
+            print(f"  ✅ Resumed from chunk {checkpoint}, {restored} chunk(s) stored twice")
+
+            print("  Timing out the vector DB on a job's first upsert...")
+            queue_three._handler = make_handler(flaky := RecordingVectorDB(failures=1))
+            job = write_job(tmp, "flaky", 30)
+            await queue_three.enqueue(job)
+            await wait_for(lambda: queue_three.retried == 1)
+            assert queue_three.get("flaky").status in (QUEUED, RUNNING)
+            assert Path(job.file_path).exists(), "spooled file must survive until the job is final"
+            await wait_for(lambda: queue_three.completed == 2)
+            flaky_job = queue_three.get("flaky")
+            assert flaky_job.status == DONE and flaky_job.attempts == 2 and flaky_job.stored == 30
+            assert sorted(flaky.upserts) == sorted(f"chunk-{i}" for i in range(30))
+            assert not Path(job.file_path).exists()
+            print("  ✅ Transient failure retried after a backoff and finished on attempt 2")
+
+            print("  Failing a job on every attempt...")
+            job = write_job(tmp, "missing", 5)
+            Path(job.file_path).unlink()
+            await queue_three.enqueue(job)
+            await wait_for(lambda: queue_three.failed == 1)
+            missing = queue_three.get("missing")
+            assert missing.status == FAILED and missing.error and missing.attempts == 3
+            print("  ✅ Job failed with its error after 3 attempts")
+            await queue_three.stop()
+
+            print("  Restarting with a job that already used up its attempts...")
+            store = JobStore(db_path)
+            store.add(write_job(tmp, "exhausted", 5))
+            store.update("exhausted", status=RUNNING, attempts=3)
+            store.close()
+            failures, ran = [], []
+
+            async def on_failure(job, error):
+                failures.append((job.document_id, error))
+
+            async def never(job, checkpoint):
+                ran.append(job.document_id)
+
+            queue_four = IngestionQueue(db_path, workers=1)
+            await queue_four.start(never, on_failure)
+            await wait_for(lambda: queue_four.failed == 1)
+            assert queue_four.get("exhausted").status == FAILED and not ran
+            assert failures == [("exhausted", "Gave up after 3 attempts")], failures
+            await queue_four.stop()
+            print("  ✅ A job given up on at dequeue is reported through the failure callback")
+
+        print("  🎉 Job queue test completed successfully!")
+        return True
+
+    except Exception as e:
+        print(f"  ❌ Job queue test failed: {e}")
+        traceback.print_exc()
+        return False
+
+
+async def main():
+    """Main test function"""
+    print("🔧 Ingestion Job Queue Test")
+    print("===========================")
+
+    success = await test_job_queue()
+
+    print("\n📊 Test Results:")
+    print("================")
+    if success:
+        print("✅ Ingestion job queue is working correctly!")
+    else:
+        print("❌ Ingestion job queue has issues.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
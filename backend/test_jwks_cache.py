@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Test script for the JWKS key cache used by Keycloak token verification.
+Runs against a local stand-in JWKS HTTP server, no Keycloak required.
+"""
+
+import asyncio
+import json
+import sys
+import threading
+import traceback
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt, JWTError
+
+# Add the backend directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.auth.jwks import JWKSCache
+
+
+def make_key(kid: str):
+    """Generate an RSA key pair, returning (private PEM, public JWK dict)"""
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption()
+    ).decode()
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode()
+    public_jwk = jwk.construct(public_pem, algorithm="RS256").to_dict()
+    public_jwk.update({"kid": kid, "use": "sig", "alg": "RS256"})
+    return private_pem, public_jwk
+
+
+class StandInJWKSServer:
+    """Minimal JWKS endpoint that counts requests and can rotate keys"""
+
+    def __init__(self, keys):
+        self.keys = list(keys)
+        self.requests = 0
+        self.delay = 0.0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests += 1
+                if server.delay:
+                    import time
+                    time.sleep(server.delay)
+                body = json.dumps({"keys": server.keys}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/realms/test/protocol/openid-connect/certs"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+async def test_jwks_cache():
+    """Test kid lookups, single-flight refresh and key rotation"""
+    print("🔑 Testing JWKS cache...")
+
+    try:
+        private_a, public_a = make_key("key-a")
+        private_b, public_b = make_key("key-b")
+
+        with StandInJWKSServer([public_a]) as server:
+            cache = JWKSCache(server.url, ttl_seconds=300, min_refresh_interval=0)
+
+            # First lookup fetches, repeated lookups are served from memory
+            print("  Verifying tokens with a warm cache...")
+            token = jwt.encode({"sub": "user-1"}, private_a, algorithm="RS256", headers={"kid": "key-a"})
+            for _ in range(20):
+                key = await cache.get_key("key-a")
+                assert jwt.decode(token, key, algorithms=["RS256"])["sub"] == "user-1"
+            assert server.requests == 1, f"expected 1 JWKS fetch, got {server.requests}"
+            print(f"  ✅ 20 verifications, {server.requests} JWKS fetch")
+
+            # Rotate in a new key; concurrent misses share one fetch
+            print("  Rotating signing key with concurrent unknown-kid requests...")
+            server.keys.append(public_b)
+            server.delay = 0.2
+            token_b = jwt.encode({"sub": "user-2"}, private_b, algorithm="RS256", headers={"kid": "key-b"})
+            keys = await asyncio.gather(*[cache.get_key("key-b") for _ in range(25)])
+            assert server.requests == 2, f"expected 2 JWKS fetches, got {server.requests}"
+            assert all(jwt.decode(token_b, k, algorithms=["RS256"])["sub"] == "user-2" for k in keys)
+            print(f"  ✅ 25 concurrent misses caused a single refetch")
+            server.delay = 0.0
+
+            # Unknown kids are rejected and rate-limited
+            print("  Checking unknown kid handling...")
+            limited = JWKSCache(server.url, ttl_seconds=300, min_refresh_interval=60)
+            await limited.get_key("key-a")
+            before = server.requests
+            for _ in range(10):
+                try:
+                    await limited.get_key("does-not-exist")
+                    raise AssertionError("unknown kid should not resolve")
+                except JWTError:
+                    pass
+            assert server.requests == before, "unknown kids should not trigger refetches inside the refresh interval"
+            print("  ✅ Unknown kids rejected without hammering the JWKS endpoint")
+
+            # Expired TTL triggers a refetch
+            print("  Checking TTL expiry...")
+            short = JWKSCache(server.url, ttl_seconds=0.1, min_refresh_interval=0)
+            await short.get_key("key-a")
+            await asyncio.sleep(0.15)
+            await short.get_key("key-a")
+            assert short.fetch_count == 2, f"expected 2 fetches after TTL, got {short.fetch_count}"
+            print("  ✅ Stale keys are refreshed after the TTL")
+
+        print("  🎉 JWKS cache test completed successfully!")
+        return True
+
+    except Exception as e:
+        print(f"  ❌ JWKS cache test failed: {e}")
+        traceback.print_exc()
+        return False
+
+
+async def main():
+    """Main test function"""
+    print("🔧 JWKS Cache Test")
+    print("==================")
+
+    success = await test_jwks_cache()
+
+    print("\n📊 Test Results:")
+    print("================")
+    if success:
+        print("✅ JWKS cache is working correctly!")
+    else:
+        print("❌ JWKS cache has issues.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
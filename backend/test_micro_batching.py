@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test script for micro-batching of concurrent embed_text calls.
+Drives MicroBatcher with a recording stand-in encoder and checks coalescing,
+the max_wait flush, the size flush, result order and error propagation.
+"""
+
+import asyncio
+import sys
+import time
+import traceback
+from pathlib import Path
+
+# Add the backend directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.core.embedders.batching import MicroBatcher
+
+
+class RecordingEncoder:
+    """Returns each text reversed, recording every batch it is given"""
+
+    def __init__(self, fail: bool = False, drop: bool = False):
+        self.batches = []
+        self.fail = fail
+        self.drop = drop
+
+    async def __call__(self, texts):
+        self.batches.append((list(texts), time.perf_counter()))
+        await asyncio.sleep(0.01)
+        if self.fail:
+            raise ValueError("model crashed")
+        vectors = [text[::-1] for text in texts]
+        return vectors[:-1] if self.drop else vectors
+
+
+async def test_micro_batching():
+    """Test concurrent submits coalesce into batches, in order, with errors reaching every caller"""
+    print("📦 Testing micro-batching...")
+
+    try:
+        texts = [f"query {i}" for i in range(10)]
+        encoder = RecordingEncoder()
+        batcher = MicroBatcher(encoder, max_wait_ms=50, max_batch_size=32)
+        start = time.perf_counter()
+        results = await asyncio.gather(*[batcher.submit(text) for text in texts])
+        assert len(encoder.batches) == 1 and encoder.batches[0][0] == texts, encoder.batches
+        assert results == [text[::-1] for text in texts], "each caller should get its own result, in order"
+        waited = encoder.batches[0][1] - start
+        assert 0.04 <= waited < 0.5, f"batch should flush after max_wait, flushed after {waited:.3f}s"
+        assert batcher.stats() == {"batches": 1, "items": 10, "avg_batch_size": 10.0}
+        print(f"  ✅ 10 concurrent calls became 1 batch, flushed after max_wait ({waited * 1000:.0f} ms), in order")
+
+        encoder = RecordingEncoder()
+        batcher = MicroBatcher(encoder, max_wait_ms=10_000, max_batch_size=4)
+        results = await asyncio.wait_for(asyncio.gather(*[batcher.submit(text) for text in texts[:8]]), timeout=2)
+        assert [batch for batch, _ in encoder.batches] == [texts[:4], texts[4:8]]
+        assert results == [text[::-1] for text in texts[:8]]
+        print("  ✅ A full batch flushes at max_batch_size without waiting")
+
+        lone = RecordingEncoder()
+        batcher = MicroBatcher(lone, max_wait_ms=20, max_batch_size=32)
+        assert await asyncio.wait_for(batcher.submit("alone"), timeout=2) == "enola"
+        print("  ✅ A lone call is flushed by the max_wait timer")
+
+        for encoder, error in ((RecordingEncoder(fail=True), ValueError), (RecordingEncoder(drop=True), RuntimeError)):
+            batcher = MicroBatcher(encoder, max_wait_ms=10, max_batch_size=32)
+            results = await asyncio.gather(*[batcher.submit(text) for text in texts[:5]], return_exceptions=True)
+            assert all(isinstance(result, error) for result in results), results
+            assert len(encoder.batches) == 1
+        print("  ✅ An encoder error or a short result reaches every waiting caller")
+
+        blocked = asyncio.Event()
+
+        async def hanging(texts):
+            await blocked.wait()
+            return texts
+
+        batcher = MicroBatcher(hanging, max_wait_ms=1, max_batch_size=32)
+        callers = [asyncio.ensure_future(batcher.submit(text)) for text in texts[:3]]
+        await asyncio.sleep(0.05)
+        assert len(batcher._tasks) == 1, "the in-flight flush task should be referenced"
+        for task in batcher._tasks:
+            task.cancel()
+        results = await asyncio.gather(*callers, return_exceptions=True)
+        assert all(isinstance(result, asyncio.CancelledError) for result in results)
+        await asyncio.sleep(0)
+        assert not batcher._tasks, "finished flush tasks should be released"
+        print("  ✅ Cancelling a flush cancels its callers, and finished flushes are released")
+
+        print("  🎉 Micro-batching test completed successfully!")
+        return True
+
+    except Exception as e:
+        print(f"  ❌ Micro-batching test failed: {e}")
+        traceback.print_exc()
+        return False
+
+
+async def main():
+    """Main test function"""
+    print("🔧 Micro-batching Test")
+    print("======================")
+
+    success = await test_micro_batching()
+
+    print("\n📊 Test Results:")
+    print("================")
+    if success:
+        print("✅ Micro-batching is working correctly!")
+    else:
+        print("❌ Micro-batching has issues.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
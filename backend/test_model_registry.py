@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared embedding model registry.
+Uses stand-in model objects, no model download required.
+"""
+
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+
+# Add the backend directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.core.embedders.registry import ModelRegistry, model_key
+
+
+def test_model_registry():
+    """Test sharing, concurrent first loads and reference counting"""
+    print("📦 Testing model registry...")
+
+    try:
+        registry = ModelRegistry()
+        loads = []
+
+        def loader():
+            time.sleep(0.1)
+            loads.append(1)
+            return object()
+
+        # Same name, device and kwargs share one instance
+        print("  Acquiring the same model from several holders...")
+        key = model_key("all-MiniLM-L6-v2", "cpu", {"trust_remote_code": False})
+        same_key = model_key("all-MiniLM-L6-v2", "cpu", {"trust_remote_code": False})
+        first = registry.acquire(key, loader)
+        second = registry.acquire(same_key, loader)
+        assert first is second, "same key should return the same model"
+        assert len(loads) == 1, f"expected 1 load, got {len(loads)}"
+        print("  ✅ Second holder reused the loaded model")
+
+        # Different kwargs or device are different models
+        other = registry.acquire(model_key("all-MiniLM-L6-v2", "cuda", {"trust_remote_code": False}), loader)
+        assert other is not first and len(loads) == 2
+        print("  ✅ Different device loads a separate model")
+
+        # Concurrent first acquires load once
+        print("  Acquiring a new model from 8 threads at once...")
+        results = []
+        concurrent_key = model_key("bge-small", "cpu", {})
+        threads = [
+            threading.Thread(target=lambda: results.append(registry.acquire(concurrent_key, loader)))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(set(map(id, results))) == 1, "concurrent acquires should share one instance"
+        assert len(loads) == 3, f"expected 3 loads, got {len(loads)}"
+        print("  ✅ Concurrent first use caused a single load")
+
+        # Model stays loaded until the last holder releases it
+        print("  Checking reference counting...")
+        registry.release(key)
+        assert registry.acquire(key, loader) is first and len(loads) == 3
+        registry.release(key)
+        registry.release(key)
+        registry.acquire(key, loader)
+        assert len(loads) == 4, "model should reload after every holder released it"
+        print("  ✅ Models unload once the last reference is released")
+
+        # Unload hooks run on last release and on shutdown
+        print("  Checking unload hooks...")
+        unloaded = []
+        pool_key = model_key("bge-small", "cpu", {"process_pool": 4})
+        registry.acquire(pool_key, loader, unload=unloaded.append)
+        registry.acquire(pool_key, loader, unload=unloaded.append)
+        registry.release(pool_key)
+        assert not unloaded, "unload should wait for the last reference"
+        registry.release(pool_key)
+        assert len(unloaded) == 1, "unload should run once the last reference is released"
+        registry.acquire(pool_key, loader, unload=unloaded.append)
+        registry.shutdown()
+        assert len(unloaded) == 2 and not registry.stats()["models"], "shutdown should unload everything"
+        print("  ✅ Unload hooks ran on release and shutdown")
+
+        print("  🎉 Model registry test completed successfully!")
+        return True
+
+    except Exception as e:
+        print(f"  ❌ Model registry test failed: {e}")
+        traceback.print_exc()
+        return False
+
+
+def main():
+    """Main test function"""
+    print("🔧 Model Registry Test")
+    print("======================")
+
+    success = test_model_registry()
+
+    print("\n📊 Test Results:")
+    print("================")
+    if success:
+        print("✅ Model registry is working correctly!")
+    else:
+        print("❌ Model registry has issues.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test script for the ONNX embedding backend.
+Exports sentence-transformers/all-MiniLM-L6-v2 to a temporary cache, fp32 and
+int8, checks both against torch embeddings, and checks exports are cached per
+model, revision and quantization and reused rather than exported again.
+Downloads the model on first run; needs onnx and onnxruntime.
+"""
+
+import asyncio
+import sys
+import tempfile
+import traceback
+from pathlib import Path
+
+import numpy as np
+
+# Add the backend directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.models.config import HuggingFaceEmbedderConfig
+from app.core.embedders.huggingface_embedder import HuggingFaceEmbedder
+from app.core.embedders.onnx_backend import OnnxEncoder
+
+MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+MODEL_DIR = "sentence-transformers__all-MiniLM-L6-v2"
+
+
+def make_texts(count: int):
+    """Texts of very different lengths, so batches need padding"""
+    return [f"Document {i}: " + "the quarterly report covers revenue and churn. " * (i % 9 + 1) for i in range(count)]
+
+
+def min_cosine(a: np.ndarray, b: np.ndarray) -> float:
+    a = a / np.linalg.norm(a, axis=1, keepdims=True)
+    b = b / np.linalg.norm(b, axis=1, keepdims=True)
+    return float(np.min(np.sum(a * b, axis=1)))
+
+
+async def test_onnx_backend():
+    """Test ONNX parity with torch and the export cache layout"""
+    print("⚙️  Testing ONNX embedding backend...")
+
+    try:
+        texts = make_texts(40)
+        config = dict(model_name=MODEL_NAME, batch_size=8, micro_batching=False)
+        torch_embedder = HuggingFaceEmbedder(HuggingFaceEmbedderConfig(**config))
+        reference = await torch_embedder.embed_texts(texts)
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            paths = {}
+            for quantize, threshold in ((False, 0.999), (True, 0.98)):
+                embedder = HuggingFaceEmbedder(HuggingFaceEmbedderConfig(
+                    **config, backend="onnx", onnx_cache_dir=cache_dir, onnx_quantize=quantize
+                ))
+                assert embedder._onnx is not None, "ONNX backend fell back to torch"
+                label = embedder.get_model_info()["backend"]
+                paths[quantize] = embedder._onnx.model_path
+
+                embeddings = await embedder.embed_texts(texts)
+                assert embeddings.dtype == np.float32 and embeddings.shape == reference.shape
+                parity = min_cosine(embeddings, reference)
+                assert parity >= threshold, f"{label} parity {parity:.4f} below {threshold}"
+                query = await embedder.embed_text(texts[3])
+                assert min_cosine(query[None], reference[3:4]) >= threshold
+                embedder.close()
+                print(f"  ✅ {label}: min cosine vs torch {parity:.4f} over {len(texts)} texts")
+
+            export_dir = Path(cache_dir) / MODEL_DIR / "main"
+            assert paths == {False: export_dir / "model.onnx", True: export_dir / "model.int8.onnx"}, paths
+            print("  ✅ fp32 and int8 exports cached side by side under the model name and revision")
+
+            exported = {path: path.stat().st_mtime_ns for path in paths.values()}
+            cached = OnnxEncoder(torch_embedder.model, MODEL_NAME, cache_dir, quantize=True)
+            assert cached.model_path == paths[True]
+            assert {path: path.stat().st_mtime_ns for path in paths.values()} == exported, "cached export was rewritten"
+
+            pinned = OnnxEncoder(torch_embedder.model, MODEL_NAME, cache_dir, revision="refs/pr/1")
+            assert pinned.model_path == Path(cache_dir) / MODEL_DIR / "refs__pr__1" / "model.onnx"
+            assert pinned.model_path.exists() and not (pinned.model_path.parent / "model.int8.onnx").exists()
+            assert min_cosine(pinned.encode(texts), reference) >= 0.999
+            print("  ✅ Cached exports are reused; another revision gets its own export")
+
+        torch_embedder.close()
+        print("  🎉 ONNX backend test completed successfully!")
+        return True
+
+    except Exception as e:
+        print(f"  ❌ ONNX backend test failed: {e}")
+        traceback.print_exc()
+        return False
+
+
+async def main():
+    """Main test function"""
+    print("🔧 ONNX Backend Test")
+    print("====================")
+
+    success = await test_onnx_backend()
+
+    print("\n📊 Test Results:")
+    print("================")
+    if success:
+        print("✅ ONNX backend is working correctly!")
+    else:
+        print("❌ ONNX backend has issues.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
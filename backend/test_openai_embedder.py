@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Test script for concurrent, retrying batch dispatch in OpenAIEmbedder.
+Runs against a local stub of the /v1/embeddings endpoint, no API key required.
+"""
+
+import asyncio
+import json
+import random
+import sys
+import threading
+import time
+import traceback
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add the backend directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.models.config import OpenAIEmbedderConfig
+from app.core.embedders.openai_embedder import OpenAIEmbedder
+
+
+class StubEmbeddingsServer:
+    """Mimics the embeddings endpoint: random latency, shuffled data, injected 429/5xx"""
+
+    def __init__(self, fail_statuses=()):
+        self.fail_statuses = list(fail_statuses)
+        self.requests = 0
+        self.batch_sizes = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with server._lock:
+                    server.requests += 1
+                    server.in_flight += 1
+                    server.max_in_flight = max(server.max_in_flight, server.in_flight)
+                    status = server.fail_statuses.pop(0) if server.fail_statuses else 200
+                try:
+                    time.sleep(random.uniform(0.01, 0.05))
+                    if status != 200:
+                        payload = {"error": {"message": "injected failure", "type": "server_error"}}
+                    else:
+                        inputs = body["input"]
+                        server.batch_sizes.append(len(inputs))
+                        # Encode the text itself in the vector so order can be checked
+                        data = [
+                            {"object": "embedding", "index": i, "embedding": [float(int(text.split("-")[1].split()[0])), 0.0]}
+                            for i, text in enumerate(inputs)
+                        ]
+                        random.shuffle(data)
+                        payload = {
+                            "object": "list",
+                            "data": data,
+                            "model": body["model"],
+                            "usage": {"prompt_tokens": 0, "total_tokens": 0}
+                        }
+                    raw = json.dumps(payload).encode()
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(raw)))
+                    if status == 429:
+                        self.send_header("Retry-After", "0")
+                    self.end_headers()
+                    self.wfile.write(raw)
+                finally:
+                    with server._lock:
+                        server.in_flight -= 1
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}/v1"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def make_embedder(base_url: str, **overrides) -> OpenAIEmbedder:
+    config = OpenAIEmbedderConfig(
+        api_key="test-key",
+        base_url=base_url,
+        model_name="text-embedding-3-small",
+        batch_size=overrides.pop("batch_size", 10),
+        max_concurrency=overrides.pop("max_concurrency", 4),
+        retry_base_delay=0.01,
+        retry_max_delay=0.05,
+        **overrides
+    )
+    return OpenAIEmbedder(config)
+
+
+async def test_openai_embedder():
+    """Test concurrency limit, token budgets, retries and ordering"""
+    print("🧪 Testing OpenAIEmbedder batch dispatch...")
+
+    try:
+        texts = [f"chunk-{i}" for i in range(200)]
+
+        print("  Embedding 200 texts with concurrency 4...")
+        with StubEmbeddingsServer() as server:
+            embedder = make_embedder(server.base_url)
+            embeddings = await embedder.embed_texts(texts)
+            assert [int(e[0]) for e in embeddings] == list(range(200)), "output order changed"
+            assert server.requests == 20, f"expected 20 requests, got {server.requests}"
+            assert server.max_in_flight <= 4, f"concurrency exceeded: {server.max_in_flight}"
+            assert server.max_in_flight > 1, "batches were not dispatched concurrently"
+            print(f"  ✅ Order preserved, peak in-flight requests: {server.max_in_flight}")
+
+        print("  Batching by token budget...")
+        with StubEmbeddingsServer() as server:
+            embedder = make_embedder(server.base_url, batch_size=100, max_batch_tokens=12)
+            long_texts = [f"chunk-{i} " + "word " * 5 for i in range(12)]
+            embeddings = await embedder.embed_texts(long_texts)
+            assert len(embeddings) == 12
+            assert max(server.batch_sizes) < 12, f"token budget ignored: {server.batch_sizes}"
+            print(f"  ✅ Token budget split 12 texts into batches of {server.batch_sizes}")
+
+        print("  Retrying 429 and 5xx responses...")
+        with StubEmbeddingsServer(fail_statuses=[429, 500, 503]) as server:
+            embedder = make_embedder(server.base_url, max_retries=3, max_concurrency=1)
+            embeddings = await embedder.embed_texts(texts[:30])
+            assert [int(e[0]) for e in embeddings] == list(range(30))
+            assert server.requests == 6, f"expected 3 batches + 3 retries, got {server.requests}"
+            print("  ✅ Transient failures retried with backoff")
+
+        print("  Giving up after max_retries...")
+        with StubEmbeddingsServer(fail_statuses=[500] * 10) as server:
+            embedder = make_embedder(server.base_url, max_retries=2, max_concurrency=1)
+            try:
+                await embedder.embed_texts(texts[:5])
+                raise AssertionError("expected failure after retries")
+            except RuntimeError:
+                pass
+            assert server.requests == 3, f"expected 1 attempt + 2 retries, got {server.requests}"
+            print("  ✅ Persistent failures surface after max_retries")
+
+        print("  🎉 OpenAIEmbedder test completed successfully!")
+        return True
+
+    except Exception as e:
+        print(f"  ❌ OpenAIEmbedder test failed: {e}")
+        traceback.print_exc()
+        return False
+
+
+async def main():
+    """Main test function"""
+    print("🔧 OpenAI Embedder Dispatch Test")
+    print("================================")
+
+    success = await test_openai_embedder()
+
+    print("\n📊 Test Results:")
+    print("================")
+    if success:
+        print("✅ OpenAIEmbedder batch dispatch is working correctly!")
+    else:
+        print("❌ OpenAIEmbedder batch dispatch has issues.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
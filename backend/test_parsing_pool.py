@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Test script for the document parsing process pool.
+Checks per-file timeouts and memory limits and page-parallel PDF extraction,
+then ingests a generated ~50MB PDF
+while a stand-in chat request loop measures event-loop latency.
+"""
+
+import asyncio
+import re
+import statistics
+import sys
+import tempfile
+import time
+import traceback
+from pathlib import Path
+
+# Add the backend directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.core.document_processor.parsing_pool import ParsingProcessPool
+
+
+def sleep_for(seconds: float) -> str:
+    time.sleep(seconds)
+    return "done"
+
+
+def allocate(megabytes: int) -> int:
+    return len(bytearray(megabytes * 1024 * 1024))
+
+
+def write_pdf(path: Path, target_mb: int) -> int:
+    """Write a plain-text PDF of roughly ``target_mb`` megabytes; returns the page count"""
+    line = "Quarterly revenue grew twelve percent driven by new enterprise customers. "
+    body = " ".join(f"({line}{i}) '" for i in range(28))
+    page_bytes = len(body) + 260
+    pages = max(1, target_mb * 1024 * 1024 // page_bytes)
+
+    offsets = []
+    with open(path, "wb") as f:
+        def obj(number: int, body: str) -> None:
+            offsets.append(f.tell())
+            f.write(f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1"))
+
+        f.write(b"%PDF-1.4\n")
+        kids = " ".join(f"{4 + 2 * i} 0 R" for i in range(pages))
+        obj(1, "<< /Type /Catalog /Pages 2 0 R >>")
+        obj(2, f"<< /Type /Pages /Kids [{kids}] /Count {pages} >>")
+        obj(3, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+        for i in range(pages):
+            stream = f"BT /F1 9 Tf 36 800 Td 11 TL (Page {i + 1} of the report.) ' {body} ET"
+            obj(4 + 2 * i, f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+                           f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>")
+            obj(5 + 2 * i, f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+
+        xref = f.tell()
+        f.write(f"xref\n0 {len(offsets) + 1}\n0000000000 65535 f \n".encode())
+        for offset in offsets:
+            f.write(f"{offset:010d} 00000 n \n".encode())
+        f.write(f"trailer\n<< /Size {len(offsets) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    return pages
+
+
+async def measure_chat_latency(stop: asyncio.Event) -> list:
+    """Stand-in chat handler: a short timer plus a little CPU work, timed end to end"""
+    samples = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.01)
+        sum(i * i for i in range(2000))
+        samples.append((time.perf_counter() - start - 0.01) * 1000)
+    return samples
+
+
+async def test_limits():
+    """Test per-file timeouts, memory limits and recovery"""
+    print("⏱️  Testing parsing pool limits...")
+
+    try:
+        pool = ParsingProcessPool(processes=2, timeout=1.0, memory_limit_mb=512)
+
+        assert await pool.run(sleep_for, 0.1) == "done"
+        print("  ✅ Work runs in a worker process")
+
+        print("  Running a file past its timeout alongside a normal one...")
+        slow = asyncio.ensure_future(pool.run(sleep_for, 10))
+        normal = asyncio.ensure_future(pool.run(sleep_for, 0.5, timeout=5))
+        try:
+            await slow
+            raise AssertionError("expected a timeout")
+        except TimeoutError:
+            pass
+        assert await normal == "done", "file sharing the killed pool should be retried"
+        assert pool.timeouts == 1 and pool.restarts == 1
+        print("  ✅ Stuck file timed out, its neighbour was retried on a fresh pool")
+
+        print("  Exceeding the worker memory limit...")
+        try:
+            await pool.run(allocate, 1024)
+            raise AssertionError("expected a memory error")
+        except MemoryError:
+            pass
+        assert await pool.run(allocate, 64) == 64 * 1024 * 1024
+        print("  ✅ Over-limit allocation failed without affecting later files")
+
+        pool.shutdown()
+        return True
+
+    except Exception as e:
+        print(f"  ❌ Parsing pool limits test failed: {e}")
+        traceback.print_exc()
+        return False
+
+
+async def test_page_parallel_pdf(target_mb: int = 1):
+    """Load a PDF through the processor's page-range split and check page order and chunk pages"""
+    print("📑 Testing page-parallel PDF extraction...")
+
+    try:
+        from unittest import mock
+        from app.core.document_processor.langchain_processor import LangChainDocumentProcessor
+        from app.core.document_processor.parsing_pool import parsing_pool
+
+        with tempfile.TemporaryDirectory() as tmp:
+            pdf_path = Path(tmp) / "pages.pdf"
+            pages = write_pdf(pdf_path, target_mb)
+
+            # Ranges are capped at the core count; pretend to have 3 so the split runs on any host
+            parsing_pool.configure(processes=3, timeout=600, memory_limit_mb=0)
+            processor = LangChainDocumentProcessor(chunk_size=1000, chunk_overlap=200, pdf_parallel_min_pages=10)
+            with mock.patch("os.cpu_count", return_value=3):
+                extracted = await processor._load_pdf_pages(str(pdf_path))
+            assert parsing_pool.metrics()["completed"] == 1 + 3, "expected a page count plus 3 page ranges"
+
+            with mock.patch("os.cpu_count", return_value=1):
+                serial = await processor._load_pdf_pages(str(pdf_path))
+            parsing_pool.shutdown()
+
+        assert [number for number, _ in extracted] == list(range(1, pages + 1)), "pages out of order"
+        assert all(text.startswith(f"Page {number} of the report.") for number, text in extracted)
+        assert extracted == serial, "ranged extraction should match a single-range pass"
+        print(f"  ✅ {pages} pages extracted as 3 ranges, merged in page order, same as one range")
+
+        text, page_starts = processor.clean_pages(extracted)
+        chunks = processor.split_pages(text, {"document_hash": "0" * 64}, page_starts)
+        covered = set()
+        for chunk in chunks:
+            page, page_end = chunk.metadata["page"], chunk.metadata["page_end"]
+            markers = [int(n) for n in re.findall(r"Page (\d+) of the report", chunk.content)]
+            assert page <= page_end and all(page <= n <= page_end for n in markers), (page, page_end, markers)
+            if chunk.content.startswith("Page "):
+                assert markers[0] == page, "a chunk opening a page should be tagged with that page"
+            covered.update(range(page, page_end + 1))
+        assert covered == set(range(1, pages + 1))
+        print(f"  ✅ {len(chunks)} chunks tagged with the pages they span")
+        return True
+
+    except Exception as e:
+        print(f"  ❌ Page-parallel PDF test failed: {e}")
+        traceback.print_exc()
+        return False
+
+
+async def test_chat_latency_during_ingest(target_mb: int = 50):
+    """Parse a large PDF while measuring stand-in chat latency"""
+    print(f"📄 Testing chat latency during a {target_mb}MB PDF ingest...")
+
+    try:
+        from app.models.document import DocumentType
+        from app.core.document_processor.langchain_processor import LangChainDocumentProcessor
+        from app.core.document_processor.parsing_pool import parsing_pool
+
+        with tempfile.TemporaryDirectory() as tmp:
+            pdf_path = Path(tmp) / "large.pdf"
+            pages = write_pdf(pdf_path, target_mb)
+            print(f"  Generated {pdf_path.stat().st_size / 2**20:.1f}MB PDF with {pages} pages")
+
+            # Idle baseline
+            stop = asyncio.Event()
+            baseline_task = asyncio.ensure_future(measure_chat_latency(stop))
+            await asyncio.sleep(1.0)
+            stop.set()
+            baseline = await baseline_task
+
+            # During ingest
+            parsing_pool.configure(processes=2, timeout=1800, memory_limit_mb=0)
+            processor = LangChainDocumentProcessor()
+            stop = asyncio.Event()
+            during_task = asyncio.ensure_future(measure_chat_latency(stop))
+            start = time.perf_counter()
+            text = await processor.load_document(pdf_path, DocumentType.PDF)
+            parse_time = time.perf_counter() - start
+            stop.set()
+            during = await during_task
+            parsing_pool.shutdown()
+
+        def p95(samples):
+            return statistics.quantiles(samples, n=20)[-1]
+
+        print(f"  Parsed {len(text) / 2**20:.1f}MB of text in {parse_time:.1f}s")
+        print(f"  Chat latency overhead p95: idle {p95(baseline):.2f}ms, during ingest {p95(during):.2f}ms "
+              f"({len(during)} requests)")
+        assert p95(during) < max(20.0, 4 * p95(baseline)), "chat latency degraded during parsing"
+        print("  ✅ Chat latency stayed flat while the PDF was parsed")
+        return True
+
+    except Exception as e:
+        print(f"  ❌ Chat latency test failed: {e}")
+        traceback.print_exc()
+        return False
+
+
+async def main():
+    """Main test function"""
+    print("🔧 Parsing Pool Test")
+    print("====================")
+
+    results = [await test_limits(), await test_page_parallel_pdf(), await test_chat_latency_during_ingest()]
+
+    print("\n📊 Test Results:")
+    print("================")
+    if all(results):
+        print("✅ Parsing pool is working correctly!")
+    else:
+        print("❌ Parsing pool has issues.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
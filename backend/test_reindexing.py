@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Test script for incremental re-indexing.
+Ingests a document through DocumentService and the ingestion queue, uploads a
+revised version and checks only new or changed chunks are embedded and only
+removed ones are deleted, that concurrent updates are refused, and that
+reused vectors carry the new version's offsets and page.
+"""
+
+import asyncio
+import sys
+import tempfile
+import traceback
+from pathlib import Path
+
+import numpy as np
+
+# Add the backend directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.models.document import DocumentChunk, DocumentStatus, DocumentType
+from app.core.document_processor.base import BaseDocumentProcessor
+from app.core.embedders.base import BaseEmbedder
+from app.services.document_service import DocumentService
+from app.services.job_queue import ingestion_queue
+
+
+class ParagraphProcessor(BaseDocumentProcessor):
+    """One chunk per paragraph, with offsets; form feeds separate pages"""
+
+    async def load_document(self, file_path, file_type):
+        return file_path.read_text()
+
+    async def load_pages(self, file_path, file_type):
+        return list(enumerate(file_path.read_text().split("\f"), start=1))
+
+    def clean_text(self, text):
+        return text
+
+    def split_text(self, text, metadata=None):
+        chunks, start = [], 0
+        for i, paragraph in enumerate(text.split("\n\n")):
+            chunks.append(DocumentChunk(
+                id=f"{metadata['content_hash'][:8]}-{i}",
+                content=paragraph,
+                metadata={**metadata, "chunk_index": i, "chunk_start": start, "chunk_end": start + len(paragraph)}
+            ))
+            start += len(paragraph) + 2
+        return chunks
+
+    def build_metadata(self, document, original_length, cleaned_text):
+        metadata = super().build_metadata(document, original_length, cleaned_text)
+        metadata["content_hash"] = document.content_hash
+        return metadata
+
+
+class CountingEmbedder(BaseEmbedder):
+    def __init__(self):
+        self.texts = []
+
+    async def embed_text(self, text):
+        return (await self.embed_texts([text]))[0]
+
+    async def embed_texts(self, texts):
+        self.texts.extend(texts)
+        return np.ones((len(texts), 4), dtype=np.float32)
+
+    def get_dimension(self):
+        return 4
+
+    def get_model_info(self):
+        return {"provider": "stand-in", "model_name": "stand-in"}
+
+
+class RecordingVectorDB:
+    def __init__(self):
+        self.vectors = {}
+        self.payloads = {}
+
+    async def batch_upsert_vectors(self, chunks):
+        for chunk in chunks:
+            self.vectors[chunk.id] = chunk.content
+            self.payloads[chunk.id] = dict(chunk.metadata)
+        return True
+
+    async def update_metadata(self, updates):
+        for vector_id, metadata in updates.items():
+            self.payloads[vector_id].update(metadata)
+        return True
+
+    async def delete_vectors(self, chunk_ids):
+        for chunk_id in chunk_ids:
+            del self.vectors[chunk_id], self.payloads[chunk_id]
+        return True
+
+
+def spool(tmp: Path, name: str, paragraphs) -> Path:
+    path = tmp / name
+    path.write_text("\n\n".join(paragraphs))
+    return path
+
+
+async def wait_for(condition, timeout=10.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("timed out waiting for the queue")
+        await asyncio.sleep(0.01)
+
+
+async def test_reindexing():
+    """Test that an update embeds only new or changed chunks and deletes only removed ones"""
+    print("♻️  Testing incremental re-indexing...")
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            service = DocumentService()
+            service.document_processor = ParagraphProcessor()
+            embedder, vector_db = CountingEmbedder(), RecordingVectorDB()
+            service.embedder, service.vector_db = embedder, vector_db
+            service.open_registry(str(tmp / "documents.sqlite3"))
+            ingestion_queue.configure(str(tmp / "jobs.sqlite3"), workers=1, max_attempts=1)
+            await ingestion_queue.start(service.run_ingest_job)
+
+            original = [f"section {i}" for i in range(20)]
+            document = await service.create_document("manual.txt", DocumentType.TXT, content_hash="1" * 64)
+            await service.enqueue_document(document, spool(tmp, "v1.txt", original))
+            await wait_for(lambda: ingestion_queue.completed == 1)
+            assert len(embedder.texts) == 20 and len(vector_db.vectors) == 20
+            print("  ✅ First version embedded all 20 chunks")
+
+            print("  Updating 2 sections, removing 3 and adding 1...")
+            revised = original[:5] + ["section 5 (revised)", "section 6 (revised)"] + original[10:] + ["appendix"]
+            embedder.texts.clear()
+            updated = await service.update_document(
+                document.id, "manual.txt", DocumentType.TXT, spool(tmp, "v2.txt", revised), content_hash="2" * 64
+            )
+            assert updated.status == DocumentStatus.UPLOADED
+            assert service.get_document_status(document.id).indexing is None, "stale report shown while re-indexing"
+            await wait_for(lambda: ingestion_queue.completed == 2)
+
+            assert sorted(embedder.texts) == ["appendix", "section 5 (revised)", "section 6 (revised)"]
+            assert sorted(vector_db.vectors.values()) == sorted(revised), "removed sections should be deleted"
+            document = service.get_document(document.id)
+            assert document.status == DocumentStatus.EMBEDDED and document.chunks_count == len(revised)
+            assert document.content_hash == "2" * 64
+            indexing = document.metadata["indexing"]
+            assert indexing == {"embedded": 3, "reused": 15, "removed": 5}, indexing
+            assert service.get_document_status(document.id).indexing == indexing
+            assert service.pipeline_metrics()["reuse"]["updates"] == 1
+            print(f"  ✅ Update embedded {indexing['embedded']} chunk(s), saved {indexing['reused']} embedding "
+                  f"call(s) and deleted {indexing['removed']} stale vector(s)")
+
+            print("  Sending two updates for the same document at once...")
+            results = await asyncio.gather(*[
+                service.update_document(
+                    document.id, "manual.txt", DocumentType.TXT, spool(tmp, f"v3-{i}.txt", revised + [f"note {i}"]),
+                    content_hash=str(3 + i) * 64
+                )
+                for i in range(2)
+            ], return_exceptions=True)
+            refused = [result for result in results if isinstance(result, ValueError)]
+            assert len(refused) == 1, f"exactly one concurrent update should be refused: {results}"
+            await wait_for(lambda: ingestion_queue.completed == 3)
+            assert service.get_document(document.id).chunks_count == len(revised) + 1
+            print("  ✅ A concurrent update is refused instead of racing the accepted one")
+
+            try:
+                service.documents[document.id] = document
+                document.status = DocumentStatus.PROCESSING
+                await service.update_document(document.id, "manual.txt", DocumentType.TXT, tmp / "v3.txt")
+                raise AssertionError("updating a document mid-ingest should be refused")
+            except ValueError:
+                print("  ✅ Updates are refused while a document is still being processed")
+
+            await ingestion_queue.stop()
+            service.close_registry()
+
+        print("  🎉 Re-indexing test completed successfully!")
+        return True
+
+    except Exception as e:
+        print(f"  ❌ Re-indexing test failed: {e}")
+        traceback.print_exc()
+        return False
+
+
+async def test_reused_payloads():
+    """Test reused vectors get the new version's offsets and page after an insertion earlier in the text"""
+    print("📍 Testing reused chunk payloads...")
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            service = DocumentService()
+            service.document_processor = ParagraphProcessor()
+            vector_db = RecordingVectorDB()
+            service.embedder, service.vector_db = CountingEmbedder(), vector_db
+            service.open_registry(str(tmp / "documents.sqlite3"))
+
+            pages = ["intro\n\nalpha", "beta\n\ngamma"]
+            document = await service.create_document("guide.txt", DocumentType.TXT, content_hash="1" * 64)
+            await service.process_and_embed_document(document.id, spool(tmp, "v1.txt", ["\f".join(pages)]))
+            [gamma] = [vector_id for vector_id, content in vector_db.vectors.items() if content == "gamma"]
+            assert vector_db.payloads[gamma]["page"] == 2 and vector_db.payloads[gamma]["chunk_start"] == 20
+
+            print("  Inserting a cover page before the first page...")
+            service._load(document.id).content_hash = "2" * 64
+            revised = "\f".join(["cover page"] + pages)
+            await service.process_and_embed_document(document.id, spool(tmp, "v2.txt", [revised]))
+            assert service.get_document(document.id).metadata["indexing"]["reused"] == 4
+            payload = vector_db.payloads[gamma]
+            start = revised.replace("\f", "\n\n").index("gamma")
+            assert (payload["chunk_start"], payload["chunk_end"]) == (start, start + 5), payload
+            assert payload["page"] == 3 and payload["chunk_index"] == 4, payload
+            assert payload["document_hash"] == "2" * 64
+            print(f"  ✅ A reused chunk's payload moved to offset {start} on page 3 with the new version's hash")
+            service.close_registry()
+
+        print("  🎉 Reused payload test completed successfully!")
+        return True
+
+    except Exception as e:
+        print(f"  ❌ Reused payload test failed: {e}")
+        traceback.print_exc()
+        return False
+
+
+async def main():
+    """Main test function"""
+    print("🔧 Incremental Re-indexing Test")
+    print("===============================")
+
+    success = await test_reindexing()
+    success = await test_reused_payloads() and success
+
+    print("\n📊 Test Results:")
+    print("================")
+    if success:
+        print("✅ Incremental re-indexing is working correctly!")
+    else:
+        print("❌ Incremental re-indexing has issues.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Test script for the standalone embedding server and its RemoteEmbedder client.
+Serves a stand-in embedder over a temporary Unix socket, no model download required.
+"""
+
+import asyncio
+import sys
+import tempfile
+import threading
+import traceback
+from pathlib import Path
+
+import numpy as np
+
+# Add the backend directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.models.config import RemoteEmbedderConfig
+from app.core.embedders.base import BaseEmbedder
+from app.core.embedders.embedding_server import EmbeddingServer
+from app.core.embedders.remote_embedder import RemoteEmbedder
+
+
+class StandInEmbedder(BaseEmbedder):
+    """Encodes the number in 'chunk-N' so order can be checked"""
+
+    def __init__(self, delay: float = 0.01):
+        super().__init__()
+        self.calls = 0
+        self.delay = delay
+
+    async def embed_text(self, text: str) -> np.ndarray:
+        return (await self.embed_texts([text]))[0]
+
+    async def embed_texts(self, texts):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return np.array([[float(t.split("-")[1]), 1.0, 2.0] for t in texts], dtype=np.float32)
+
+    def get_dimension(self) -> int:
+        return 3
+
+    def get_model_info(self):
+        return {"provider": "stand-in", "model_name": "stand-in", "dimension": 3}
+
+
+class BackgroundServer:
+    """Runs an EmbeddingServer on its own event loop thread"""
+
+    def __init__(self, socket_path: str, delay: float = 0.01):
+        self.socket_path = socket_path
+        self.server = EmbeddingServer(StandInEmbedder(delay))
+        self.writers = []
+        self.loop = asyncio.new_event_loop()
+        self.ready = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.listener = self.loop.run_until_complete(
+            asyncio.start_unix_server(self._handle, self.socket_path)
+        )
+        self.ready.set()
+        self.loop.run_forever()
+
+    async def _handle(self, reader, writer):
+        self.writers.append(writer)
+        try:
+            await self.server.handle(reader, writer)
+        except ConnectionError:
+            pass  # Connection aborted by kill()
+
+    def kill(self):
+        """Drop every connection and stop listening, as if the server process died"""
+        def abort():
+            self.listener.close()
+            for writer in self.writers:
+                writer.transport.abort()
+        self.loop.call_soon_threadsafe(abort)
+        Path(self.socket_path).unlink(missing_ok=True)
+
+    def __enter__(self):
+        self.thread.start()
+        self.ready.wait()
+        return self
+
+    async def _close(self):
+        # Let handlers see EOF from the closed client connections
+        self.listener.close()
+        while self.server.connections:
+            await asyncio.sleep(0.01)
+
+    def __exit__(self, *exc):
+        asyncio.run_coroutine_threadsafe(self._close(), self.loop).result(timeout=5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+
+
+async def test_remote_embedder():
+    """Test info, ordering, concurrency over pooled connections, errors and server restarts"""
+    print("🛰️  Testing embedding server and RemoteEmbedder...")
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            socket_path = str(Path(tmp) / "embedding.sock")
+            with BackgroundServer(socket_path) as background:
+                config = RemoteEmbedderConfig(socket_path=socket_path, max_connections=4, timeout=5)
+                embedder = RemoteEmbedder(config)
+                assert embedder.get_dimension() == 3
+                assert embedder.get_model_info()["provider"] == "remote"
+                print("  ✅ Client read model info from the server")
+
+                print("  Embedding a batch...")
+                texts = [f"chunk-{i}" for i in range(500)]
+                embeddings = await embedder.embed_texts(texts)
+                assert embeddings.dtype == np.float32 and embeddings.shape == (500, 3)
+                assert embeddings[:, 0].tolist() == list(range(500)), "output order changed"
+                print("  ✅ 500 float32 vectors returned in order")
+
+                print("  Sending 40 concurrent queries...")
+                vectors = await asyncio.gather(*[embedder.embed_text(f"chunk-{i}") for i in range(40)])
+                assert [int(v[0]) for v in vectors] == list(range(40))
+                assert embedder._open <= 4, f"connection pool exceeded: {embedder._open}"
+                print(f"  ✅ Queries shared {embedder._open} pooled connections")
+
+                print("  Checking error propagation...")
+                try:
+                    await embedder.embed_text("not-a-number")
+                    raise AssertionError("server errors should surface")
+                except RuntimeError:
+                    pass
+                assert (await embedder.embed_text("chunk-7"))[0] == 7.0
+                print("  ✅ Server errors raised without breaking the connection")
+
+                embedder.close()
+                await asyncio.sleep(0.05)  # let the transports finish closing
+
+            print("  Killing the server with 12 requests in flight on 3 connections...")
+            config = RemoteEmbedderConfig(socket_path=socket_path, max_connections=3, timeout=5, connect_timeout=1)
+            with BackgroundServer(socket_path, delay=0.3) as background:
+                embedder = RemoteEmbedder(config)
+                requests = asyncio.gather(
+                    *[embedder.embed_text(f"chunk-{i}") for i in range(12)], return_exceptions=True
+                )
+                await asyncio.sleep(0.1)
+                background.kill()
+                results = await asyncio.wait_for(requests, timeout=10)
+            assert all(isinstance(result, RuntimeError) for result in results), results
+            assert embedder._open == 0, f"{embedder._open} connections still counted as open"
+            print("  ✅ Every caller got an error instead of waiting forever")
+
+            with BackgroundServer(socket_path) as background:
+                assert (await embedder.embed_text("chunk-3"))[0] == 3.0
+                embedder.close()
+                await asyncio.sleep(0.05)
+            print("  ✅ Requests succeed again once the server is back")
+
+        print("  🎉 Remote embedder test completed successfully!")
+        return True
+
+    except Exception as e:
+        print(f"  ❌ Remote embedder test failed: {e}")
+        traceback.print_exc()
+        return False
+
+
+async def main():
+    """Main test function"""
+    print("🔧 Embedding Server Test")
+    print("========================")
+
+    success = await test_remote_embedder()
+
+    print("\n📊 Test Results:")
+    print("================")
+    if success:
+        print("✅ Embedding server and client are working correctly!")
+    else:
+        print("❌ Embedding server or client has issues.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
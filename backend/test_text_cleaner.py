@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test script for the single-pass text cleaner.
+Checks it produces exactly the output of the previous line-by-line cleaning loop.
+"""
+
+import random
+import sys
+import traceback
+from pathlib import Path
+
+# Add the backend directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.core.document_processor.text_cleaner import clean_text
+
+
+def reference_clean_text(text: str) -> str:
+    """The previous LangChainDocumentProcessor.clean_text implementation"""
+    if not text:
+        return ""
+    cleaned_lines = []
+    for line in text.split('\n'):
+        line = ' '.join(line.split())
+        if len(line.strip()) < 3:
+            continue
+        cleaned_lines.append(line)
+    cleaned_text = '\n'.join(cleaned_lines)
+    while '\n\n\n' in cleaned_text:
+        cleaned_text = cleaned_text.replace('\n\n\n', '\n\n')
+    return cleaned_text.strip()
+
+
+def test_equivalence():
+    """Compare against the reference on edge cases and random inputs"""
+    print("🧽 Testing text cleaner equivalence...")
+
+    try:
+        cases = [
+            "", "a", "ab", "abc", "  abc  ", "\n\n\nabc\n\n\n", "ab\ncd\nefg", "abc\nde",
+            "x\n\n\n\n\ny", "  a  b  \n  c  ", "col1\tcol2\t\tcol3\r\n\t\t\r\n",
+            "  text　with unicode\u0085spaces\x0b\x0c\x1c",
+            "line one\n  \n\t\nline two\n\n\nline three  \n ok",
+        ]
+        for case in cases:
+            assert clean_text(case) == reference_clean_text(case), f"mismatch on {case!r}"
+        print(f"  ✅ {len(cases)} edge cases match")
+
+        rng = random.Random(0)
+        alphabet = ["a", "b", "word", "x" * 5, " ", "  ", "\t", "\n", "\n\n", "\r\n", " ", "\x0c", " "]
+        for _ in range(5000):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 60)))
+            assert clean_text(text) == reference_clean_text(text), f"mismatch on {text!r}"
+        print("  ✅ 5000 random texts match")
+
+        print("  🎉 Text cleaner test completed successfully!")
+        return True
+
+    except Exception as e:
+        print(f"  ❌ Text cleaner test failed: {e}")
+        traceback.print_exc()
+        return False
+
+
+def main():
+    """Main test function"""
+    print("🔧 Text Cleaner Test")
+    print("====================")
+
+    success = test_equivalence()
+
+    print("\n📊 Test Results:")
+    print("================")
+    if success:
+        print("✅ Text cleaner is working correctly!")
+    else:
+        print("❌ Text cleaner has issues.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test script for the offset-tracking text splitter.
+Checks its chunks are exactly LangChain's RecursiveCharacterTextSplitter output
+and that every span's offsets slice back to its chunk, including on overlapping
+and repeated text where searching for a chunk would find the wrong copy.
+"""
+
+import random
+import sys
+import traceback
+from pathlib import Path
+
+# Add the backend directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from app.core.document_processor.text_splitter import OffsetTextSplitter
+
+
+def check(text: str, chunk_size: int, chunk_overlap: int) -> list:
+    """Compare one input against LangChain and check the offsets; returns the spans"""
+    reference = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    splitter = OffsetTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    spans = splitter.split_spans(text)
+    chunks = [text[start:end] for start, end in spans]
+
+    assert chunks == reference.split_text(text), f"chunks differ from LangChain on {text!r}"
+    assert all(start < end for start, end in spans), f"empty span on {text!r}"
+    assert [start for start, _ in spans] == sorted(start for start, _ in spans), f"spans out of order on {text!r}"
+    return spans
+
+
+def test_splitter():
+    """Compare against LangChain on edge cases, repeated text and random inputs"""
+    print("✂️  Testing offset text splitter...")
+
+    try:
+        cases = [
+            ("", 10, 0), ("short", 10, 0), ("   ", 10, 0), ("aa bb cc dd ee ff gg", 10, 3),
+            ("one\n\ntwo\n\nthree\n\nfour", 8, 2), ("line\nline\nline\nline\nline", 10, 5),
+            ("x" * 95, 10, 4), ("word " * 40, 23, 11), ("a\n\n\n\nb\n \n c", 3, 1),
+            ("Paragraph one is long.\n\nParagraph two.\nIts second line is longer than ten.", 12, 6),
+        ]
+        for text, chunk_size, chunk_overlap in cases:
+            check(text, chunk_size, chunk_overlap)
+        print(f"  ✅ {len(cases)} edge cases match LangChain")
+
+        # The same sentence repeated: every chunk's text occurs many times in the document,
+        # so only tracked offsets (not a search) can place each copy
+        sentence = "The refund policy applies to annual plans. "
+        text = "\n\n".join(sentence * 3 for _ in range(20))
+        spans = check(text, 100, 40)
+        chunks = [text[start:end] for start, end in spans]
+        assert len(set(chunks)) < len(chunks), "test input should repeat chunk texts"
+        assert any(later[0] < earlier[1] for earlier, later in zip(spans, spans[1:])), "chunks should overlap"
+        assert any(text.find(chunk) != start for chunk, (start, _) in zip(chunks, spans)), \
+            "a search for the chunk text should land on an earlier copy"
+        print(f"  ✅ {len(spans)} overlapping chunks of repeated text keep their own offsets")
+
+        rng = random.Random(0)
+        alphabet = ["a", "bb", "word", "repeat", " ", "  ", "\n", "\n\n", "\t", "x" * 7]
+        for _ in range(3000):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 80)))
+            chunk_size = rng.randint(1, 40)
+            check(text, chunk_size, rng.randint(0, chunk_size))
+        print("  ✅ 3000 random texts match LangChain")
+
+        print("  🎉 Text splitter test completed successfully!")
+        return True
+
+    except Exception as e:
+        print(f"  ❌ Text splitter test failed: {e}")
+        traceback.print_exc()
+        return False
+
+
+def main():
+    """Main test function"""
+    print("🔧 Text Splitter Test")
+    print("=====================")
+
+    success = test_splitter()
+
+    print("\n📊 Test Results:")
+    print("================")
+    if success:
+        print("✅ Text splitter is working correctly!")
+    else:
+        print("❌ Text splitter has issues.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Test script for the Keycloak token caches.
+Checks the verified-token cache for expiry at exp minus skew, the LRU cap,
+SHA-256 keying and hit/miss stats, then checks concurrent misses in the
+introspection/userinfo cache share one upstream call and results expire after
+the TTL.
+"""
+
+import asyncio
+import hashlib
+import sys
+import time
+import traceback
+from pathlib import Path
+
+# Add the backend directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.auth.token_cache import VerifiedTokenCache, SingleFlightTTLCache
+
+
+async def test_verified_token_cache():
+    """Test expiry, LRU eviction, keying and counters"""
+    print("🔐 Testing verified-token cache...")
+
+    try:
+        cache = VerifiedTokenCache(max_entries=3, skew_seconds=0.2)
+        now = time.time()
+
+        cache.put("short", {"sub": "alice"}, exp=now + 0.35)
+        assert cache.get("short") == {"sub": "alice"}
+        await asyncio.sleep(0.2)
+        assert cache.get("short") is None, "token should expire skew_seconds before exp"
+        assert cache.stats()["entries"] == 0, "expired entry should be dropped on lookup"
+        cache.put("nearly-expired", {"sub": "bob"}, exp=time.time() + 0.1)
+        cache.put("no-exp", {"sub": "carol"}, exp=None)
+        assert cache.stats()["entries"] == 0, "tokens inside the skew window or without exp are not cached"
+        print("  ✅ Entries expire at exp - skew; tokens without exp or inside the skew are never cached")
+
+        exp = time.time() + 60
+        for token in ("a", "b", "c"):
+            cache.put(token, {"sub": token}, exp=exp)
+        assert cache.get("a") == {"sub": "a"}  # a is now most recently used
+        cache.put("d", {"sub": "d"}, exp=exp)
+        assert cache.get("b") is None, "least recently used token should be evicted"
+        assert [cache.get(token)["sub"] for token in ("a", "c", "d")] == ["a", "c", "d"]
+        assert cache.stats()["entries"] == 3 and cache.evictions == 1
+        print("  ✅ Capped at max_entries, evicting the least recently used token")
+
+        token = "eyJhbGciOiJSUzI1NiJ9.payload.signature"
+        cache.put(token, {"sub": "dave"}, exp=exp)
+        assert hashlib.sha256(token.encode("utf-8")).digest() in cache._entries
+        assert all(isinstance(key, bytes) and len(key) == 32 for key in cache._entries)
+        assert token not in cache._entries and token.encode("utf-8") not in cache._entries
+        print("  ✅ Keyed by the SHA-256 digest; the raw token is never stored")
+
+        stats = VerifiedTokenCache(max_entries=10).stats()
+        assert stats == {"entries": 0, "max_entries": 10, "hits": 0, "misses": 0, "evictions": 0, "hit_rate": 0.0}
+        counted = VerifiedTokenCache(max_entries=10)
+        counted.put("t", {"sub": "erin"}, exp=exp)
+        for candidate in ("t", "t", "t", "unknown"):
+            counted.get(candidate)
+        stats = counted.stats()
+        assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (3, 1, 0.75), stats
+        disabled = VerifiedTokenCache(max_entries=0)
+        disabled.put("t", {"sub": "erin"}, exp=exp)
+        assert disabled.get("t") is None and disabled.stats()["misses"] == 1
+        print("  ✅ Hits, misses and hit rate are counted; max_entries=0 disables caching")
+
+        print("  🎉 Verified-token cache test completed successfully!")
+        return True
+
+    except Exception as e:
+        print(f"  ❌ Verified-token cache test failed: {e}")
+        traceback.print_exc()
+        return False
+
+
+async def test_single_flight_cache():
+    """Test single-flight fetches, TTL expiry, failures and the size cap"""
+    print("🔁 Testing single-flight upstream cache...")
+
+    try:
+        cache = SingleFlightTTLCache(ttl_seconds=0.2, max_entries=2)
+        calls = []
+
+        def fetcher(result):
+            async def fetch():
+                calls.append(result)
+                await asyncio.sleep(0.05)
+                return result
+            return fetch
+
+        results = await asyncio.gather(*[cache.get_or_fetch("token", fetcher({"active": True})) for _ in range(20)])
+        assert all(result == {"active": True} for result in results)
+        assert len(calls) == 1 and cache.upstream_calls == 1, f"expected one upstream call, saw {len(calls)}"
+        assert (cache.hits, cache.misses) == (0, 20)
+        print("  ✅ 20 concurrent misses for one token made 1 upstream call")
+
+        assert await cache.get_or_fetch("token", fetcher({"active": False})) == {"active": True}
+        assert cache.hits == 1 and len(calls) == 1
+        await asyncio.sleep(0.25)
+        assert await cache.get_or_fetch("token", fetcher({"active": False})) == {"active": False}
+        assert len(calls) == 2, "result should be fetched again once the TTL has passed"
+        print("  ✅ Results are served from cache within the TTL and refetched after it")
+
+        async def failing():
+            calls.append("error")
+            raise RuntimeError("IdP unavailable")
+
+        for _ in range(2):
+            try:
+                await cache.get_or_fetch("broken", failing)
+                raise AssertionError("fetch error should propagate")
+            except RuntimeError:
+                pass
+        assert calls.count("error") == 2, "failures must not be cached"
+
+        for token in ("a", "b", "c"):
+            await cache.get_or_fetch(token, fetcher(token))
+        assert cache.stats()["entries"] == 2 and cache.stats()["max_entries"] == 2
+        calls.clear()
+        await cache.get_or_fetch("a", fetcher("a"))
+        assert calls == ["a"], "oldest entry should be evicted beyond max_entries"
+        print("  ✅ Failures are not cached and entries are capped at max_entries")
+
+        print("  🎉 Single-flight cache test completed successfully!")
+        return True
+
+    except Exception as e:
+        print(f"  ❌ Single-flight cache test failed: {e}")
+        traceback.print_exc()
+        return False
+
+
+async def main():
+    """Main test function"""
+    print("🔧 Token Cache Test")
+    print("===================")
+
+    success = await test_verified_token_cache()
+    success = await test_single_flight_cache() and success
+
+    print("\n📊 Test Results:")
+    print("================")
+    if success:
+        print("✅ Token caches are working correctly!")
+    else:
+        print("❌ Token caches have issues.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test script for streamed uploads.
+Spools in-memory UploadFiles to a temporary directory and checks size limits and hashing.
+"""
+
+import asyncio
+import hashlib
+import io
+import sys
+import tempfile
+import traceback
+from pathlib import Path
+
+# Add the backend directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from fastapi import UploadFile
+
+from app.services.upload_spool import spool_upload, UploadTooLarge
+
+
+class CountingFile(io.BytesIO):
+    """Tracks how many bytes the spooler pulled from the upload"""
+
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+async def test_upload_spool():
+    """Test chunked spooling, hashing and early size rejection"""
+    print("📥 Testing upload spooling...")
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            data = b"quarterly report\n" * 100_000
+            upload = UploadFile(file=io.BytesIO(data), filename="Report.TXT")
+            spooled = await spool_upload(upload, tmp, max_size=len(data), chunk_size=64 * 1024)
+            assert spooled.path.read_bytes() == data and spooled.path.suffix == ".txt"
+            assert spooled.size == len(data)
+            assert spooled.sha256 == hashlib.sha256(data).hexdigest()
+            print(f"  ✅ Spooled {spooled.size} bytes in 64KB chunks with the right SHA-256")
+            spooled.discard()
+
+            print("  Uploading past the size limit...")
+            source = CountingFile(b"x" * (10 * 1024 * 1024))
+            upload = UploadFile(file=source, filename="big.pdf")
+            try:
+                await spool_upload(upload, tmp, max_size=1024 * 1024, chunk_size=64 * 1024)
+                raise AssertionError("expected the upload to be rejected")
+            except UploadTooLarge:
+                pass
+            assert source.bytes_read <= 1024 * 1024 + 64 * 1024, f"read {source.bytes_read} bytes before rejecting"
+            assert list(Path(tmp).iterdir()) == [], "partial spool file should be removed"
+            print(f"  ✅ Rejected after reading {source.bytes_read} of {10 * 1024 * 1024} bytes, nothing left behind")
+
+            upload = UploadFile(file=CountingFile(b"x" * 2048), filename="sized.pdf", size=2048)
+            try:
+                await spool_upload(upload, tmp, max_size=1024)
+                raise AssertionError("expected the upload to be rejected")
+            except UploadTooLarge:
+                pass
+            assert upload.file.bytes_read == 0
+            print("  ✅ Known part size rejected without reading the upload")
+
+        print("  🎉 Upload spool test completed successfully!")
+        return True
+
+    except Exception as e:
+        print(f"  ❌ Upload spool test failed: {e}")
+        traceback.print_exc()
+        return False
+
+
+async def main():
+    """Main test function"""
+    print("🔧 Upload Spool Test")
+    print("====================")
+
+    success = await test_upload_spool()
+
+    print("\n📊 Test Results:")
+    print("================")
+    if success:
+        print("✅ Upload spooling is working correctly!")
+    else:
+        print("❌ Upload spooling has issues.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())